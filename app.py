@@ -2,19 +2,29 @@ import streamlit as st
 import requests
 from dotenv import load_dotenv
 import os
-import time
 from datetime import datetime
 import sys
-import re
+from typing import Generator, Iterator
 
 # 프로젝트 루트 디렉토리를 PATH에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.utils.css_loader import load_css
+from src.utils.answer_cache import answer_cache
+from src.utils.answer_jobs import answer_jobs, QueueFullError
+from src.utils.answer_stream import iter_answer_chunks
+from src.utils.backend_client import ask_client, backend_client
 from src.utils.chat_storage import chat_storage
+from src.utils.question_normalizer import clean_question
+from src.utils.retry_policy import ASK_RETRY_POLICY
+from src.utils.session_catalog import make_cursor, page_sessions
+from src.utils.single_flight import answer_flights
+from src.utils.source_extractor import SourceExtractor
 from src.utils.user_settings import user_settings
 from src.components import (
     render_chat_message, 
     render_typing_indicator, 
+    render_streaming_message,
+    render_transcript,
     render_sidebar, 
     handle_tab_change, 
     render_tab_welcome
@@ -24,49 +34,92 @@ from src.components.chat_message import render_sources_section
 # 환경 변수 로드
 load_dotenv()
 
-# 백엔드 API 주소 환경변수 처리 - EC2 서버 연결
-BACKEND_URL = os.getenv("BACKEND_URL")
+# 백엔드 커넥션 풀 미리 열기 (프로세스당 한 번)
+backend_client.warm_up_in_background()
+ask_client.warm_up_in_background()
 
-def ask_backend(question: str) -> str:
+# 스트리밍 응답 요청 여부 (백엔드가 지원하지 않으면 JSON 응답으로 자동 폴백)
+BACKEND_STREAMING = os.getenv("BACKEND_STREAMING", "true").lower() in ("1", "true", "yes")
+# 답변 작업 완료 여부 확인 간격(초) - 스트리밍 중인 말풍선 갱신 주기이기도 함
+ANSWER_POLL_INTERVAL = float(os.getenv("ANSWER_POLL_INTERVAL", "0.3"))
+# 대화 기록 탭 - 한 번에 더 불러오는 세션 수, 한 화면에 그리는 최대 세션 수 (세션마다 버튼 2개)
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+HISTORY_MAX_ROWS = int(os.getenv("HISTORY_MAX_ROWS", "100"))
+# 홈 탭에 기본으로 그리는 최근 메시지 수 / "이전 메시지 더 보기" 한 번에 늘어나는 수
+TRANSCRIPT_WINDOW = int(os.getenv("TRANSCRIPT_WINDOW", "30"))
+# 홈 탭 한 화면에 그리는 최대 메시지 수 (넘으면 최근 메시지를 내려놓고 이전 메시지 표시)
+TRANSCRIPT_MAX_RENDERED = int(os.getenv("TRANSCRIPT_MAX_RENDERED", "150"))
+# 대화 내용 렌더링 방식 - batch: HTML 한 덩어리(요소 1개), message: 메시지마다 요소 하나
+TRANSCRIPT_RENDER_MODE = os.getenv("TRANSCRIPT_RENDER_MODE", "batch").lower()
+
+def ask_backend_stream(question: str) -> Generator[str, None, bool]:
     """
-    FastAPI 백엔드의 /im-fact/ask API를 호출하여 답변을 받아옵니다.
-    네트워크 오류와 타임아웃에 대한 강화된 에러 핸들링 포함
+    FastAPI 백엔드의 /im-fact/ask API를 호출하여 답변을 조각 단위로 받아옵니다.
+    SSE 또는 chunked 응답이면 도착하는 대로, 단일 JSON 응답이면 한 번에 반환합니다.
+    오류는 예외 대신 사용자에게 보여줄 메시지 조각으로 반환합니다.
+    정상 답변을 끝까지 받은 경우에만 제너레이터가 True를 반환합니다. (캐시 저장 판단용)
     """
     try:
-        # 요청 전 백엔드 상태 확인
-        health_resp = requests.get(f"{BACKEND_URL}/health", timeout=5)
-        if health_resp.status_code != 200:
-            return "⚠️ 백엔드 서버에 연결할 수 없습니다. 잠시 후 다시 시도해주세요."
+        # 요청 전 백엔드 상태 확인 (서킷 브레이커 캐시, 추가 요청 없음)
+        if not ask_client.is_available():
+            yield "⚠️ 백엔드 서버에 연결할 수 없습니다. 잠시 후 다시 시도해주세요."
+            return False
+        
+        payload = {"content": question}
+        headers = {"Content-Type": "application/json"}
+        if BACKEND_STREAMING:
+            payload["stream"] = True
+            headers["Accept"] = "text/event-stream, application/json"
         
-        # 메인 API 호출
-        resp = requests.post(
-            f"{BACKEND_URL}/im-fact/ask",
-            json={"content": question},
-            timeout=240,  # 4분으로 연장
-            headers={"Content-Type": "application/json"}
+        # 메인 API 호출 - 읽기 타임아웃은 조각 사이 대기 시간에 적용
+        resp = ask_client.post(
+            "/im-fact/ask",
+            json=payload,
+            timeout=(10, 240),  # 4분으로 연장
+            headers=headers,
+            stream=True,
+            retry=ASK_RETRY_POLICY
         )
         
-        if resp.status_code == 200:
-            content = resp.json().get("content", "")
-            if content:
-                return content
+        with resp:
+            if resp.status_code == 200:
+                received = 0
+                for chunk in iter_answer_chunks(resp):
+                    received += len(chunk.encode("utf-8"))
+                    yield chunk
+                # 스트리밍 응답은 다 읽은 뒤 전송량 기록
+                ask_client.record_transfer(resp, received)
+                if not received:
+                    yield "🤖 답변을 생성하는 중 문제가 발생했습니다. 다시 시도해주세요."
+                    return False
+                return True
+            elif resp.status_code == 400:
+                yield "❌ 질문 형식에 문제가 있습니다. 다른 방식으로 질문해주세요."
+            elif resp.status_code == 500:
+                yield "🔧 서버에서 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
             else:
-                return "🤖 답변을 생성하는 중 문제가 발생했습니다. 다시 시도해주세요."
-        elif resp.status_code == 400:
-            return "❌ 질문 형식에 문제가 있습니다. 다른 방식으로 질문해주세요."
-        elif resp.status_code == 500:
-            return "🔧 서버에서 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
-        else:
-            return f"⚠️ 예상치 못한 오류가 발생했습니다. (상태코드: {resp.status_code})"
+                yield f"⚠️ 예상치 못한 오류가 발생했습니다. (상태코드: {resp.status_code})"
             
     except requests.exceptions.Timeout:
-        return "⏱️ 답변 생성에 시간이 오래 걸리고 있습니다. 복잡한 질문의 경우 시간이 더 소요될 수 있습니다."
+        yield "⏱️ 답변 생성에 시간이 오래 걸리고 있습니다. 복잡한 질문의 경우 시간이 더 소요될 수 있습니다."
     except requests.exceptions.ConnectionError:
-        return "🌐 네트워크 연결을 확인해주세요. 백엔드 서버가 실행 중인지 확인해주세요."
+        yield "🌐 네트워크 연결을 확인해주세요. 백엔드 서버가 실행 중인지 확인해주세요."
     except requests.exceptions.RequestException as e:
-        return f"📡 요청 처리 중 오류가 발생했습니다: {str(e)}"
+        yield f"📡 요청 처리 중 오류가 발생했습니다: {str(e)}"
     except Exception as e:
-        return f"🚨 예상치 못한 오류가 발생했습니다: {str(e)}"
+        yield f"🚨 예상치 못한 오류가 발생했습니다: {str(e)}"
+    return False
+
+def ask_backend_cached(question: str) -> Iterator[str]:
+    """
+    답변 캐시를 먼저 확인하고, 없으면 백엔드를 호출합니다.
+    정규화된 질문이 같으면 같은 답변을 재사용하고,
+    같은 질문이 이미 다른 세션에서 진행 중이면 그 요청의 결과를 함께 받습니다.
+    """
+    return answer_flights.stream(
+        answer_cache.make_key(question),
+        lambda: answer_cache.stream_through(question, ask_backend_stream)
+    )
 
 # 페이지 구성
 st.set_page_config(layout="wide", initial_sidebar_state="expanded", page_title="IM.FACT - 환경 기후 어시스턴트")
@@ -79,6 +132,16 @@ if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
 if 'is_typing' not in st.session_state:
     st.session_state.is_typing = False
+if 'pending_job' not in st.session_state:
+    st.session_state.pending_job = None
+if 'history_query' not in st.session_state:
+    st.session_state.history_query = ""
+    st.session_state.history_start_cursor = None  # 화면에 그리는 첫 세션 앞의 커서 (None이면 최신부터)
+    st.session_state.history_pages = 1
+if 'transcript_shown' not in st.session_state:
+    st.session_state.transcript_shown = TRANSCRIPT_WINDOW  # 화면에 그리는 메시지 수
+    st.session_state.transcript_end = None  # 화면에 그리는 마지막 메시지 다음 위치 (None이면 최신까지)
+    st.session_state.transcript_session_id = None
 if 'current_tab' not in st.session_state:
     st.session_state.current_tab = "home"  # 기본 탭: 홈
 if 'current_session_id' not in st.session_state:
@@ -99,6 +162,9 @@ if 'current_session_id' not in st.session_state:
         st.session_state.current_session_id = offline_id
         st.session_state.chat_history = []
         st.warning("💾 오프라인 모드로 시작합니다.")
+else:
+    # 오프라인 세션이 재연결 후 백엔드에 올라갔으면 백엔드 세션 ID로 전환
+    st.session_state.current_session_id = chat_storage.resolve_session_id(st.session_state.current_session_id)
 if 'sessions_list' not in st.session_state:
     st.session_state.sessions_list = chat_storage.get_all_sessions()
 
@@ -116,24 +182,27 @@ render_sidebar()
 # 메인 콘텐츠
 
 # 사용자 입력 처리
+def _input_notice(text: str):
+    """입력창 아래에 표시할 경고를 남깁니다."""
+    st.session_state.setdefault("input_notices", []).append(text)
+
 def handle_user_input():
     """
     사용자 입력 처리 함수 (개선된 버전)
+    입력 프래그먼트의 콜백이므로 경고는 직접 그리지 않고 프래그먼트가 표시하도록 남깁니다.
     """
     user_input = st.session_state.chat_input
     if user_input and user_input.strip():
-        # 줄바꿈 정리 (연속된 줄바꿈을 하나로, 앞뒤 공백 제거)
-        cleaned_input = user_input.strip()
-        # 연속된 줄바꿈을 최대 2개로 제한
-        cleaned_input = re.sub(r'\n{3,}', '\n\n', cleaned_input)
+        # 줄바꿈 정리 (앞뒤 공백 제거, 연속된 줄바꿈을 최대 2개로 제한)
+        cleaned_input = clean_question(user_input)
         
         # 입력 검증
         if len(cleaned_input) < 2:
-            st.warning("⚠️ 질문을 더 자세히 입력해주세요.")
+            _input_notice("⚠️ 질문을 더 자세히 입력해주세요.")
             return
         
         if len(cleaned_input) > 2000:
-            st.warning("⚠️ 질문이 너무 깁니다. 2000자 이내로 입력해주세요.")
+            _input_notice("⚠️ 질문이 너무 깁니다. 2000자 이내로 입력해주세요.")
             return
         
         now = datetime.now().strftime("%H:%M")
@@ -144,8 +213,9 @@ def handle_user_input():
             "timestamp": datetime.now().isoformat()
         }
         
-        # 즉시 UI에 추가
+        # 즉시 UI에 추가 (이전 메시지를 보고 있었다면 최신 메시지로 이동)
         st.session_state.chat_history.append(message)
+        st.session_state.transcript_end = None
         
         # 첫 번째 질문인 경우 세션 제목을 자동으로 질문으로 설정
         if len(st.session_state.chat_history) == 1:
@@ -164,18 +234,19 @@ def handle_user_input():
                     
                 st.session_state.sessions_list = chat_storage.get_all_sessions()
             except Exception as title_error:
-                st.warning(f"📝 세션 제목 설정 중 오류: {str(title_error)}")
+                _input_notice(f"📝 세션 제목 설정 중 오류: {str(title_error)}")
         
         # 메시지 저장 (백엔드 API) - 실패해도 진행
         try:
             chat_storage.save_message(st.session_state.current_session_id, message)
         except Exception as save_error:
-            st.warning(f"💾 메시지 저장 중 오류가 발생했습니다: {str(save_error)}")
+            _input_notice(f"💾 메시지 저장 중 오류가 발생했습니다: {str(save_error)}")
         
         # 입력 필드 초기화
         st.session_state.chat_input = ""
         st.session_state.is_typing = True
-        # st.rerun()을 콜백에서 제거 (자동으로 재실행됨)
+        # 콜백에서는 st.rerun()을 쓸 수 없으므로 입력 프래그먼트가 전체 페이지를 다시 실행하도록 표시
+        st.session_state.input_submitted = True
 
 def handle_textarea_keydown():
     """
@@ -294,72 +365,207 @@ def handle_textarea_keydown():
 # IM.FACT 응답 생성
 def generate_response(question):
     """
-    백엔드에서 응답을 생성하는 함수 (타이핑 인디케이터만 사용)
+    백엔드 답변 생성을 워커 풀에 작업으로 등록합니다. (스크립트 스레드를 막지 않음)
+    답변 저장은 작업이 끝나면 워커에서 바로 하고, 화면 반영은 render_pending_response 프래그먼트가 맡습니다.
     """
-    # 타이핑 효과를 위한 지연
-    time.sleep(1.5)
-    now = datetime.now().strftime("%H:%M")
-    
     try:
-        # 실제 백엔드 API 호출
-        backend_answer = ask_backend(question)
-        
-        # 답변 검증
-        if not backend_answer or backend_answer.strip() == "":
-            backend_answer = "죄송합니다. 답변을 생성할 수 없었습니다. 다시 시도해주세요."
-        
-        answer = {
-            "role": "assistant",
-            "content": backend_answer,
-            "time": now,
-            "timestamp": datetime.now().isoformat(),
-            "sources": []  # 출처는 렌더링 시 자동 추출됨
-        }
-        
-        # 채팅 기록에 응답 추가
-        st.session_state.chat_history.append(answer)
-        
-        # 응답 저장 (백엔드 API) - 실패해도 진행
-        try:
-            chat_storage.save_message(st.session_state.current_session_id, answer)
-        except Exception as save_error:
-            st.warning(f"💾 답변 저장 중 오류가 발생했습니다: {str(save_error)}")
-        
-        st.session_state.is_typing = False
-        
+        job = answer_jobs.submit(st.session_state.current_session_id, question, ask_backend_cached,
+                                 on_complete=_save_finished_answer)
+        st.session_state.pending_job = {"session_id": job.session_id, "job_id": job.job_id}
+        return
+    except QueueFullError:
+        _append_answer("⏳ 지금은 요청이 많아 답변을 생성할 수 없습니다. 잠시 후 다시 시도해주세요.")
     except Exception as e:
-        # 에러 처리
-        error_answer = {
-            "role": "assistant", 
-            "content": f"🚨 답변 생성 중 오류가 발생했습니다: {str(e)}",
-            "time": now,
-            "timestamp": datetime.now().isoformat()
-        }
-        st.session_state.chat_history.append(error_answer)
+        _append_answer(f"🚨 답변 생성 중 오류가 발생했습니다: {str(e)}")
+        _answer_notice("error", f"답변 생성 실패: {str(e)}")
+    st.session_state.is_typing = False
+    # 대화 내용을 이미 그린 뒤이므로 안내 답변이 보이도록 다시 실행
+    st.rerun()
+
+def _new_answer(content: str) -> dict:
+    """어시스턴트 답변 메시지를 만듭니다."""
+    return {
+        "role": "assistant",
+        "content": content,
+        "time": datetime.now().strftime("%H:%M"),
+        "timestamp": datetime.now().isoformat(),
+        "sources": []  # 출처는 렌더링 시 자동 추출됨
+    }
+
+def _append_answer(content: str) -> dict:
+    """어시스턴트 답변을 현재 대화 기록에 추가합니다."""
+    answer = _new_answer(content)
+    st.session_state.chat_history.append(answer)
+    return answer
+
+def _answer_notice(kind: str, text: str):
+    """다시 실행한 뒤 대화 내용 아래에 표시할 안내를 남깁니다. (kind: 'error' 또는 'warning')"""
+    st.session_state.setdefault("answer_notices", []).append((kind, text))
+
+def _is_current_session(session_id: str) -> bool:
+    """작업의 세션이 지금 보고 있는 세션인지 (그 사이 백엔드 세션으로 올라간 오프라인 세션 포함)"""
+    return chat_storage.resolve_session_id(str(session_id)) == str(st.session_state.current_session_id)
+
+def _finished_answer(job) -> dict:
+    """완료된 작업의 답변 메시지 (오류나 빈 답변이면 안내 문구)"""
+    if job.error:
+        return _new_answer(f"🚨 답변 생성 중 오류가 발생했습니다: {job.error}")
+    if not job.text or job.text.strip() == "":
+        return _new_answer("죄송합니다. 답변을 생성할 수 없었습니다. 다시 시도해주세요.")
+    return _new_answer(job.text)
+
+def _save_finished_answer(job) -> dict:
+    """
+    답변 작업 완료 콜백 (워커 스레드)
+    페이지가 닫히거나 다른 탭/세션을 보고 있어도 답변이 저장되도록 여기서 저장합니다.
+    세션 상태에는 접근하지 않습니다.
+    """
+    answer = _finished_answer(job)
+    if not job.error:
+        chat_storage.save_message(job.session_id, answer)
+    return answer
+
+def finish_response(job):
+    """
+    완료된 답변 작업을 화면에 반영합니다. (저장은 작업 완료 콜백에서 이미 끝남)
+    작업 도중 다른 세션으로 전환했다면 대화 기록에는 추가하지 않습니다.
+    """
+    st.session_state.pending_job = None
+    st.session_state.is_typing = False
+    st.session_state.pop("stream_extractor", None)
+    answer_jobs.discard(job.session_id, job.job_id)
+    
+    if job.error:
+        _answer_notice("error", f"답변 생성 실패: {job.error}")
+    if job.complete_error:
+        _answer_notice("warning", f"💾 답변 저장 중 오류가 발생했습니다: {job.complete_error}")
+    
+    if _is_current_session(job.session_id):
+        st.session_state.chat_history.append(job.result or _finished_answer(job))
+
+def _streaming_body(job) -> str:
+    """
+    스트리밍 중인 답변에서 출처 줄을 뺀 본문 (완성 후 말풍선과 같은 모양 유지)
+    추출기는 세션에 보관하고 지난 확인 이후 새로 받은 조각만 넣습니다.
+    """
+    job_id, extractor = st.session_state.get("stream_extractor") or (None, None)
+    if job_id != job.job_id:
+        extractor = SourceExtractor()
+        st.session_state.stream_extractor = (job.job_id, extractor)
+    text = job.text
+    extractor.feed(text[extractor.consumed:])
+    return extractor.body
+
+@st.fragment(run_every=ANSWER_POLL_INTERVAL)
+def render_pending_response():
+    """
+    진행 중인 답변 작업을 주기적으로 확인하여 받은 만큼 말풍선에 그립니다.
+    완료되면 전체 페이지를 다시 실행하여 정식 메시지로 교체합니다.
+    """
+    pending = st.session_state.get("pending_job")
+    if not pending:
+        return
+    
+    job = answer_jobs.get(pending["session_id"], pending["job_id"])
+    if job is None:
+        # 작업이 만료되었거나 프로세스가 재시작됨
+        st.session_state.pending_job = None
         st.session_state.is_typing = False
-        st.error(f"답변 생성 실패: {str(e)}")
+        st.rerun()
+    
+    if job.is_finished:
+        finish_response(job)
+        st.rerun()
+    
+    if job.text:
+        render_streaming_message(_streaming_body(job))
+    else:
+        render_typing_indicator()
 
-# 탭별 콘텐츠 표시
-if st.session_state.current_tab == "home":
+# 목록 이동 버튼 콜백 - 상태를 먼저 바꾸므로 버튼이 속한 프래그먼트만 다시 실행하면 됨
+def _load_earlier_messages(transcript_end: int):
+    """이전 메시지 더 보기 - 최대치에 도달하면 가장 최근 메시지를 내려놓고 이전 메시지를 그림"""
+    if st.session_state.transcript_shown + TRANSCRIPT_WINDOW <= max(TRANSCRIPT_MAX_RENDERED, TRANSCRIPT_WINDOW):
+        st.session_state.transcript_shown += TRANSCRIPT_WINDOW
+    else:
+        st.session_state.transcript_end = max(TRANSCRIPT_WINDOW, transcript_end - TRANSCRIPT_WINDOW)
+
+def _show_latest_messages():
+    st.session_state.transcript_shown = TRANSCRIPT_WINDOW
+    st.session_state.transcript_end = None
+
+def _load_more_history(first_page_cursor):
+    """이전 대화 더 보기 - 최대 HISTORY_MAX_ROWS개까지 늘리고, 그 뒤로는 첫 페이지를 내려놓고 다음 페이지를 그림"""
+    if HISTORY_PAGE_SIZE * (st.session_state.history_pages + 1) <= max(HISTORY_MAX_ROWS, HISTORY_PAGE_SIZE):
+        st.session_state.history_pages += 1
+    elif first_page_cursor:
+        st.session_state.history_start_cursor = first_page_cursor
+
+def _history_back_to_top():
+    st.session_state.history_start_cursor = None
+    st.session_state.history_pages = 1
+
+@st.fragment
+def render_home_transcript():
+    """
+    홈 탭의 대화 내용 (프래그먼트)
+    이전 메시지 더 보기/최근 메시지로 돌아가기 버튼은 이 영역만 다시 실행합니다.
+    """
     # 로고 및 환영 메시지 (처음 방문 시)
     if len(st.session_state.chat_history) == 0:
         render_tab_welcome("home")
 
-    # 대화 기록 표시
-    for message in st.session_state.chat_history:
-        render_chat_message(message)
+    # 대화 기록 표시 - 최근 TRANSCRIPT_WINDOW개만 그리고, 이전 메시지는 요청할 때만 최대 TRANSCRIPT_MAX_RENDERED개까지
+    if st.session_state.transcript_session_id != st.session_state.get("current_session_id"):
+        st.session_state.transcript_session_id = st.session_state.get("current_session_id")
+        st.session_state.transcript_shown = TRANSCRIPT_WINDOW
+        st.session_state.transcript_end = None
+    
+    transcript = st.session_state.chat_history
+    transcript_end = len(transcript) if st.session_state.transcript_end is None \
+        else min(st.session_state.transcript_end, len(transcript))
+    transcript_start = max(0, transcript_end - st.session_state.transcript_shown)
+    
+    if transcript_start > 0:
+        st.button(f"⬆️ 이전 메시지 더 보기 ({transcript_start}개)", key="transcript_load_earlier",
+                  use_container_width=True, on_click=_load_earlier_messages, args=(transcript_end,))
+    
+    if TRANSCRIPT_RENDER_MODE == "message":
+        for message in transcript[transcript_start:transcript_end]:
+            render_chat_message(message)
+    else:
+        render_transcript(transcript[transcript_start:transcript_end])
+    
+    if transcript_end < len(transcript):
+        st.button(f"⬇️ 최근 메시지로 돌아가기 ({len(transcript) - transcript_end}개 더)",
+                  key="transcript_back_to_latest", use_container_width=True, on_click=_show_latest_messages)
+
+    for kind, notice in st.session_state.pop("answer_notices", []):
+        (st.error if kind == "error" else st.warning)(notice)
 
-    # 타이핑 표시기
+    # 답변을 기다리던 중 다른 세션으로 옮겼으면 진행 표시만 정리 (답변은 작업이 원래 세션에 저장)
+    pending = st.session_state.pending_job
+    if pending and not _is_current_session(pending["session_id"]):
+        st.session_state.pending_job = None
+        st.session_state.is_typing = False
+        st.session_state.pop("stream_extractor", None)
+
+    # 타이핑 표시기 - 답변은 백그라운드 작업으로 생성되고, 받은 조각이 같은 자리에 그려짐
     if st.session_state.is_typing:
-        render_typing_indicator()
-        
-        # 응답 생성 및 재실행
-        last_question = st.session_state.chat_history[-1]["content"]
-        generate_response(last_question)
-        st.rerun()
+        if not st.session_state.pending_job:
+            last_question = st.session_state.chat_history[-1]["content"]
+            generate_response(last_question)
+        if st.session_state.pending_job:
+            render_pending_response()
 
     # 출처는 이제 각 메시지별로 표시됨 (render_sources_section 제거)
 
+@st.fragment
+def render_chat_input():
+    """
+    질문 입력창 (프래그먼트)
+    입력이 바뀌어도 이 영역만 다시 실행하고, 질문이 접수된 경우에만 전체 페이지를 다시 그립니다.
+    """
     # Perplexity 스타일 검색창 - Streamlit 네이티브 기능 유지, textarea로 변경
     st.markdown('<div class="perplexity-search-container">', unsafe_allow_html=True)
     
@@ -377,14 +583,20 @@ if st.session_state.current_tab == "home":
     )
     
     st.markdown('</div>', unsafe_allow_html=True)
-
-elif st.session_state.current_tab == "history":
-    # 대화 기록 탭
-    render_tab_welcome("history")
     
-    # 검색 바 - 중앙 집중형 컨테이너로 감싸기
-    st.markdown('<div class="chat-history-container">', unsafe_allow_html=True)
+    for notice in st.session_state.pop("input_notices", []):
+        st.warning(notice)
     
+    # 질문이 접수되었으면 대화 내용과 사이드바까지 갱신
+    if st.session_state.pop("input_submitted", False):
+        st.rerun()
+
+@st.fragment
+def render_history_list():
+    """
+    대화 기록 탭의 검색창과 세션 목록 (프래그먼트)
+    검색어 입력과 더 보기는 이 영역만 다시 실행하고, 세션 선택/삭제는 전체 페이지를 다시 그립니다.
+    """
     # 검색창을 전체 너비로 사용
     search_query = st.text_input(
         "대화 검색",
@@ -393,23 +605,36 @@ elif st.session_state.current_tab == "history":
         label_visibility="collapsed"
     )
     
-    # 대화 목록 가져오기 및 정렬
+    # 검색어가 바뀌면 처음부터 다시 표시
+    if search_query != st.session_state.history_query:
+        st.session_state.history_query = search_query
+        st.session_state.history_start_cursor = None
+        st.session_state.history_pages = 1
+    
+    # 대화 목록 가져오기 및 정렬 - 불러온 페이지만큼만 (커서 기반)
+    history_limit = HISTORY_PAGE_SIZE * st.session_state.history_pages
+    next_cursor = None
     try:
         if search_query:
-            sessions = chat_storage.search_sessions(search_query)
+            sessions, next_cursor = page_sessions(chat_storage.search_sessions(search_query),
+                                                  st.session_state.history_start_cursor, history_limit)
         else:
-            sessions = chat_storage.get_all_sessions()
+            sessions, next_cursor = chat_storage.list_sessions_page(st.session_state.history_start_cursor,
+                                                                    history_limit)
         
         # 세션 목록 유효성 검증 및 정렬
         if sessions:
             sessions = [s for s in sessions if s and 'id' in s and 'title' in s]
-            sessions.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+            if not search_query:  # 검색 결과는 점수순 유지
+                sessions.sort(key=lambda x: x.get('created_at', ''), reverse=True)
     except Exception as e:
         st.error(f"❌ 세션 목록 로딩 실패: {str(e)}")
         sessions = []
     
     # 저장된 대화 목록 표시
     if sessions:
+        # 세션 요약 인덱스로 메시지 수 표시 (세션마다 메시지를 조회하지 않음)
+        summaries = chat_storage.get_session_summaries([s['id'] for s in sessions])
         for session in sessions:
             is_current_session = session['id'] == st.session_state.current_session_id
             
@@ -422,9 +647,9 @@ elif st.session_state.current_tab == "history":
                     session_title = session.get('title', '새 대화')
                     
                     # 메시지 개수와 시간 정보로 미리보기 생성
-                    messages = chat_storage.get_messages(session['id'])
-                    if messages:
-                        message_count = len(messages)
+                    summary = summaries.get(str(session['id']))
+                    message_count = summary['message_count'] if summary else 0
+                    if message_count:
                         created_at = session.get('created_at', '')
                         if created_at and 'T' in created_at:
                             date_part = created_at.split('T')[0]
@@ -433,6 +658,10 @@ elif st.session_state.current_tab == "history":
                             preview_text = f"{message_count}개 메시지"
                     else:
                         preview_text = "빈 대화"
+                    # 메시지 본문에서 찾은 검색 결과는 일치 부분을 미리보기로 표시
+                    search_match = session.get('search_match')
+                    if search_match and search_match['field'] == 'message':
+                        preview_text = f"🔎 {search_match['snippet']}"
                     
                     # 현재 세션 표시
                     current_indicator = "🔵 " if is_current_session else ""
@@ -479,6 +708,29 @@ elif st.session_state.current_tab == "history":
     else:
         st.info("저장된 대화가 없습니다. 새 대화를 시작해보세요!")
     
+    # 더 보기 - 최대 HISTORY_MAX_ROWS개까지 늘리고, 그 뒤로는 앞쪽 페이지를 내려놓고 다음 페이지를 그림
+    if next_cursor:
+        first_page_cursor = make_cursor(sessions[min(HISTORY_PAGE_SIZE, len(sessions)) - 1]) if sessions else None
+        st.button("⬇️ 이전 대화 더 보기", key="history_load_more", use_container_width=True,
+                  on_click=_load_more_history, args=(first_page_cursor,))
+    if st.session_state.history_start_cursor:
+        st.button("⬆️ 최근 대화부터 보기", key="history_back_to_top", use_container_width=True,
+                  on_click=_history_back_to_top)
+
+# 탭별 콘텐츠 표시
+if st.session_state.current_tab == "home":
+    render_home_transcript()
+    render_chat_input()
+
+elif st.session_state.current_tab == "history":
+    # 대화 기록 탭
+    render_tab_welcome("history")
+    
+    # 검색 바 - 중앙 집중형 컨테이너로 감싸기
+    st.markdown('<div class="chat-history-container">', unsafe_allow_html=True)
+    
+    render_history_list()
+    
     # 새 대화 버튼을 하단에 배치
     st.markdown("---")
     if st.button("➕ 새 대화 시작", key="new_chat_btn", use_container_width=True, type="primary"):
@@ -6,7 +6,9 @@ from .chat_message import (
     render_user_message,
     render_assistant_message,
     render_typing_indicator,
-    render_message_sources
+    render_streaming_message,
+    render_message_sources,
+    render_transcript
 )
 from .sidebar import (
     render_sidebar,
@@ -29,7 +31,9 @@ __all__ = [
     'render_user_message', 
     'render_assistant_message',
     'render_typing_indicator',
+    'render_streaming_message',
     'render_message_sources',
+    'render_transcript',
     'render_sidebar',
     'handle_tab_change',
     'get_tab_info',
@@ -3,9 +3,23 @@
 사용자와 어시스턴트의 메시지를 표시하는 재사용 가능한 컴포넌트
 """
 import streamlit as st
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import re
 
+from src.utils.render_cache import content_key, render_cache
+from src.utils.source_extractor import extract_sources
+
+# 대화 내용을 한 덩어리로 합칠 때 지우는 빈 줄
+_TRANSCRIPT_BLANK_LINES = re.compile(r"\n[ \t]*(?=\n)")
+
+
+def _time_display(message: Dict[str, any]) -> str:
+    """time 또는 created_at 필드에서 표시할 시간을 꺼냅니다. (ISO 형식이면 시:분만)"""
+    time_display = message.get("time") or message.get("created_at", "")
+    if "T" in str(time_display):  # ISO 형식이면 시간만 추출
+        time_display = time_display.split("T")[1][:5] if "T" in time_display else time_display
+    return str(time_display)
+
 
 def render_user_message(message: Dict[str, str]) -> None:
     """
@@ -16,92 +30,88 @@ def render_user_message(message: Dict[str, str]) -> None:
             - content: 메시지 내용
             - time 또는 created_at: 메시지 시간
     """
-    # time 또는 created_at 필드에서 시간 추출 (안전 처리)
-    time_display = message.get("time") or message.get("created_at", "")
-    if "T" in str(time_display):  # ISO 형식이면 시간만 추출
-        time_display = time_display.split("T")[1][:5] if "T" in time_display else time_display
-    
-    st.markdown(f"""
+    st.markdown(_user_message_html(message), unsafe_allow_html=True)
+
+
+def _user_message_html(message: Dict[str, str]) -> str:
+    return f"""
     <div class="imfact-chat-message user">
         <div class="message-header">
             <div class="avatar user-avatar">U</div>
             <span class="name-title">You</span>
-            <span class="time">{time_display}</span>
+            <span class="time">{_time_display(message)}</span>
         </div>
         <div class="message-content">
             {message["content"]}
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
 
 def render_assistant_message(message: Dict[str, any]) -> None:
     """
     어시스턴트 메시지를 렌더링합니다.
     메시지와 출처를 함께 표시 (Perplexity 스타일)
+    출처 추출과 HTML 생성 결과는 메시지 내용 해시로 캐시되어, 다시 실행될 때는 캐시 조회만 합니다.
     """
-    content = message["content"]
+    message_html, sources_html = _assistant_message_fragments(message)
+
+    # 메시지 본문 렌더링
+    st.markdown(message_html, unsafe_allow_html=True)
     
-    # time 또는 created_at 필드에서 시간 추출 (안전 처리)
-    time_display = message.get("time") or message.get("created_at", "")
-    if "T" in str(time_display):  # ISO 형식이면 시간만 추출
-        time_display = time_display.split("T")[1][:5] if "T" in time_display else time_display
+    # 출처가 있으면 메시지 바로 아래에 표시 (Perplexity 스타일)
+    if sources_html:
+        st.markdown(sources_html, unsafe_allow_html=True)
+
+
+def _assistant_message_fragments(message: Dict[str, any]) -> Tuple[str, str]:
+    """
+    어시스턴트 메시지의 (본문 HTML, 출처 버튼 HTML)을 렌더링 캐시에서 꺼냅니다.
+    저장된 출처도 결과를 바꾸므로 키에 포함합니다. (없으면 추출 결과가 매번 같으므로 내용만으로 충분)
+    추출한 출처는 메시지에 다시 쓰지 않습니다 - 다음 렌더링의 키와 결과가 달라지지 않도록 캐시에만 보관합니다.
+    """
+    content = message["content"]
+    time_display = _time_display(message)
+    stored_sources = message.get("sources")
 
+    return render_cache.get_or_render(
+        content_key(content, time_display, _sources_key(stored_sources)),
+        lambda: _render_assistant_parts(content, stored_sources, time_display)
+    )
+
+
+def _sources_key(sources: Optional[List[Dict[str, str]]]) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """렌더링 캐시 키에 넣을 저장된 출처 (없으면 None)"""
+    if not sources:
+        return None
+    return tuple((str(source.get("num", "")), str(source.get("url", ""))) for source in sources)
+
+
+def _render_assistant_parts(
+    content: str,
+    stored_sources: Optional[List[Dict[str, str]]],
+    time_display: str
+) -> Tuple[str, str]:
+    """
+    캐시에 없는 메시지를 처음 렌더링합니다.
+
+    Returns:
+        (본문 HTML, 출처 버튼 HTML - 출처가 없으면 빈 문자열)
+    """
     # 기존에 저장된 출처가 있으면 사용, 없으면 새로 추출
-    if "sources" in message and message["sources"]:
-        sources = message["sources"]
+    if stored_sources:
+        sources = stored_sources
         body = content  # 이미 처리된 본문
     else:
-        # 답변에서 출처 URL 자동 추출 (다양한 패턴 지원)
-        sources = []
-        
-        # 1. 번호가 있는 URL: "1. https://example.com" 
-        numbered_url_pattern = r"^(\d+)\.\s*(https?://\S+)"
-        
-        # 2. 일반 URL: "https://example.com" 또는 "출처: https://example.com"
-        general_url_pattern = r"(https?://[^\s]+)"
-        
-        # 3. 도메인만 있는 경우: "news.kbs.co.kr" -> "https://news.kbs.co.kr"로 변환
-        domain_pattern = r"(?:^|\s)([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(?:\s|$)"
-        
-        lines = content.strip().split("\n")
-        body_lines = []
-        
-        for line in lines:
-            line_processed = False
-            
-            # 1. 번호가 있는 URL 패턴 확인
-            m = re.match(numbered_url_pattern, line.strip())
-            if m:
-                num, url = m.groups()
-                sources.append({"num": num, "url": url})
-                line_processed = True
-            
-            # 2. 일반 URL 패턴에서 URL 추출
-            elif not line_processed:
-                urls = re.findall(general_url_pattern, line)
-                for url in urls:
-                    sources.append({"num": str(len(sources) + 1), "url": url})
-            
-            # 3. 도메인만 있는 경우 (news.kbs.co.kr 같은)
-            if not line_processed and not re.search(general_url_pattern, line):
-                domains = re.findall(domain_pattern, line)
-                for domain in domains:
-                    # 일반적인 도메인이고 URL이 아닌 경우에만 처리
-                    if "." in domain and not domain.startswith("http") and len(domain.split(".")) >= 2:
-                        url = f"https://{domain}"
-                        sources.append({"num": str(len(sources) + 1), "url": url})
-                        line_processed = True
-            
-            # URL/도메인이 포함된 줄이 아니면 본문에 추가
-            if not line_processed:
-                body_lines.append(line)
-        
-        body = "\n".join(body_lines).strip()
-        
-        # 메시지에 출처 저장 (다음번 렌더링을 위해)
-        message["sources"] = sources
+        body, sources = extract_sources(content)
+    return _assistant_message_html(body, time_display), _sources_html(sources)
 
+
+def _assistant_message_html(body: str, time_display: str) -> str:
+    """
+    어시스턴트 메시지 본문을 말풍선 HTML로 변환합니다.
+    특수 태그(인용문, 주요 팩트 등)와 줄바꿈을 HTML로 바꿉니다.
+    """
     # 특수 태그 변환 (인용문, 주요 팩트 등)
     body = body.replace("<citation>", '<div class="imfact-citation">').replace("</citation>", '</div>')
     body = body.replace("<key-fact>", '<span class="key-fact">').replace("</key-fact>", '</span>')
@@ -110,8 +120,7 @@ def render_assistant_message(message: Dict[str, any]) -> None:
     # 줄바꿈을 HTML로 변환
     body_html = body.replace('\n', '<br>')
 
-    # 메시지 본문 렌더링
-    st.markdown(f"""
+    return f"""
     <div class="imfact-chat-message assistant">
         <div class="message-header">
             <div class="avatar assistant-avatar">🌍</div>
@@ -122,11 +131,20 @@ def render_assistant_message(message: Dict[str, any]) -> None:
             {body_html}
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_streaming_message(content: str, placeholder=None) -> None:
+    """
+    스트리밍 중인 어시스턴트 메시지를 렌더링합니다.
+    출처 추출은 답변이 완성된 뒤 render_assistant_message에서 수행합니다.
     
-    # 출처가 있으면 메시지 바로 아래에 표시 (Perplexity 스타일)
-    if sources:
-        render_message_sources(sources)
+    Args:
+        content: 지금까지 받은 답변 텍스트
+        placeholder: 덮어쓸 st.empty() 컨테이너 (없으면 새 요소로 렌더링)
+    """
+    target = placeholder if placeholder is not None else st
+    target.markdown(_assistant_message_html(content.strip(), "응답 작성 중..."), unsafe_allow_html=True)
 
 
 def render_message_sources(sources: List[Dict[str, str]]) -> None:
@@ -139,6 +157,15 @@ def render_message_sources(sources: List[Dict[str, str]]) -> None:
     if not sources:
         return
     
+    # 모든 출처 버튼을 한 번에 렌더링 (컨테이너 없이)
+    st.markdown(_sources_html(sources), unsafe_allow_html=True)
+
+
+def _sources_html(sources: List[Dict[str, str]]) -> str:
+    """출처 목록을 출처 버튼 HTML로 변환합니다. (출처가 없으면 빈 문자열)"""
+    if not sources:
+        return ""
+    
     # 출처 버튼들을 그리드 없이 직접 렌더링
     source_buttons_html = '<div class="sources-grid">'
     for i, source in enumerate(sources):
@@ -165,9 +192,7 @@ def render_message_sources(sources: List[Dict[str, str]]) -> None:
         source_buttons_html += f'<a href="{source["url"]}" target="_blank" class="source-link-button" title="{source["url"]}">{domain}</a>'
     
     source_buttons_html += '</div>'
-    
-    # 모든 출처 버튼을 한 번에 렌더링 (컨테이너 없이)
-    st.markdown(source_buttons_html, unsafe_allow_html=True)
+    return source_buttons_html
 
 
 def render_typing_indicator() -> None:
@@ -198,6 +223,34 @@ def render_sources_section() -> None:
     pass  # 빈 함수로 유지 (기존 호출 코드와의 호환성을 위해)
 
 
+def render_transcript(messages: List[Dict[str, any]]) -> None:
+    """
+    대화 내용을 HTML 한 덩어리로 합쳐 요소 하나로 렌더링합니다.
+    메시지마다 st.markdown을 호출하는 것보다 다시 실행될 때 브라우저로 보내는 요소 수가 적습니다.
+    마지막 메시지만 등장 애니메이션을 유지합니다. (나머지는 HTML이 바뀌어도 다시 움직이지 않음)
+    
+    Args:
+        messages: render_chat_message와 같은 형식의 메시지 목록
+    """
+    fragments = []
+    for position, message in enumerate(messages):
+        if message["role"] == "user":
+            # 사용자 입력의 빈 줄은 마크다운 HTML 블록을 끝내 뒤쪽 메시지까지 깨뜨리므로 제거
+            parts = [_TRANSCRIPT_BLANK_LINES.sub("", _user_message_html(message))]
+        elif message["role"] == "assistant":
+            parts = [fragment for fragment in _assistant_message_fragments(message) if fragment]
+        else:
+            continue
+        html = "\n".join(part.strip() for part in parts)
+        if position == len(messages) - 1:
+            html = f'<div class="imfact-transcript-latest">\n{html}\n</div>'
+        fragments.append(html)
+    
+    if fragments:
+        st.markdown('<div class="imfact-transcript">\n' + "\n".join(fragments) + "\n</div>",
+                    unsafe_allow_html=True)
+
+
 def render_chat_message(message: Dict[str, any]) -> None:
     """
     메시지 타입에 따라 적절한 렌더링 함수를 호출합니다.
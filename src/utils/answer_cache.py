@@ -0,0 +1,210 @@
+"""
+답변 캐시 유틸리티
+정규화된 질문을 키로 백엔드 답변을 저장하여 같은 질문에 RAG 호출을 반복하지 않습니다.
+메모리 계층(LRU + TTL + 바이트 상한)과 선택적인 디스크 계층(SQLite)으로 구성됩니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.question_normalizer import normalize_question
+
+# 메모리 캐시 최대 크기(바이트)
+ANSWER_CACHE_MAX_BYTES = int(os.getenv("ANSWER_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+# 답변 유효 시간(초)
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+# 디스크 캐시 파일 경로 (비어 있으면 디스크 계층 비활성화)
+ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", "")
+# 디스크 캐시 최대 답변 수 (넘으면 만료가 가까운 것부터 삭제)
+ANSWER_CACHE_MAX_ROWS = int(os.getenv("ANSWER_CACHE_MAX_ROWS", "10000"))
+
+
+def _tee(stream: Iterable[str], sink: List[str]) -> Iterator[str]:
+    """스트림을 그대로 흘려보내며 조각을 sink에 모읍니다. 원본 제너레이터의 반환값을 돌려줍니다."""
+    iterator = iter(stream)
+    while True:
+        try:
+            chunk = next(iterator)
+        except StopIteration as stop:
+            return stop.value
+        sink.append(chunk)
+        yield chunk
+
+
+class AnswerCache:
+    """
+    질문-답변 캐시
+    메모리에서 LRU 순서로 관리하며, 만료되었거나 바이트 상한을 넘으면 오래된 항목부터 제거합니다.
+    디스크 계층이 켜져 있으면 재시작 후에도 답변이 유지됩니다.
+    디스크 계층은 저장할 때마다 만료된 답변을 지우고 max_rows를 넘지 않도록 유지합니다.
+    디스크 조회는 별도 잠금으로 보호하여 메모리 적중 요청이 디스크 I/O를 기다리지 않습니다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = ANSWER_CACHE_MAX_BYTES,
+        ttl: float = ANSWER_CACHE_TTL,
+        path: Optional[str] = ANSWER_CACHE_PATH,
+        clock: Callable[[], float] = time.time,
+        max_rows: int = ANSWER_CACHE_MAX_ROWS
+    ):
+        """
+        Args:
+            max_bytes: 메모리 계층 최대 크기(바이트)
+            ttl: 답변 유효 시간(초)
+            path: 디스크 계층 SQLite 파일 경로 (None 또는 빈 문자열이면 비활성화)
+            clock: 벽시계 (디스크 계층과 공유하므로 monotonic이 아닌 시간 사용)
+            max_rows: 디스크 계층 최대 답변 수
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_rows = max(1, max_rows)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (answer, size_bytes, expires_at)
+        self._entries: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self._size = 0
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "key TEXT PRIMARY KEY, answer TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS answers_expires_at ON answers (expires_at)")
+            self._db.execute("DELETE FROM answers WHERE expires_at <= ?", (clock(),))
+            self._db.commit()
+
+    @staticmethod
+    def make_key(question: str) -> str:
+        return normalize_question(question)
+
+    def get(self, question: str) -> Optional[str]:
+        """캐시된 답변을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        key = self.make_key(question)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[0]
+                self._remove(key)
+
+        row = None
+        if self._db is not None:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT answer, expires_at FROM answers WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            # 디스크를 읽는 사이 put()으로 더 새 답변이 들어왔으면 그대로 둠
+            if key not in self._entries:
+                self._insert(key, row[0], row[1])
+            self._counters["disk_hits"] += 1
+            return row[0]
+
+    def put(self, question: str, answer: str) -> None:
+        """답변을 저장합니다. 상한보다 큰 답변은 저장하지 않습니다."""
+        key = self.make_key(question)
+        if not key or not answer:
+            return
+        now = self._clock()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._insert(key, answer, expires_at)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO answers (key, answer, expires_at) VALUES (?, ?, ?)",
+                    (key, answer, expires_at)
+                )
+                evicted = self._trim_disk(now)
+                self._db.commit()
+            if evicted:
+                with self._lock:
+                    self._counters["disk_evictions"] += evicted
+
+    def stream_through(self, question: str, stream_fn: Callable[[str], Iterator[str]]) -> Iterator[str]:
+        """
+        캐시를 먼저 확인하고, 없으면 stream_fn의 답변 조각을 그대로 흘려보냅니다.
+        stream_fn 제너레이터가 True를 반환한(정상 답변) 경우에만 캐시에 저장합니다.
+        """
+        cached = self.get(question)
+        if cached is not None:
+            yield cached
+            return True
+
+        chunks: List[str] = []
+        ok = yield from _tee(stream_fn(question), chunks)
+        if ok:
+            self.put(question, "".join(chunks))
+        return ok
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM answers")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 캐시 현황을 반환합니다."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["disk_hits"] + self._counters["misses"]
+            hit_count = self._counters["hits"] + self._counters["disk_hits"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "max_rows": self.max_rows,
+                "hit_rate": round(hit_count / lookups, 3) if lookups else 0.0,
+                "disk_enabled": self._db is not None,
+            }
+
+    def _trim_disk(self, now: float) -> int:
+        """만료된 답변과 max_rows를 넘는 답변(만료가 가까운 순)을 지우고 지운 수를 반환합니다. (_db_lock 안에서 호출)"""
+        removed = self._db.execute("DELETE FROM answers WHERE expires_at <= ?", (now,)).rowcount
+        (rows,) = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()
+        if rows > self.max_rows:
+            removed += self._db.execute(
+                "DELETE FROM answers WHERE key IN (SELECT key FROM answers ORDER BY expires_at LIMIT ?)",
+                (rows - self.max_rows,)
+            ).rowcount
+        return removed
+
+    def _insert(self, key: str, answer: str, expires_at: float) -> None:
+        size = len(key.encode("utf-8")) + len(answer.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (answer, size, expires_at)
+        self._size += size
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._counters["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+# 싱글톤 인스턴스
+answer_cache = AnswerCache()
@@ -0,0 +1,179 @@
+"""
+답변 생성 작업 실행기
+백엔드 답변 생성을 Streamlit 스크립트 스레드와 분리된 워커 풀에서 실행합니다.
+작업은 (세션 ID, 작업 ID)로 식별되며, 페이지는 완료 여부를 주기적으로 확인합니다.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 동시에 답변을 생성하는 워커 수
+ANSWER_WORKERS = int(os.getenv("ANSWER_WORKERS", "8"))
+# 워커가 모두 바쁠 때 대기열에 쌓아 둘 수 있는 작업 수
+ANSWER_QUEUE_DEPTH = int(os.getenv("ANSWER_QUEUE_DEPTH", "32"))
+# 완료된 작업 결과를 찾아가지 않을 때 보관하는 시간(초)
+ANSWER_RESULT_TTL = float(os.getenv("ANSWER_RESULT_TTL", "600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없을 때 발생합니다."""
+
+
+class AnswerJob:
+    """답변 생성 작업 하나의 상태와 지금까지 받은 답변 조각"""
+
+    def __init__(self, session_id: str, question: str):
+        self.job_id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.question = question
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.result: Any = None  # 완료 콜백의 반환값 (예: 저장한 답변 메시지)
+        self.complete_error: Optional[str] = None  # 완료 콜백에서 발생한 오류
+        self._chunks: List[str] = []
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.session_id, self.job_id)
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 답변 텍스트 (스트리밍 중에도 읽을 수 있음)"""
+        return "".join(self._chunks)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+
+class AnswerJobExecutor:
+    """
+    크기가 제한된 워커 풀 + 대기열
+    워커 수와 대기열 깊이를 넘는 작업은 QueueFullError로 거절합니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = ANSWER_WORKERS,
+        queue_depth: int = ANSWER_QUEUE_DEPTH,
+        result_ttl: float = ANSWER_RESULT_TTL
+    ):
+        """
+        Args:
+            max_workers: 동시에 실행할 작업 수
+            queue_depth: 실행 대기 중으로 허용할 작업 수
+            result_ttl: 완료된 작업을 보관하는 시간(초)
+        """
+        self.max_workers = max(1, max_workers)
+        self.queue_depth = max(0, queue_depth)
+        self.result_ttl = result_ttl
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="answer-job")
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.queue_depth)
+        self._lock = threading.Lock()
+        self._jobs: Dict[Tuple[str, str], AnswerJob] = {}
+
+    def submit(
+        self,
+        session_id: str,
+        question: str,
+        answer_fn: Callable[[str], Iterable[str]],
+        on_complete: Optional[Callable[[AnswerJob], Any]] = None
+    ) -> AnswerJob:
+        """
+        답변 생성 작업을 등록합니다.
+
+        Args:
+            session_id: 작업이 속한 채팅 세션 ID
+            question: 질문
+            answer_fn: 질문을 받아 답변 조각을 반환하는 함수
+            on_complete: 답변 생성이 끝나면 워커 스레드에서 호출할 함수 (페이지가 닫혀도 실행됨)
+                반환값은 job.result에, 예외는 job.complete_error에 저장되며, 호출이 끝난 뒤에 작업이 완료 상태가 됩니다.
+
+        Returns:
+            등록된 작업
+
+        Raises:
+            QueueFullError: 워커와 대기열이 모두 찬 경우
+        """
+        self._evict_expired()
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError("답변 생성 대기열이 가득 찼습니다.")
+
+        job = AnswerJob(str(session_id), question)
+        with self._lock:
+            self._jobs[job.key] = job
+        try:
+            self._pool.submit(self._run, job, answer_fn, on_complete)
+        except RuntimeError:
+            self._slots.release()
+            with self._lock:
+                self._jobs.pop(job.key, None)
+            raise
+        return job
+
+    def get(self, session_id: str, job_id: str) -> Optional[AnswerJob]:
+        """작업을 조회합니다. 없거나 만료되었으면 None을 반환합니다."""
+        with self._lock:
+            return self._jobs.get((str(session_id), job_id))
+
+    def discard(self, session_id: str, job_id: str) -> None:
+        """결과를 가져간 작업을 목록에서 제거합니다."""
+        with self._lock:
+            self._jobs.pop((str(session_id), job_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 작업 현황을 반환합니다."""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            "workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "queued": statuses.count(QUEUED),
+            "running": statuses.count(RUNNING),
+            "finished": statuses.count(DONE) + statuses.count(FAILED),
+        }
+
+    def _run(
+        self,
+        job: AnswerJob,
+        answer_fn: Callable[[str], Iterable[str]],
+        on_complete: Optional[Callable[[AnswerJob], Any]] = None
+    ) -> None:
+        job.status = RUNNING
+        try:
+            try:
+                for chunk in answer_fn(job.question):
+                    job._chunks.append(chunk)
+            except Exception as e:
+                job.error = str(e)
+            if on_complete is not None:
+                try:
+                    job.result = on_complete(job)
+                except Exception as e:
+                    job.complete_error = str(e)
+            job.status = FAILED if job.error else DONE
+        finally:
+            job.finished_at = time.monotonic()
+            self._slots.release()
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, job in self._jobs.items()
+                       if job.finished_at is not None and now - job.finished_at > self.result_ttl]
+            for key in expired:
+                del self._jobs[key]
+
+
+# 싱글톤 인스턴스 (프로세스 전체에서 공유)
+answer_jobs = AnswerJobExecutor()
@@ -0,0 +1,106 @@
+"""
+답변 스트리밍 파싱 유틸리티
+/im-fact/ask 응답을 형식(SSE, chunked 텍스트, 단일 JSON)에 맞게 텍스트 조각으로 변환합니다.
+"""
+from typing import Iterator
+
+import requests
+
+from src.utils.fast_json import json_body, loads
+
+SSE_CONTENT_TYPE = "text/event-stream"
+JSON_CONTENT_TYPE = "application/json"
+SSE_DONE = "[DONE]"
+
+
+def _sse_payload_text(data: str) -> str:
+    """SSE data 필드에서 텍스트를 꺼냅니다. JSON이면 content/delta/token 키를 사용합니다."""
+    try:
+        payload = loads(data)
+    except ValueError:
+        return data
+
+    if isinstance(payload, dict):
+        for key in ("delta", "content", "token", "text"):
+            value = payload.get(key)
+            if isinstance(value, str):
+                return value
+        return ""
+    if isinstance(payload, str):
+        return payload
+    return data
+
+
+def _ensure_utf8(resp: requests.Response) -> None:
+    """
+    Content-Type에 charset이 없으면 UTF-8로 디코딩합니다.
+    requests는 charset 없는 text/* 응답을 ISO-8859-1로 간주하여 한글이 깨집니다.
+    """
+    if "charset=" not in resp.headers.get("Content-Type", "").lower():
+        resp.encoding = "utf-8"
+
+
+def iter_sse_chunks(resp: requests.Response) -> Iterator[str]:
+    """
+    Server-Sent Events 응답을 이벤트 단위 텍스트로 변환합니다.
+    여러 줄의 data 필드는 줄바꿈으로 합치고, [DONE] 이벤트에서 종료합니다.
+    SSE는 명세상 항상 UTF-8입니다.
+    """
+    resp.encoding = "utf-8"
+    data_lines = []
+    for raw_line in resp.iter_lines(decode_unicode=True):
+        line = raw_line if raw_line is not None else ""
+        if line == "":
+            # 빈 줄: 이벤트 경계
+            if data_lines:
+                data = "\n".join(data_lines)
+                data_lines = []
+                if data.strip() == SSE_DONE:
+                    return
+                text = _sse_payload_text(data)
+                if text:
+                    yield text
+            continue
+        if line.startswith(":"):
+            continue  # 주석 / keep-alive
+        field, _, value = line.partition(":")
+        if field == "data":
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+
+    if data_lines:
+        data = "\n".join(data_lines)
+        if data.strip() != SSE_DONE:
+            text = _sse_payload_text(data)
+            if text:
+                yield text
+
+
+def iter_text_chunks(resp: requests.Response) -> Iterator[str]:
+    """chunked 텍스트 응답을 도착하는 대로 반환합니다."""
+    _ensure_utf8(resp)
+    for chunk in resp.iter_content(chunk_size=None, decode_unicode=True):
+        if chunk:
+            yield chunk
+
+
+def iter_answer_chunks(resp: requests.Response) -> Iterator[str]:
+    """
+    응답 형식을 판별하여 답변 텍스트 조각을 순서대로 반환합니다.
+
+    Args:
+        resp: stream=True로 받은 200 응답
+
+    Returns:
+        텍스트 조각 이터레이터 (단일 JSON 응답이면 조각 하나)
+    """
+    content_type = resp.headers.get("Content-Type", "").lower()
+
+    if SSE_CONTENT_TYPE in content_type:
+        yield from iter_sse_chunks(resp)
+    elif JSON_CONTENT_TYPE in content_type:
+        # 기존 단발성 JSON 응답으로 폴백
+        content = json_body(resp).get("content", "")
+        if content:
+            yield content
+    else:
+        yield from iter_text_chunks(resp)
@@ -0,0 +1,246 @@
+"""
+비동기 백엔드 클라이언트 (asyncio + httpx)
+세션/메시지/질문 API를 ChatStorage와 같은 형태로 제공하며,
+여러 세션의 메시지를 동시에 불러오는 등의 fan-out 작업을 제한된 동시성으로 실행합니다.
+기존 동기 코드(app.py)에서는 SyncBackendFacade를 통해 그대로 호출할 수 있습니다.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
+
+import httpx
+
+from src.utils.backend_client import backend_client
+from src.utils.backend_router import BackendRouter, ask_router, storage_router
+from src.utils.fast_json import json_body
+from src.utils.retry_policy import ASK_RETRY_POLICY, RetryPolicy, RetryState, is_idempotent
+from src.utils.transfer_stats import transfer_stats
+
+try:
+    import h2  # noqa: F401  (httpx의 HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# fan-out 작업의 최대 동시 요청 수
+BACKEND_ASYNC_CONCURRENCY = int(os.getenv("BACKEND_ASYNC_CONCURRENCY", "16"))
+
+
+class AsyncBackendClient:
+    """
+    httpx.AsyncClient 기반 백엔드 클라이언트
+    HTTP/2(h2 설치 시)로 하나의 연결에서 요청을 다중화하고, 세마포어로 동시 요청 수를 제한합니다.
+    요청은 동기 클라이언트와 같은 라우터로 복제본을 골라 보내고, 결과도 같은 라우터에 기록됩니다.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = BACKEND_ASYNC_CONCURRENCY,
+        router: BackendRouter = storage_router,
+        ask_router: BackendRouter = ask_router,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        """
+        Args:
+            concurrency: 동시에 보낼 최대 요청 수
+            router: 세션/메시지 요청용 복제본 라우터
+            ask_router: 질문 요청용 복제본 라우터
+            retry_policy: 재시도 정책 (없으면 동기 클라이언트와 공유)
+        """
+        self.concurrency = max(1, concurrency)
+        self.router = router
+        self.ask_router = ask_router
+        self.retry_policy = retry_policy or backend_client.retry_policy
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        # 이벤트 루프 안에서 생성해야 하므로 첫 요청 시점에 만듦
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=self.concurrency,
+                                    max_keepalive_connections=self.concurrency)
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        timeout: float = 10,
+        router: Optional[BackendRouter] = None,
+        retry: Optional[RetryPolicy] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        동시성 제한과 재시도 정책을 적용하여 요청을 보냅니다.
+        재시도 조건과 복제본 장애 조치는 동기 클라이언트와 같습니다. (RetryState 공유)
+
+        Args:
+            retry: 재시도 정책 (없으면 클라이언트 기본 정책)
+            idempotent: 멱등 여부 (없으면 is_idempotent로 판단 - BACKEND_IDEMPOTENCY_KEYS 참고)
+        """
+        client = self._ensure_client()
+        router = router or self.router
+        policy = retry or self.retry_policy
+        if idempotent is None:
+            idempotent = is_idempotent(method, kwargs.get("headers"))
+        state = RetryState(policy, idempotent, router.is_available)
+
+        async with self._semaphore:
+            while True:
+                try:
+                    resp = await self._send(client, router, state.tried, method, path,
+                                            timeout=state.next_timeout(timeout), **kwargs)
+                except httpx.TransportError as e:
+                    # 비멱등 요청은 서버에 닿지 않은 연결 단계 오류만 재시도
+                    safe = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                    delay = state.delay_after_error(safe)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    continue
+
+                delay = state.delay_after_response(resp)
+                if delay is None:
+                    return resp
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _send(
+        client: httpx.AsyncClient,
+        router: BackendRouter,
+        tried: List[Any],
+        method: str,
+        path: str,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        라우터가 고른 복제본으로 요청 한 번을 보내고 결과를 기록합니다.
+        예외(취소 포함)가 나도 결과를 기록하므로 복제본의 진행 중 요청 수가 남지 않습니다.
+        """
+        endpoint = router.choose(exclude=tried)
+        if endpoint is None:
+            raise httpx.ConnectError("사용 가능한 백엔드 서버가 없습니다.")
+        tried.append(endpoint)
+
+        sent_at = time.monotonic()
+        ok = False
+        try:
+            resp = await client.request(method, f"{endpoint.url}/{path.lstrip('/')}", **kwargs)
+            ok = resp.status_code < 500
+        finally:
+            router.record(endpoint, time.monotonic() - sent_at, ok)
+        transfer_stats.record(method, str(resp.url), resp.num_bytes_downloaded, len(resp.content))
+        return resp
+
+    # ---- 세션 ----
+
+    async def create_session(self, title: str) -> str:
+        resp = await self.request("POST", "/chat/sessions", json={"title": title})
+        resp.raise_for_status()
+        return str(json_body(resp)["id"])
+
+    async def get_all_sessions(self) -> List[Dict[str, Any]]:
+        resp = await self.request("GET", "/chat/sessions")
+        resp.raise_for_status()
+        return json_body(resp)
+
+    async def delete_session(self, session_id: str) -> bool:
+        resp = await self.request("DELETE", f"/chat/sessions/{session_id}")
+        return resp.status_code == 200
+
+    # ---- 메시지 ----
+
+    async def get_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        resp = await self.request("GET", "/chat/messages", params={"session_id": session_id})
+        resp.raise_for_status()
+        return json_body(resp)
+
+    async def save_message(self, session_id: str, message: Dict[str, Any]) -> bool:
+        payload = {
+            "session_id": int(session_id),
+            "role": message["role"],
+            "content": message["content"]
+        }
+        resp = await self.request("POST", "/chat/messages", json=payload, timeout=15)
+        return resp.status_code == 200
+
+    async def get_messages_many(self, session_ids: Iterable[str]) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """
+        여러 세션의 메시지를 동시에 불러옵니다. (동시성은 concurrency로 제한)
+        실패한 세션은 None으로 표시합니다.
+        """
+        ids = [str(session_id) for session_id in session_ids]
+        results = await asyncio.gather(*(self.get_messages(session_id) for session_id in ids),
+                                       return_exceptions=True)
+        return {session_id: (None if isinstance(result, BaseException) else result)
+                for session_id, result in zip(ids, results)}
+
+    # ---- 질문 ----
+
+    async def ask(self, question: str, timeout: float = 240) -> str:
+        resp = await self.request("POST", "/im-fact/ask", json={"content": question},
+                                  timeout=timeout, router=self.ask_router, retry=ASK_RETRY_POLICY)
+        resp.raise_for_status()
+        return json_body(resp).get("content", "")
+
+
+class SyncBackendFacade:
+    """
+    AsyncBackendClient를 동기 코드에서 호출하기 위한 래퍼
+    전용 스레드에서 이벤트 루프 하나를 돌리고, 각 호출을 그 루프에 제출한 뒤 결과를 기다립니다.
+    """
+
+    def __init__(self, client: AsyncBackendClient):
+        self.client = client
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True, name="backend-async-loop").start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """코루틴을 백그라운드 루프에서 실행하고 결과를 반환합니다."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    def create_session(self, title: str) -> str:
+        return self.run(self.client.create_session(title))
+
+    def get_all_sessions(self) -> List[Dict[str, Any]]:
+        return self.run(self.client.get_all_sessions())
+
+    def delete_session(self, session_id: str) -> bool:
+        return self.run(self.client.delete_session(session_id))
+
+    def get_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        return self.run(self.client.get_messages(session_id))
+
+    def save_message(self, session_id: str, message: Dict[str, Any]) -> bool:
+        return self.run(self.client.save_message(session_id, message))
+
+    def get_messages_many(self, session_ids: Iterable[str]) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        return self.run(self.client.get_messages_many(session_ids))
+
+    def ask(self, question: str) -> str:
+        return self.run(self.client.ask(question))
+
+
+# 싱글톤 인스턴스
+async_backend_client = AsyncBackendClient()
+async_backend = SyncBackendFacade(async_backend_client)
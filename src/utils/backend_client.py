@@ -0,0 +1,212 @@
+"""
+백엔드 HTTP 클라이언트 유틸리티
+keep-alive 커넥션 풀을 공유하여 ask_backend_stream과 ChatStorage가 같은 연결을 재사용합니다.
+요청마다 라우터가 고른 백엔드 복제본으로 보내며, 실패하면 다른 복제본으로 재시도합니다.
+"""
+import os
+import threading
+import time
+from typing import Any, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from dotenv import load_dotenv
+
+from src.utils.backend_router import BackendRouter, Endpoint, ask_router, storage_router
+from src.utils.retry_policy import RetryPolicy, RetryState, is_idempotent
+from src.utils.transfer_stats import TransferStats, transfer_stats
+
+load_dotenv()
+
+# 호스트별로 유지할 커넥션 풀 개수 / 풀당 최대 커넥션 수
+BACKEND_POOL_CONNECTIONS = int(os.getenv("BACKEND_POOL_CONNECTIONS", "4"))
+BACKEND_POOL_MAXSIZE = int(os.getenv("BACKEND_POOL_MAXSIZE", "32"))
+# 프로세스 시작 시 미리 열어 둘 커넥션 수 (0이면 비활성화)
+BACKEND_PREWARM_CONNECTIONS = int(os.getenv("BACKEND_PREWARM_CONNECTIONS", "2"))
+
+
+class BackendClient:
+    """
+    requests.Session 기반의 백엔드 클라이언트
+    프로세스 전체에서 하나의 커넥션 풀을 공유하여 요청마다 TCP/TLS 연결을 새로 열지 않습니다.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        pool_connections: int = BACKEND_POOL_CONNECTIONS,
+        pool_maxsize: int = BACKEND_POOL_MAXSIZE,
+        router: Optional[BackendRouter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        stats: Optional[TransferStats] = None
+    ):
+        """
+        Args:
+            base_url: 단일 백엔드 주소 (지정하면 router 대신 이 주소만 사용)
+            pool_connections: 호스트별 커넥션 풀 개수
+            pool_maxsize: 풀당 유지할 최대 keep-alive 커넥션 수
+            router: 복제본 라우터 (없으면 저장소 풀)
+            retry_policy: 요청별로 지정하지 않았을 때 사용할 재시도 정책
+            stats: 엔드포인트별 전송량 집계기
+        """
+        self.router = BackendRouter([base_url]) if base_url else (router or storage_router)
+        self.pool_maxsize = pool_maxsize
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.stats = stats or transfer_stats
+
+        self._session = requests.Session()
+        # gzip/deflate, brotli 패키지가 설치되어 있으면 br까지 압축 응답 요청
+        self._session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._warm_lock = threading.Lock()
+        self._warmed = False
+
+    @property
+    def base_url(self) -> str:
+        """대표 백엔드 주소 (첫 번째 복제본)"""
+        return self.router.base_url
+
+    def is_available(self) -> bool:
+        """
+        캐시된 상태로 백엔드 사용 가능 여부를 판단합니다. (추가 요청 없음)
+        요청을 받을 수 있는 복제본이 하나라도 있으면 True입니다.
+        """
+        return self.router.is_available()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        retry: Optional[RetryPolicy] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        공유 세션으로 요청을 보냅니다. 재시도 정책에 따라 일시적인 실패는 다시 시도하고,
+        재시도할 수 없거나 예산을 모두 쓰면 마지막 응답/예외를 호출자에게 그대로 전달합니다.
+
+        Args:
+            method: HTTP 메서드
+            path: API 경로
+            retry: 재시도 정책 (없으면 클라이언트 기본 정책)
+            idempotent: 멱등 여부 (없으면 is_idempotent로 판단 - BACKEND_IDEMPOTENCY_KEYS 참고)
+            **kwargs: requests에 전달할 인자
+        """
+        policy = retry or self.retry_policy
+        if idempotent is None:
+            idempotent = is_idempotent(method, kwargs.get("headers"))
+
+        state = RetryState(policy, idempotent, self.router.is_available)
+        timeout = kwargs.pop("timeout", None)
+        while True:
+            try:
+                resp = self._send(method, path, state.tried, timeout=state.next_timeout(timeout), **kwargs)
+            except requests.exceptions.RequestException as e:
+                delay = state.delay_after_error(policy.should_retry_error(e, idempotent))
+                if delay is None:
+                    raise
+                policy.sleep(delay)
+                continue
+
+            delay = state.delay_after_response(resp)
+            if delay is None:
+                return resp
+            resp.close()
+            policy.sleep(delay)
+
+    def _send(self, method: str, path: str, tried: List[Endpoint], **kwargs: Any) -> requests.Response:
+        """
+        라우터가 고른 복제본으로 요청 한 번을 보내고 결과를 기록합니다.
+        이미 시도한 복제본(tried)은 가능하면 피하므로 재시도가 곧 장애 조치(failover)가 됩니다.
+        연결 오류, 타임아웃, 5xx 응답은 실패로, 그 외 응답은 성공으로 기록됩니다.
+        """
+        endpoint = self.router.choose(exclude=tried)
+        if endpoint is None:
+            raise requests.exceptions.ConnectionError("사용 가능한 백엔드 서버가 없습니다.")
+        tried.append(endpoint)
+
+        started = time.monotonic()
+        ok = False
+        try:
+            resp = self._session.request(method, f"{endpoint.url}/{path.lstrip('/')}", **kwargs)
+            ok = resp.status_code < 500
+        finally:
+            self.router.record(endpoint, time.monotonic() - started, ok)
+
+        # 스트리밍 응답은 본문을 다 읽은 뒤 호출자가 record_transfer를 호출
+        if not kwargs.get("stream"):
+            self.record_transfer(resp)
+        return resp
+
+    def record_transfer(self, resp: requests.Response, body_bytes: Optional[int] = None) -> None:
+        """
+        응답의 전송량을 엔드포인트별로 기록합니다.
+
+        Args:
+            resp: 본문을 모두 읽은 응답
+            body_bytes: 압축을 푼 본문 크기 (없으면 resp.content 길이)
+        """
+        if body_bytes is None:
+            body_bytes = len(resp.content or b"")
+        # urllib3는 chunked 응답의 수신 바이트를 세지 않으므로(0) 본문 크기로 대신함
+        wire_bytes = (resp.raw.tell() if hasattr(resp.raw, "tell") else 0) or body_bytes
+        self.stats.record(resp.request.method, resp.url, wire_bytes, body_bytes)
+
+    def get(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def warm_up(self, connections: int = BACKEND_PREWARM_CONNECTIONS) -> int:
+        """
+        커넥션 풀을 미리 채워 첫 요청의 연결 수립 비용을 없앱니다.
+        프로세스당 한 번만 실행됩니다.
+
+        Args:
+            connections: 동시에 열어 둘 커넥션 수
+
+        Returns:
+            성공적으로 연결된 커넥션 수
+        """
+        with self._warm_lock:
+            if self._warmed or connections <= 0:
+                return 0
+            self._warmed = True
+
+        results = []
+
+        def _open(endpoint: Endpoint):
+            try:
+                self._session.get(f"{endpoint.url}/health", timeout=5).close()
+                results.append(True)
+            except requests.exceptions.RequestException:
+                results.append(False)
+
+        # 복제본마다, 동시에 요청해야 서로 다른 소켓이 풀에 남음
+        threads = [threading.Thread(target=_open, args=(endpoint,), daemon=True)
+                   for endpoint in self.router.endpoints
+                   for _ in range(min(connections, self.pool_maxsize))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return sum(results)
+
+    def warm_up_in_background(self) -> None:
+        """스크립트 실행을 막지 않도록 백그라운드 스레드에서 워밍업합니다."""
+        if self._warmed:
+            return
+        threading.Thread(target=self.warm_up, daemon=True, name="backend-warmup").start()
+
+
+# 싱글톤 인스턴스 - 저장소(세션/메시지) 트래픽과 질문 트래픽은 서로 다른 복제본 풀 사용
+backend_client = BackendClient(router=storage_router)
+ask_client = BackendClient(router=ask_router)
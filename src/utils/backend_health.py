@@ -0,0 +1,116 @@
+"""
+백엔드 상태 추적 유틸리티
+실제 요청 결과로 상태를 갱신하고, 연속 실패 시 서킷 브레이커를 열어 요청을 차단합니다.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+# 연속 실패 몇 번이면 서킷을 열지
+BACKEND_FAILURE_THRESHOLD = int(os.getenv("BACKEND_FAILURE_THRESHOLD", "3"))
+# 서킷이 열린 뒤 "사용 불가" 상태를 유지하는 시간(초)
+BACKEND_HEALTH_TTL = float(os.getenv("BACKEND_HEALTH_TTL", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BackendHealth:
+    """
+    서킷 브레이커 방식의 백엔드 상태 추적기
+    - closed: 정상, 모든 요청 허용 (추가 헬스체크 없음)
+    - open: 연속 실패로 차단됨, TTL 동안 요청을 보내지 않음
+    - half_open: TTL 만료 후 시험 요청 하나만 허용
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BACKEND_FAILURE_THRESHOLD,
+        ttl: float = BACKEND_HEALTH_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            failure_threshold: 서킷을 여는 연속 실패 횟수
+            ttl: 서킷이 열린 상태(사용 불가 판정)를 유지하는 시간(초)
+            clock: 단조 증가 시계 (테스트용 주입)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = None
+        self._last_change = clock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        요청을 보내도 되는지 판단합니다. 네트워크 요청은 하지 않습니다.
+        half_open 상태에서는 시험 요청 하나만 통과시킵니다.
+        """
+        with self._lock:
+            now = self._clock()
+            if self._state == CLOSED:
+                return True
+
+            if self._state == OPEN:
+                if now - self._opened_at < self.ttl:
+                    return False
+                self._set_state(HALF_OPEN, now)
+
+            # half_open: 진행 중인 시험 요청이 없거나 응답 없이 TTL이 지났으면 허용
+            if self._trial_started_at is None or now - self._trial_started_at >= self.ttl:
+                self._trial_started_at = now
+                return True
+            return False
+
+    def is_blocked(self) -> bool:
+        """요청이 차단된 상태인지 확인합니다. allow_request와 달리 상태를 바꾸지 않습니다."""
+        with self._lock:
+            now = self._clock()
+            if self._state == OPEN:
+                return now - self._opened_at < self.ttl
+            if self._state == HALF_OPEN:
+                return self._trial_started_at is not None and now - self._trial_started_at < self.ttl
+            return False
+
+    def record_success(self) -> None:
+        """요청 성공을 기록합니다. 서킷을 닫습니다."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._trial_started_at = None
+            if self._state != CLOSED:
+                self._set_state(CLOSED, self._clock())
+
+    def record_failure(self) -> None:
+        """요청 실패를 기록합니다. 임계치에 도달하거나 시험 요청이 실패하면 서킷을 엽니다."""
+        with self._lock:
+            now = self._clock()
+            self._consecutive_failures += 1
+            self._trial_started_at = None
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = now
+                if self._state != OPEN:
+                    self._set_state(OPEN, now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """모니터링용 현재 상태를 반환합니다."""
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "seconds_in_state": round(self._clock() - self._last_change, 3),
+            }
+
+    def _set_state(self, state: str, now: float) -> None:
+        self._state = state
+        self._last_change = now
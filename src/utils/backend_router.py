@@ -0,0 +1,149 @@
+"""
+백엔드 라우팅 유틸리티
+여러 백엔드 복제본 중 관측된 지연 시간과 오류율이 낮은 곳으로 요청을 보내고,
+연속으로 실패한 복제본은 일정 시간 제외(eject)합니다.
+질문(ask)과 저장소(storage) 트래픽은 서로 다른 풀로 나눌 수 있습니다.
+"""
+import os
+import random
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+
+from src.utils.backend_health import BackendHealth
+
+load_dotenv()
+
+# 지연 시간/오류율 지수 이동 평균 가중치
+EWMA_ALPHA = 0.2
+# 오류율이 점수에 주는 가중치 (오류율 50%면 점수 3배)
+ERROR_PENALTY = 4.0
+
+
+def parse_backend_urls(value: Optional[str]) -> List[str]:
+    """쉼표로 구분된 백엔드 주소 목록을 정리합니다. (중복 제거, 순서 유지)"""
+    urls = []
+    for url in (value or "").split(","):
+        url = url.strip().rstrip("/")
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+class Endpoint:
+    """백엔드 복제본 하나와 관측 통계"""
+
+    def __init__(self, url: str, health: Optional[BackendHealth] = None):
+        self.url = url
+        self.health = health or BackendHealth()
+        self.latency_ewma = 0.0
+        self.error_ewma = 0.0
+        self.in_flight = 0
+        self.requests = 0
+
+    def score(self) -> float:
+        """낮을수록 좋은 점수 (아직 측정하지 않은 복제본은 0으로 우선 시도)"""
+        return self.latency_ewma * (1 + ERROR_PENALTY * self.error_ewma) * (1 + self.in_flight)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "latency_ms": round(self.latency_ewma * 1000, 1),
+            "error_rate": round(self.error_ewma, 3),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            **self.health.snapshot(),
+        }
+
+
+class BackendRouter:
+    """
+    복제본 풀 라우터
+    제외되지 않은 복제본 중 무작위 두 곳을 골라 점수가 낮은 쪽을 선택합니다. (power of two choices)
+    복제본별 서킷 브레이커가 열리면 TTL 동안 선택 대상에서 제외됩니다.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        name: str = "default",
+        health_factory: Callable[[], BackendHealth] = BackendHealth,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            urls: 복제본 주소 목록
+            name: 풀 이름 (모니터링용)
+            health_factory: 복제본별 상태 추적기 생성 함수
+        """
+        self.name = name
+        self.endpoints = [Endpoint(url, health_factory()) for url in parse_backend_urls(",".join(urls))]
+        self._lock = threading.Lock()
+        self._rng = rng or random.Random()
+
+    @property
+    def base_url(self) -> str:
+        """대표 주소 (첫 번째 복제본)"""
+        return self.endpoints[0].url if self.endpoints else ""
+
+    def is_available(self) -> bool:
+        """요청을 받을 수 있는 복제본이 하나라도 있는지 확인합니다. (상태를 바꾸지 않음)"""
+        return any(not endpoint.health.is_blocked() for endpoint in self.endpoints)
+
+    def choose(self, exclude: Iterable[Endpoint] = ()) -> Optional[Endpoint]:
+        """
+        요청을 보낼 복제본을 고릅니다. 이미 시도한 복제본(exclude)은 가능하면 피합니다.
+
+        Returns:
+            선택된 복제본 (모두 제외된 상태면 None)
+        """
+        excluded = set(id(endpoint) for endpoint in exclude)
+        with self._lock:
+            candidates = [e for e in self.endpoints if id(e) not in excluded and not e.health.is_blocked()]
+            if not candidates:
+                # 다른 복제본이 모두 막혔으면 이미 시도한 곳이라도 다시 사용
+                candidates = [e for e in self.endpoints if not e.health.is_blocked()]
+            if len(candidates) > 2:
+                candidates = self._rng.sample(candidates, 2)
+            candidates.sort(key=lambda e: e.score())
+
+        # half_open 복제본은 시험 요청 하나만 통과
+        for endpoint in candidates:
+            if endpoint.health.allow_request():
+                with self._lock:
+                    endpoint.in_flight += 1
+                return endpoint
+        return None
+
+    def record(self, endpoint: Endpoint, latency: float, ok: bool) -> None:
+        """요청 결과를 기록합니다. 실패가 쌓이면 복제본의 서킷이 열려 제외됩니다."""
+        with self._lock:
+            endpoint.in_flight = max(0, endpoint.in_flight - 1)
+            endpoint.requests += 1
+            if endpoint.latency_ewma == 0.0:
+                endpoint.latency_ewma = latency
+            else:
+                endpoint.latency_ewma += EWMA_ALPHA * (latency - endpoint.latency_ewma)
+            endpoint.error_ewma += EWMA_ALPHA * ((0.0 if ok else 1.0) - endpoint.error_ewma)
+
+        if ok:
+            endpoint.health.record_success()
+        else:
+            endpoint.health.record_failure()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """모니터링용 풀 현황을 반환합니다."""
+        return {"pool": self.name, "endpoints": [e.snapshot() for e in self.endpoints]}
+
+
+def _pool_urls(env_name: str) -> List[str]:
+    # 풀 전용 주소가 없으면 BACKEND_URLS, 그것도 없으면 BACKEND_URL 사용
+    return (parse_backend_urls(os.getenv(env_name))
+            or parse_backend_urls(os.getenv("BACKEND_URLS"))
+            or parse_backend_urls(os.getenv("BACKEND_URL")))
+
+
+# 질문 트래픽과 저장소 트래픽은 서로 다른 풀로 라우팅
+ask_router = BackendRouter(_pool_urls("BACKEND_ASK_URLS"), name="ask")
+storage_router = BackendRouter(_pool_urls("BACKEND_STORAGE_URLS"), name="storage")
@@ -2,34 +2,101 @@
 채팅 기록 저장 및 관리 유틸리티
 JSON 파일로 대화 기록을 영구 저장하고 관리합니다.
 """
+import hashlib
+import uuid
+
 import requests
-import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dotenv import load_dotenv
+from typing import Dict, List, Optional, Any, Tuple
+
+from src.utils.async_backend_client import async_backend
+from src.utils.backend_client import BackendClient, backend_client
+from src.utils.fast_json import json_body
+from src.utils.offline_journal import JournalEntry, OfflineJournal
+from src.utils.offline_replay import OfflineReplayer, SyncedMessageIds, dedup_local_messages, saved_message_ids
+from src.utils.search_index import SessionSearchIndex
+from src.utils.session_catalog import SessionCatalog, page_sessions
+from src.utils.session_index import SessionSummaryIndex, empty_summary
+from src.utils.transcript_cache import TRANSCRIPT_CACHE_MAX_BYTES, TranscriptCache
+from src.utils.write_behind import PendingWrite, WriteBehindQueue
 
-load_dotenv()
-BACKEND_URL = os.getenv("BACKEND_URL")
+# 백엔드가 일괄 요약 엔드포인트를 제공하지 않을 때 받는 상태 코드
+_UNSUPPORTED_STATUSES = (404, 405, 422)
 
 class ChatStorage:
     """
     백엔드 API를 통해 채팅 세션/메시지를 관리하는 클래스
     네트워크 오류에 대한 강화된 처리와 오프라인 지원 포함
     """
-    def __init__(self):
-        self.backend_url = BACKEND_URL
-        self._offline_cache = {}
+    def __init__(
+        self,
+        client: Optional[BackendClient] = None,
+        journal: Optional[OfflineJournal] = None,
+        transcript_max_bytes: int = TRANSCRIPT_CACHE_MAX_BYTES
+    ):
+        self._client = client or backend_client
+        self.backend_url = self._client.base_url
+        # 오프라인 세션/메시지는 디스크 저널에 기록 (재시작 후에도 유지)
+        self._journal = journal or OfflineJournal()
         self._connection_status = True
+        self._summary_index = SessionSummaryIndex()
+        self._bulk_summary_supported = True
+        self._catalog = SessionCatalog()
+        # 메시지 검색 색인은 세션 파티션에 크기를 청구하여 대화 내용 캐시와 같은 메모리 예산을 따름
+        # (저장만 하고 불러온 적 없는 세션도 포함, 세션을 내보내면 그 세션의 메시지 색인도 제거)
+        self._transcripts = TranscriptCache(transcript_max_bytes, on_evict=self._on_transcript_evicted)
+        self._search_index = SessionSearchIndex(on_resize=self._charge_search_index)
+        self._batch_save_supported = True
+        self._write_queue = WriteBehindQueue(self._flush_messages).register_atexit()
+        # 저장이 끝난 로컬 메시지의 멱등 키 -> 백엔드 메시지 ID (조회 결과와 로컬 목록의 중복 제거용)
+        self._synced = SyncedMessageIds()
+        self._replayer = OfflineReplayer(self._journal, self._client, on_session_promoted=self._on_session_promoted,
+                                         synced=self._synced)
 
     def _is_backend_available(self) -> bool:
-        """백엔드 서버 연결 상태를 확인합니다."""
-        try:
-            resp = requests.get(f"{self.backend_url}/health", timeout=3)
-            self._connection_status = resp.status_code == 200
-            return self._connection_status
-        except:
-            self._connection_status = False
-            return False
+        """백엔드 서버 연결 상태를 확인합니다. (캐시된 상태 사용, 추가 요청 없음)"""
+        self._connection_status = self._client.is_available()
+        if self._connection_status:
+            # 연결되어 있고 저널에 남은 항목이 있으면 백그라운드에서 재전송 (최소 간격 적용)
+            self._replayer.replay_in_background()
+        return self._connection_status
+
+    def _on_session_promoted(self, offline_id: str, session: Dict[str, Any]) -> None:
+        """오프라인 세션이 백엔드 세션으로 올라갔을 때 캐시를 갱신합니다."""
+        self._summary_index.remove(offline_id)
+        self._search_index.rename_session(offline_id, str(session["id"]))
+        self._catalog.add(session)
+
+    def _charge_search_index(self, session_id: str, size: int) -> None:
+        self._transcripts.charge(session_id, "search_index", size)
+
+    def _on_transcript_evicted(self, session_id: str) -> None:
+        self._search_index.remove_messages(session_id)
+
+    def resolve_session_id(self, session_id: str) -> str:
+        """백엔드에 올라간 오프라인 세션 ID를 백엔드 세션 ID로 바꿉니다. (그 외에는 그대로)"""
+        return self._journal.resolve(str(session_id))
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """
+        모니터링용 메모리 캐시 상태
+        transcripts: 세션 파티션별 추정 사용량/퇴출 수 (대화 내용 + 청구된 메시지 검색 색인)
+        search_index: 색인 문서 수와 추정 사용량 (message_bytes는 transcripts에 포함된 부분)
+        """
+        return {
+            "transcripts": self._transcripts.stats(),
+            "search_index": self._search_index.stats(),
+            "summaries": {
+                "entries": len(self._summary_index),
+                "max_entries": self._summary_index.max_entries,
+                "evictions": self._summary_index.evictions,
+            },
+            "pending_writes": self._write_queue.depth,
+        }
+
+    def replay_status(self) -> Dict[str, Any]:
+        """모니터링용 오프라인 재전송 상태 (journal: 저널에 남은 세션/메시지 수)"""
+        return self._replayer.stats()
 
     def _handle_api_error(self, operation: str, error: Exception):
         """API 오류를 처리하고 사용자에게 적절한 피드백을 제공합니다."""
@@ -54,19 +121,22 @@ class ChatStorage:
         if not self._is_backend_available():
             # 오프라인 모드: 임시 세션 ID 생성
             temp_id = f"offline_{uuid.uuid4().hex[:8]}"
-            self._offline_cache[temp_id] = {
-                "id": temp_id,
-                "title": payload["title"],
-                "created_at": datetime.now().isoformat(),
-                "messages": []
-            }
+            self._journal.add_session(temp_id, payload["title"], datetime.now().isoformat())
             st.info("📱 오프라인 모드: 임시 세션이 생성되었습니다.")
             return temp_id
         
         try:
-            resp = requests.post(f"{self.backend_url}/chat/sessions", json=payload, timeout=10)
+            resp = self._client.post("/chat/sessions", json=payload, timeout=10)
             if resp.status_code == 200:
-                return str(resp.json()["id"])
+                created = json_body(resp)
+                session_id = str(created["id"])
+                self._summary_index.set(session_id, empty_summary())
+                self._catalog.add({
+                    **created,
+                    "title": created.get("title") or payload["title"],
+                    "created_at": created.get("created_at") or datetime.now().isoformat(),
+                })
+                return session_id
             else:
                 st.error(f"❌ 세션 생성 실패: HTTP {resp.status_code}")
                 raise Exception(f"세션 생성 실패: {resp.text}")
@@ -74,24 +144,27 @@ class ChatStorage:
             self._handle_api_error("세션 생성", e)
             raise e
 
-    def get_all_sessions(self) -> List[Dict[str, Any]]:
-        """세션 목록 조회 (오프라인 캐시 포함, 데이터 정합성 강화)"""
+    def get_all_sessions(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        세션 목록 조회 (오프라인 캐시 포함, 데이터 정합성 강화)
+        백엔드 목록은 SESSION_LIST_TTL 동안 캐시하며, force_refresh=True이면 다시 조회합니다.
+        """
         import streamlit as st
         
         # 오프라인 캐시 세션도 포함
-        offline_sessions = []
-        for session in self._offline_cache.values():
-            if isinstance(session, dict) and 'id' in session and 'title' in session:
-                offline_sessions.append(session)
+        offline_sessions = self._journal.sessions()
         
         if not self._is_backend_available():
             st.info("📱 오프라인 모드: 캐시된 세션만 표시됩니다.")
             return offline_sessions
         
+        if self._catalog.is_fresh() and not force_refresh:
+            return self._catalog.list() + offline_sessions
+        
         try:
-            resp = requests.get(f"{self.backend_url}/chat/sessions", timeout=10)
+            resp = self._client.get("/chat/sessions", timeout=10)
             if resp.status_code == 200:
-                backend_sessions = resp.json()
+                backend_sessions = json_body(resp)
                 # 데이터 유효성 검증
                 valid_sessions = []
                 for session in backend_sessions:
@@ -101,23 +174,45 @@ class ChatStorage:
                             session['created_at'] = '1970-01-01T00:00:00'
                         valid_sessions.append(session)
                 
-                # 최신순 정렬 (created_at 기준)
-                valid_sessions.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+                # 최신순 정렬 (created_at 기준) 후 캐시
+                self._catalog.load(valid_sessions)
                 # 오프라인 세션과 합치기
-                return valid_sessions + offline_sessions
+                return self._catalog.list() + offline_sessions
             else:
                 st.warning(f"⚠️ 세션 목록 조회 오류: HTTP {resp.status_code}")
-                return offline_sessions
+                # 이전에 받은 목록이 있으면 그대로 표시
+                return self._catalog.list() + offline_sessions
         except Exception as e:
             self._handle_api_error("세션 목록 조회", e)
-            return offline_sessions
+            return self._catalog.list() + offline_sessions
+
+    def list_sessions_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        세션 목록을 커서 기반으로 한 페이지씩 조회합니다. (최신순, 오프라인 세션은 끝에 붙음)
+        목록은 캐시된 세션 목록(SESSION_LIST_TTL)에서 잘라 내므로 페이지마다 백엔드를 조회하지 않습니다.
+
+        Args:
+            cursor: 이전 페이지가 반환한 커서 (None이면 첫 페이지)
+            limit: 페이지 크기
+
+        Returns:
+            (세션 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+        """
+        return page_sessions(self.get_all_sessions(), cursor, limit)
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        sessions = self.get_all_sessions()
-        for s in sessions:
-            if str(s["id"]) == str(session_id):
-                return s
-        return None
+        """세션 ID로 세션 조회 (캐시 인덱스 사용, 만료되었으면 목록을 다시 불러옴)"""
+        session_id_str = self.resolve_session_id(session_id)
+        if session_id_str.startswith("offline_"):
+            return self._journal.get_session(session_id_str)
+        
+        if not self._catalog.is_fresh():
+            self.get_all_sessions()
+        return self._catalog.get(session_id_str)
 
     def update_session_title(self, session_id: str, title: str) -> bool:
         # FastAPI에 PATCH 엔드포인트가 없으므로, 추후 필요시 구현
@@ -126,22 +221,36 @@ class ChatStorage:
     def delete_session(self, session_id: str) -> bool:
         """세션 삭제 (오프라인 대응 포함)"""
         # session_id를 문자열로 변환 (백엔드에서 int로 올 수 있음)
-        session_id_str = str(session_id)
+        original_id = str(session_id)
+        session_id_str = self.resolve_session_id(original_id)
+        if session_id_str != original_id:
+            # 백엔드에 올라간 오프라인 세션: 저널에 남은 메시지도 함께 제거
+            self._journal.remove_session(original_id)
+            session_id = session_id_str
+        
+        self._summary_index.remove(session_id_str)
+        self._search_index.remove_session(session_id_str)
+        self._catalog.remove(session_id_str)
+        self._transcripts.remove(session_id_str)
         
         # 오프라인 세션인 경우
         if session_id_str.startswith("offline_"):
-            return self._offline_cache.pop(session_id_str, None) is not None
+            return self._journal.remove_session(session_id_str)
         
         if not self._is_backend_available():
-            # 백엔드 세션이지만 오프라인인 경우, 캐시에서만 제거
-            self._offline_cache.pop(session_id_str, None)
+            # 백엔드 세션이지만 오프라인인 경우, 저널에서만 제거
+            self._journal.remove_session(session_id_str)
             return True
         
         try:
-            resp = requests.delete(f"{self.backend_url}/chat/sessions/{session_id}", timeout=10)
+            resp = self._client.delete(f"/chat/sessions/{session_id}", timeout=10)
+            if resp.status_code != 200:
+                # 삭제되지 않았으므로 다음 조회 때 목록을 다시 불러옴
+                self._catalog.invalidate()
             return resp.status_code == 200
         except Exception as e:
             self._handle_api_error("세션 삭제", e)
+            self._catalog.invalidate()
             return False
 
     def save_message(self, session_id: str, message: Dict[str, Any]) -> bool:
@@ -149,85 +258,276 @@ class ChatStorage:
         import streamlit as st
         
         # session_id를 문자열로 변환 (백엔드에서 int로 올 수 있음)
-        session_id_str = str(session_id)
+        session_id_str = self.resolve_session_id(session_id)
         
         # 오프라인 세션인 경우
         if session_id_str.startswith("offline_"):
-            if session_id_str in self._offline_cache:
-                self._offline_cache[session_id_str]["messages"].append(message)
+            if self._journal.has_session(session_id_str):
+                self._journal.append_message(session_id_str, message)
+                self._search_index.add_message(session_id_str, message)
                 return True
             return False
         
         if not self._is_backend_available():
-            # 백엔드 세션이지만 오프라인인 경우, 임시 저장
-            if session_id_str not in self._offline_cache:
-                self._offline_cache[session_id_str] = {"messages": []}
-            self._offline_cache[session_id_str]["messages"].append(message)
+            # 백엔드 세션이지만 오프라인인 경우, 저널에 임시 저장
+            self._journal_message(session_id_str, message)
+            self._summary_index.note_message(session_id_str, message)
+            self._search_index.add_message(session_id_str, message)
             st.info("📱 오프라인 모드: 메시지가 임시 저장되었습니다.")
             return True
         
+        # 아직 재전송되지 않은 메시지가 있는 세션은 순서를 지키기 위해 저널 뒤에 이어서 기록
+        if self._journal.pending_count(session_id_str):
+            self._journal_message(session_id_str, message)
+            self._summary_index.note_message(session_id_str, message)
+            self._search_index.add_message(session_id_str, message)
+            return True
+        
+        # 지연 쓰기: 대기열에 넣고 바로 반환 (백그라운드 워커가 백엔드로 전송)
+        if self._write_queue.submit(session_id_str, message):
+            self._summary_index.note_message(session_id_str, message)
+            self._search_index.add_message(session_id_str, message)
+            return True
+        
+        # 대기열이 가득 찬 경우 직접 저장
         try:
-            payload = {
-                "session_id": int(session_id),
-                "role": message["role"],
-                "content": message["content"]
-            }
-            resp = requests.post(f"{self.backend_url}/chat/messages", json=payload, timeout=15)
-            return resp.status_code == 200
+            resp = self._client.post("/chat/messages", json=self._message_payload(session_id_str, message),
+                                     headers={"Idempotency-Key": uuid.uuid4().hex}, timeout=15)
+            if resp.status_code == 200:
+                self._summary_index.note_message(session_id_str, message)
+                self._search_index.add_message(session_id_str, message)
+                return True
+            return False
         except Exception as e:
             self._handle_api_error("메시지 저장", e)
             return False
 
+    def _journal_message(self, session_id: str, message: Dict[str, Any]) -> None:
+        """
+        메시지를 저널에 기록합니다.
+        지연 쓰기 대기열에 남은 같은 세션의 메시지를 먼저 (보낼 때 쓰던 멱등 키와 함께) 옮겨 순서를 유지합니다.
+        """
+        for item in self._write_queue.drain(session_id):
+            self._journal.append_message(item.session_id, item.message, item.idempotency_key)
+        self._journal.append_message(session_id, message)
+
+    @staticmethod
+    def _message_payload(session_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "session_id": int(session_id),
+            "role": message["role"],
+            "content": message["content"]
+        }
+
+    @staticmethod
+    def _batch_key(batch: List[PendingWrite]) -> str:
+        """같은 메시지 묶음을 다시 보낼 때 같은 값이 되는 일괄 저장 멱등 키"""
+        keys = "".join(item.idempotency_key for item in batch)
+        return hashlib.blake2b(keys.encode("ascii"), digest_size=16).hexdigest()
+
+    def _flush_messages(self, batch: List[PendingWrite]) -> int:
+        """
+        지연 쓰기 대기열의 메시지를 백엔드로 보냅니다. (백그라운드 워커에서 호출)
+        - 일괄 저장(POST /chat/messages/batch)을 지원하면 한 번에 전송
+        - 지원하지 않으면 메시지마다 POST /chat/messages
+        - 4xx로 거절된 메시지는 다시 보내도 실패하므로 처리된 것으로 간주 (대기열 통계 rejected로 집계, 경고 기록)
+        - 백엔드에 연결할 수 없으면 오프라인 저널로 옮겨 재시작해도 잃지 않도록 함
+        - 저널에 재전송 대기 메시지가 있는 세션의 메시지는 순서를 지키기 위해 저널 뒤에 이어서 기록
+        - 메시지마다 대기열에 넣을 때 만든 멱등 키를 보냄 (백엔드가 지원하면 재시도해도 중복 저장되지 않음,
+          5xx/타임아웃 재시도는 BACKEND_IDEMPOTENCY_KEYS를 켠 경우에만)
+
+        Returns:
+            앞에서부터 처리한 메시지 수 (나머지는 워커가 나중에 다시 시도)
+        """
+        if not self._is_backend_available():
+            for item in batch:
+                self._journal.append_message(item.session_id, item.message, item.idempotency_key)
+            return len(batch)
+        
+        journaled = any(self._journal.pending_count(item.session_id) for item in batch)
+        if self._batch_save_supported and len(batch) > 1 and not journaled:
+            resp = self._client.post(
+                "/chat/messages/batch",
+                json={"messages": [
+                    {**self._message_payload(item.session_id, item.message), "idempotency_key": item.idempotency_key}
+                    for item in batch
+                ]},
+                headers={"Idempotency-Key": self._batch_key(batch)},
+                timeout=15
+            )
+            if resp.status_code == 200:
+                for item, backend_id in zip(batch, saved_message_ids(resp, len(batch))):
+                    self._synced.record(item.idempotency_key, backend_id)
+                return len(batch)
+            if resp.status_code in _UNSUPPORTED_STATUSES:
+                self._batch_save_supported = False
+            elif resp.status_code >= 500:
+                return 0
+        
+        for done, item in enumerate(batch):
+            if self._journal.pending_count(item.session_id):
+                self._journal.append_message(item.session_id, item.message, item.idempotency_key)
+                continue
+            try:
+                resp = self._client.post("/chat/messages",
+                                         json=self._message_payload(item.session_id, item.message),
+                                         headers={"Idempotency-Key": item.idempotency_key}, timeout=15)
+            except Exception:
+                return done
+            if resp.status_code >= 500 or resp.status_code == 429:
+                return done
+            if resp.status_code == 200:
+                self._synced.record(item.idempotency_key, saved_message_ids(resp)[0])
+            else:
+                self._write_queue.reject(item, resp.status_code)
+        return len(batch)
+
+    def pending_writes(self) -> Dict[str, Any]:
+        """모니터링용 지연 쓰기 대기열 상태 (depth: 아직 백엔드에 저장되지 않은 메시지 수)"""
+        return self._write_queue.stats()
+
     def get_messages(self, session_id: str) -> List[Dict[str, Any]]:
-        """메시지 목록 조회 (오프라인 캐시 포함)"""
+        """
+        메시지 목록 조회 (오프라인 캐시 포함)
+        한 번 불러온 세션은 마지막 메시지 ID 이후(after_id)의 메시지만 받아 캐시된 내용에 합칩니다.
+        """
         # session_id를 문자열로 변환 (백엔드에서 int로 올 수 있음)
-        session_id_str = str(session_id)
+        session_id_str = self.resolve_session_id(session_id)
+        session_id = session_id_str
         
         # 오프라인 세션인 경우
         if session_id_str.startswith("offline_"):
-            return self._offline_cache.get(session_id_str, {}).get("messages", [])
+            messages = self._journal.messages(session_id_str)
+            self._search_index.set_messages(session_id_str, messages)
+            return messages
         
-        # 오프라인 캐시에 메시지가 있는 경우 (백엔드 세션이지만 임시 저장된 메시지)
-        cached_messages = self._offline_cache.get(session_id_str, {}).get("messages", [])
+        # 저널에 메시지가 있는 경우 (백엔드 세션이지만 오프라인일 때 임시 저장된 메시지)
+        cached_entries = self._journal.entries(session_id_str)
         
         if not self._is_backend_available():
-            return cached_messages
+            return self._stale_messages(session_id_str, cached_entries)
+        
+        params = {"session_id": session_id}
+        last_id = self._transcripts.last_id(session_id_str)
+        if last_id is not None:
+            params["after_id"] = last_id
         
         try:
-            resp = requests.get(f"{self.backend_url}/chat/messages", 
-                              params={"session_id": session_id}, timeout=10)
+            resp = self._client.get("/chat/messages", params=params, timeout=10)
             if resp.status_code == 200:
-                backend_messages = resp.json()
-                # 백엔드 메시지와 캐시된 메시지 합치기 (중복 제거 필요시)
-                return backend_messages + cached_messages
+                if last_id is not None:
+                    backend_messages = self._transcripts.merge(session_id_str, json_body(resp))
+                else:
+                    backend_messages = json_body(resp)
+                    self._transcripts.set(session_id_str, backend_messages)
+                messages = self._merge_local(session_id_str, backend_messages, cached_entries)
+                self._summary_index.update_from_messages(session_id_str, messages)
+                self._search_index.set_messages(session_id_str, messages)
+                return messages
             else:
-                return cached_messages
+                return self._stale_messages(session_id_str, cached_entries)
+        except Exception as e:
+            self._handle_api_error("메시지 조회", e)
+            return self._stale_messages(session_id_str, cached_entries)
+
+    def _stale_messages(self, session_id: str, cached_entries: List[JournalEntry]) -> List[Dict[str, Any]]:
+        """조회 실패 시 마지막으로 받은 대화 내용과 임시 저장된 메시지를 반환합니다."""
+        return self._merge_local(session_id, self._transcripts.get(session_id) or [], cached_entries)
+
+    def _merge_local(self, session_id: str, backend_messages: List[Dict[str, Any]],
+                     cached_entries: List[JournalEntry]) -> List[Dict[str, Any]]:
+        """
+        백엔드 메시지 뒤에 아직 백엔드에 없는 로컬 메시지(전송 대기, 저널)를 붙입니다.
+        로컬 메시지가 없으면(대부분의 경우) 백엔드 목록을 그대로 반환합니다.
+        """
+        local_messages = [(item.idempotency_key, item.message) for item in self._write_queue.pending(session_id)]
+        local_messages += [(entry.idempotency_key, entry.message) for entry in cached_entries]
+        if not local_messages:
+            return backend_messages
+        return backend_messages + dedup_local_messages(backend_messages, local_messages, self._synced)
+
+    def get_session_summaries(self, session_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        세션별 요약(메시지 수, 마지막 활동, 첫 메시지 미리보기)을 반환합니다.
+        - 요약 인덱스에 있는 세션은 추가 요청 없이 반환 (메시지 저장/조회 시 갱신됨)
+        - 없는 세션은 일괄 요약 요청(GET /chat/sessions/summary) 한 번으로 채움
+        - 백엔드가 일괄 요약을 지원하지 않으면 없는 세션만 동시에 메시지를 조회하여 채움
+        """
+        ids = [str(session_id) for session_id in session_ids]
+        summaries = {}
+        
+        # 오프라인 세션은 로컬 저널에서 바로 계산
+        for session_id in ids:
+            if session_id.startswith("offline_"):
+                index = SessionSummaryIndex()
+                index.update_from_messages(session_id, self._journal.messages(session_id))
+                summaries[session_id] = index.get(session_id)
+        
+        backend_ids = [session_id for session_id in ids if not session_id.startswith("offline_")]
+        missing = self._summary_index.missing(backend_ids)
+        if missing and self._is_backend_available():
+            if self._bulk_summary_supported:
+                self._load_bulk_summaries()
+                missing = self._summary_index.missing(backend_ids)
+            if missing:
+                self._load_summaries_from_messages(missing)
+        
+        summaries.update(self._summary_index.get_many(backend_ids))
+        return summaries
+
+    def _load_bulk_summaries(self) -> None:
+        """일괄 요약 엔드포인트로 인덱스를 채웁니다. 지원하지 않는 백엔드면 다시 시도하지 않습니다."""
+        try:
+            resp = self._client.get("/chat/sessions/summary", timeout=10)
+            if resp.status_code == 200:
+                self._summary_index.load_bulk(json_body(resp))
+            elif resp.status_code in _UNSUPPORTED_STATUSES:
+                self._bulk_summary_supported = False
+        except Exception as e:
+            self._handle_api_error("세션 요약 조회", e)
+
+    def _load_summaries_from_messages(self, session_ids: List[str]) -> None:
+        """
+        세션들의 메시지를 동시에 조회하여 요약을 계산합니다. (실패한 세션은 다음에 다시 시도)
+        받은 메시지는 대화 내용 캐시에도 넣어, 검색 색인이 캐시와 함께 메모리 예산 안에서 퇴출되도록 합니다.
+        """
+        try:
+            fetched = async_backend.get_messages_many(session_ids)
         except Exception as e:
             self._handle_api_error("메시지 조회", e)
-            return cached_messages
+            return
+        for session_id, messages in fetched.items():
+            if messages is not None:
+                self._transcripts.set(session_id, messages)
+                cached = self._journal.messages(session_id)
+                self._summary_index.update_from_messages(session_id, messages + cached)
+                self._search_index.set_messages(session_id, messages + cached)
 
     def delete_message(self, message_id: int) -> bool:
-        resp = requests.delete(f"{self.backend_url}/chat/messages/{message_id}")
-        return resp.status_code == 200
+        resp = self._client.delete(f"/chat/messages/{message_id}")
+        if resp.status_code == 200:
+            self._transcripts.remove_message(message_id)
+            return True
+        return False
 
     def search_sessions(self, query: str) -> List[Dict[str, Any]]:
-        """세션 검색 (개선된 로직)"""
+        """
+        세션 제목과 메시지 본문 검색 (문자 bigram 역색인, 점수순)
+        메시지 본문은 한 번이라도 불러오거나 저장한 세션만 색인되어 있습니다.
+        각 세션에는 일치 위치 정보가 search_match로, 점수 순위가 search_rank로 붙습니다.
+        (search_rank가 있는 세션은 page_sessions에서 created_at 대신 순위로 페이지를 나눔)
+        """
         sessions = self.get_all_sessions()
-        query_lower = query.lower()
-        matching_sessions = []
-        
+        by_id = {}
         for session in sessions:
-            # 제목에서 검색
-            if query_lower in session.get('title', '').lower():
-                matching_sessions.append(session)
-                continue
-            
-            # 첫 번째 메시지에서 검색 (있는 경우)
-            first_message = session.get('first_message', '')
-            if first_message and query_lower in first_message.lower():
-                matching_sessions.append(session)
+            by_id[str(session['id'])] = session
+            self._search_index.set_title(session['id'], session.get('title', ''))
         
-        matching_sessions.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        matching_sessions = []
+        for hit in self._search_index.search(query, limit=len(by_id) or 1):
+            session = by_id.get(hit["session_id"])
+            if session is not None:
+                matching_sessions.append({**session, "search_match": hit, "search_rank": len(matching_sessions)})
         return matching_sessions
 
 chat_storage = ChatStorage()
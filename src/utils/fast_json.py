@@ -0,0 +1,31 @@
+"""
+JSON 디코딩 유틸리티
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 대체합니다.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """JSON 문자열/바이트를 파싱합니다. 잘못된 JSON이면 ValueError를 발생시킵니다."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def json_body(resp: Any) -> Any:
+    """
+    응답 본문을 JSON으로 파싱합니다. (resp.json() 대체)
+    requests.Response와 httpx.Response 모두 지원합니다.
+    """
+    return loads(resp.content)
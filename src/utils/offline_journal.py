@@ -0,0 +1,270 @@
+"""
+오프라인 저널
+백엔드에 연결할 수 없을 때 만든 세션과 메시지를 로컬 SQLite(WAL 모드)에 순서대로 기록합니다.
+재시작 후에도 남아 있으며, 백엔드에 동기화된 항목은 압축(compact) 시 지워집니다.
+
+fsync는 쓰기마다 하지 않고 OFFLINE_JOURNAL_FSYNC_INTERVAL마다 한 번 체크포인트로 모아서 합니다.
+(커밋된 쓰기는 WAL 파일에 있으므로 프로세스가 죽어도 남고, 전원 장애 시 마지막 간격만큼만 잃을 수 있음)
+"""
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+# 저널 파일 경로 (비어 있으면 메모리에만 기록)
+OFFLINE_JOURNAL_PATH = os.getenv("OFFLINE_JOURNAL_PATH", "user_settings/offline_journal.db")
+# WAL을 디스크에 fsync하는 간격(초)
+OFFLINE_JOURNAL_FSYNC_INTERVAL = float(os.getenv("OFFLINE_JOURNAL_FSYNC_INTERVAL", "1.0"))
+# 동기화된 항목이 이만큼 쌓이면 압축
+OFFLINE_JOURNAL_COMPACT_THRESHOLD = int(os.getenv("OFFLINE_JOURNAL_COMPACT_THRESHOLD", "200"))
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    "session_id TEXT PRIMARY KEY, title TEXT NOT NULL, created_at TEXT NOT NULL, "
+    "synced INTEGER NOT NULL DEFAULT 0)",
+    "CREATE TABLE IF NOT EXISTS messages ("
+    "seq INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, payload TEXT NOT NULL, "
+    "synced INTEGER NOT NULL DEFAULT 0)",
+    "CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, synced, seq)",
+    # 백엔드에 올린 오프라인 세션 ID -> 백엔드 세션 ID
+    "CREATE TABLE IF NOT EXISTS id_map (offline_id TEXT PRIMARY KEY, backend_id TEXT NOT NULL)",
+)
+
+
+class JournalEntry(NamedTuple):
+    """저널에 기록된 메시지 하나"""
+    seq: int
+    session_id: str
+    idempotency_key: str
+    message: Dict[str, Any]
+
+
+class OfflineJournal:
+    """
+    오프라인 세션/메시지 저널 (스레드 안전)
+    메모리에는 아무것도 들고 있지 않으며, 조회할 때마다 SQLite에서 읽습니다.
+    """
+
+    def __init__(
+        self,
+        path: str = OFFLINE_JOURNAL_PATH,
+        fsync_interval: float = OFFLINE_JOURNAL_FSYNC_INTERVAL,
+        compact_threshold: int = OFFLINE_JOURNAL_COMPACT_THRESHOLD
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로 (비어 있으면 메모리 DB)
+            fsync_interval: 체크포인트(fsync)를 모아서 하는 간격(초)
+            compact_threshold: 동기화된 항목이 이 수를 넘으면 압축
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._synced_since_compact = 0
+        self._sync_timer: Optional[threading.Timer] = None
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: 커밋 시 fsync하지 않고 체크포인트에서 fsync
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(messages)")}
+        if "idempotency_key" not in columns:
+            self._db.execute("ALTER TABLE messages ADD COLUMN idempotency_key TEXT")
+        self._db.commit()
+        self.compact()
+
+        # 동기화 대기 건수 (매번 SQLite를 조회하지 않도록 메모리에 유지)
+        self._pending_messages: Counter = Counter(dict(self._db.execute(
+            "SELECT session_id, COUNT(*) FROM messages WHERE synced = 0 GROUP BY session_id"
+        ).fetchall()))
+        self._pending_sessions = self._db.execute("SELECT COUNT(*) FROM sessions WHERE synced = 0").fetchone()[0]
+
+    # ---- 쓰기 ----
+
+    def add_session(self, session_id: str, title: str, created_at: str) -> None:
+        with self._lock:
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, title, created_at) VALUES (?, ?, ?)",
+                (str(session_id), title, created_at)
+            ).rowcount
+            self._pending_sessions += inserted
+            self._commit()
+
+    def append_message(self, session_id: str, message: Dict[str, Any], idempotency_key: Optional[str] = None) -> int:
+        """
+        메시지를 기록하고 저널 순번(seq)을 반환합니다.
+        재전송 시 백엔드가 중복 저장하지 않도록 메시지마다 멱등 키를 함께 기록합니다.
+        (지연 쓰기 대기열에서 옮겨 온 메시지는 이미 보냈을 수 있으므로 그때 쓴 키를 그대로 사용)
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO messages (session_id, payload, idempotency_key) VALUES (?, ?, ?)",
+                (str(session_id), json.dumps(message, ensure_ascii=False), idempotency_key or uuid.uuid4().hex)
+            )
+            self._pending_messages[str(session_id)] += 1
+            self._commit()
+            return cursor.lastrowid
+
+    def remove_session(self, session_id: str) -> bool:
+        """세션과 그 세션의 메시지를 지웁니다. 지운 항목이 있으면 True"""
+        session_id = str(session_id)
+        with self._lock:
+            removed_sessions = self._db.execute(
+                "DELETE FROM sessions WHERE session_id = ? AND synced = 0", (session_id,)
+            ).rowcount
+            removed = removed_sessions + self._db.execute(
+                "DELETE FROM messages WHERE session_id = ? AND synced = 0", (session_id,)
+            ).rowcount
+            self._pending_sessions -= removed_sessions
+            self._pending_messages.pop(session_id, None)
+            self._commit()
+            return removed > 0
+
+    def promote_session(self, offline_id: str, backend_id: str) -> None:
+        """오프라인 세션이 백엔드에 만들어졌음을 기록합니다. (이후 resolve()가 백엔드 ID를 반환)"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO id_map (offline_id, backend_id) VALUES (?, ?)",
+                (str(offline_id), str(backend_id))
+            )
+            self._pending_sessions -= self._db.execute(
+                "UPDATE sessions SET synced = 1 WHERE session_id = ? AND synced = 0", (str(offline_id),)
+            ).rowcount
+            # 남은 메시지는 백엔드 세션 ID로 옮겨 이후 기록과 같은 순서로 보냄
+            self._db.execute(
+                "UPDATE messages SET session_id = ? WHERE session_id = ? AND synced = 0",
+                (str(backend_id), str(offline_id))
+            )
+            moved = self._pending_messages.pop(str(offline_id), 0)
+            if moved:
+                self._pending_messages[str(backend_id)] += moved
+            self._commit()
+            self._synced_since_compact += 1
+        self._maybe_compact()
+
+    def mark_messages_synced(self, entries: Iterable[JournalEntry]) -> None:
+        entries = list(entries)
+        if not entries:
+            return
+        with self._lock:
+            self._db.executemany("UPDATE messages SET synced = 1 WHERE seq = ?", [(e.seq,) for e in entries])
+            for entry in entries:
+                self._pending_messages[entry.session_id] -= 1
+            self._pending_messages += Counter()  # 0 이하 항목 정리
+            self._commit()
+            self._synced_since_compact += len(entries)
+        self._maybe_compact()
+
+    # ---- 읽기 (동기화되지 않은 항목만) ----
+
+    def resolve(self, session_id: str) -> str:
+        """백엔드에 올라간 오프라인 세션이면 백엔드 세션 ID, 아니면 그대로 반환합니다."""
+        session_id = str(session_id)
+        if not session_id.startswith("offline_"):
+            return session_id
+        with self._lock:
+            row = self._db.execute("SELECT backend_id FROM id_map WHERE offline_id = ?", (session_id,)).fetchone()
+        return row[0] if row else session_id
+
+    def pending_count(self, session_id: str) -> int:
+        """세션의 동기화되지 않은 메시지 수 (SQLite 조회 없음)"""
+        with self._lock:
+            return self._pending_messages.get(str(session_id), 0)
+
+    def has_unsynced(self) -> bool:
+        """백엔드로 다시 보내야 할 세션이나 메시지가 있는지 (SQLite 조회 없음)"""
+        with self._lock:
+            return self._pending_sessions > 0 or bool(self._pending_messages)
+
+    def has_session(self, session_id: str) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ? AND synced = 0", (str(session_id),)
+            ).fetchone() is not None
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT session_id, title, created_at FROM sessions WHERE session_id = ? AND synced = 0",
+                (str(session_id),)
+            ).fetchone()
+        return {"id": row[0], "title": row[1], "created_at": row[2]} if row else None
+
+    def sessions(self) -> List[Dict[str, Any]]:
+        """오프라인 세션 목록 (생성 순)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT session_id, title, created_at FROM sessions WHERE synced = 0 ORDER BY rowid"
+            ).fetchall()
+        return [{"id": row[0], "title": row[1], "created_at": row[2]} for row in rows]
+
+    def messages(self, session_id: str) -> List[Dict[str, Any]]:
+        """세션의 동기화되지 않은 메시지 (기록 순)"""
+        if not self.pending_count(session_id):
+            return []
+        return [entry.message for entry in self.entries(session_id)]
+
+    def entries(self, session_id: Optional[str] = None) -> List[JournalEntry]:
+        """동기화되지 않은 메시지 목록 (기록 순). session_id가 없으면 모든 세션"""
+        if session_id is not None and not self.pending_count(session_id):
+            return []
+        query = "SELECT seq, session_id, idempotency_key, payload FROM messages WHERE synced = 0"
+        params: tuple = ()
+        if session_id is not None:
+            query += " AND session_id = ?"
+            params = (str(session_id),)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY seq", params).fetchall()
+        return [JournalEntry(row[0], row[1], row[2] or f"journal-{row[0]}", json.loads(row[3])) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 저널 상태"""
+        with self._lock:
+            sessions = self._db.execute("SELECT COUNT(*) FROM sessions WHERE synced = 0").fetchone()[0]
+            messages = self._db.execute("SELECT COUNT(*) FROM messages WHERE synced = 0").fetchone()[0]
+        return {"path": self.path or ":memory:", "sessions": sessions, "messages": messages}
+
+    # ---- 디스크 반영 / 압축 ----
+
+    def sync(self) -> None:
+        """WAL을 데이터베이스 파일로 옮기며 fsync합니다."""
+        with self._lock:
+            self._sync_timer = None
+            if self._dirty and self.path:
+                self._db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            self._dirty = False
+
+    def compact(self) -> None:
+        """동기화가 끝난 항목을 지우고 WAL 파일을 비웁니다."""
+        with self._lock:
+            self._db.execute("DELETE FROM messages WHERE synced = 1")
+            self._db.execute("DELETE FROM sessions WHERE synced = 1")
+            self._db.commit()
+            if self.path:
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._synced_since_compact = 0
+            self._dirty = False
+
+    def _maybe_compact(self) -> None:
+        if self._synced_since_compact >= self.compact_threshold:
+            self.compact()
+
+    def _commit(self) -> None:
+        """커밋 후 fsync(체크포인트)를 예약합니다. (잠금을 잡은 상태에서 호출)"""
+        self._db.commit()
+        self._dirty = True
+        if self._sync_timer is None and self.path:
+            self._sync_timer = threading.Timer(self.fsync_interval, self.sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
@@ -0,0 +1,218 @@
+"""
+오프라인 저널 재전송
+백엔드 연결이 돌아오면 저널에 쌓인 오프라인 세션과 메시지를 기록 순서대로 백엔드에 올립니다.
+- 오프라인 세션은 백엔드 세션으로 만들고 ID 매핑을 저널에 기록
+- 세션/메시지는 Idempotency-Key 헤더와 함께 보냄 (5xx/타임아웃 재시도는 백엔드가 키로 중복을 막는다고
+  설정한 경우(BACKEND_IDEMPOTENCY_KEYS)에만, 그 외에는 서버에 닿지 않은 실패만 재시도)
+- 일시적인 오류가 나면 그 자리에서 멈추고 다음 재전송 때 이어서 보냄 (세션 내 순서 유지)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.backend_client import BackendClient
+from src.utils.fast_json import json_body
+from src.utils.offline_journal import JournalEntry, OfflineJournal
+
+# 재전송 시도 사이의 최소 간격(초)
+OFFLINE_REPLAY_INTERVAL = float(os.getenv("OFFLINE_REPLAY_INTERVAL", "5"))
+# 중복 표시 방지용으로 기억할 최근 저장 메시지 수
+SYNCED_IDS_MAX_ENTRIES = 1024
+
+
+def _is_transient(status_code: int) -> bool:
+    return status_code >= 500 or status_code == 429
+
+
+def message_id(message: Any) -> Optional[int]:
+    """백엔드 메시지(저장 응답 또는 조회 목록 항목)의 ID (없거나 형식이 다르면 None)"""
+    try:
+        return int(message["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def saved_message_ids(resp: Any, count: int = 1) -> List[Optional[int]]:
+    """
+    저장 응답에서 백엔드 메시지 ID를 꺼냅니다. (단건은 메시지, 일괄 저장은 메시지 목록)
+    본문이 JSON이 아니거나 형식이 다르면 None으로 채웁니다. (이미 저장된 요청이므로 예외를 내지 않음)
+    """
+    try:
+        body = json_body(resp)
+    except Exception:
+        return [None] * count
+    items = body if isinstance(body, list) else [body]
+    ids = [message_id(item) for item in items[:count]]
+    return ids + [None] * (count - len(ids))
+
+
+class SyncedMessageIds:
+    """
+    최근 백엔드에 저장한 로컬 메시지의 멱등 키 -> 백엔드 메시지 ID (스레드 안전, 최근 max_entries개)
+    로컬 목록(지연 쓰기 대기열, 저널)에서 지우기 전에 기록하므로,
+    그 사이에 조회한 대화에서 백엔드와 로컬에 함께 있는 메시지를 가려낼 수 있습니다.
+    """
+
+    def __init__(self, max_entries: int = SYNCED_IDS_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+
+    def record(self, idempotency_key: str, backend_id: Optional[int]) -> None:
+        if backend_id is None:
+            return
+        with self._lock:
+            self._ids[idempotency_key] = backend_id
+            self._ids.move_to_end(idempotency_key)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+
+    def get(self, idempotency_key: str) -> Optional[int]:
+        with self._lock:
+            return self._ids.get(idempotency_key)
+
+
+def dedup_local_messages(backend_messages: List[Dict[str, Any]],
+                         local_messages: List[Tuple[str, Dict[str, Any]]],
+                         synced: SyncedMessageIds) -> List[Dict[str, Any]]:
+    """
+    로컬(전송 대기/저널) 메시지 중 이미 백엔드 목록에 있는 메시지를 제외합니다.
+    재전송 직후 로컬 목록에서 지워지기 전에 조회한 경우 같은 메시지가 두 번 보이지 않도록 합니다.
+    멱등 키로 기록해 둔 백엔드 메시지 ID가 목록에 있을 때만 제외하므로, 내용이 같은 반복 질문/답변은 남습니다.
+
+    Args:
+        local_messages: [(멱등 키, 메시지), ...]
+    """
+    if not local_messages:
+        return []
+    backend_ids = {message_id(message) for message in backend_messages}
+    backend_ids.discard(None)
+    return [message for key, message in local_messages
+            if not backend_ids or synced.get(key) not in backend_ids]
+
+
+class OfflineReplayer:
+    """저널 -> 백엔드 재전송기 (동시에 하나만 실행)"""
+
+    def __init__(
+        self,
+        journal: OfflineJournal,
+        client: BackendClient,
+        on_session_promoted: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        interval: float = OFFLINE_REPLAY_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        synced: Optional[SyncedMessageIds] = None
+    ):
+        """
+        Args:
+            journal: 오프라인 저널
+            client: 백엔드 클라이언트
+            on_session_promoted: 오프라인 세션이 백엔드 세션이 되었을 때 (오프라인 ID, 백엔드 세션)으로 호출
+            interval: 재전송 시도 사이의 최소 간격(초)
+            synced: 재전송한 메시지의 멱등 키 -> 백엔드 메시지 ID 기록 (조회 시 중복 제거용)
+        """
+        self.journal = journal
+        self.client = client
+        self.synced = synced or SyncedMessageIds()
+        self.on_session_promoted = on_session_promoted
+        self.interval = interval
+        self._clock = clock
+        self._running = threading.Lock()
+        self._last_attempt = float("-inf")
+        self._stats = {"runs": 0, "sessions": 0, "messages": 0, "dropped": 0, "interrupted": 0}
+
+    def replay(self) -> bool:
+        """
+        저널을 한 번 재전송합니다. 이미 실행 중이면 바로 False를 반환합니다.
+
+        Returns:
+            남은 항목 없이 모두 보냈으면 True
+        """
+        if not self._running.acquire(blocking=False):
+            return False
+        try:
+            self._last_attempt = self._clock()
+            self._stats["runs"] += 1
+            completed = self._replay_sessions() and self._replay_messages()
+            if not completed:
+                self._stats["interrupted"] += 1
+            return completed
+        except Exception:
+            self._stats["interrupted"] += 1
+            return False
+        finally:
+            self._running.release()
+
+    def replay_in_background(self) -> bool:
+        """
+        재전송할 항목이 있고 최소 간격이 지났으면 백그라운드 스레드에서 재전송합니다.
+
+        Returns:
+            재전송을 시작했으면 True
+        """
+        if not self.journal.has_unsynced() or self._running.locked():
+            return False
+        if self._clock() - self._last_attempt < self.interval:
+            return False
+        self._last_attempt = self._clock()
+        threading.Thread(target=self.replay, name="offline-replay", daemon=True).start()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 재전송 상태"""
+        return {**self._stats, "running": self._running.locked(), "journal": self.journal.stats()}
+
+    def _replay_sessions(self) -> bool:
+        for session in self.journal.sessions():
+            offline_id = session["id"]
+            resp = self.client.post(
+                "/chat/sessions",
+                json={"title": session["title"]},
+                headers={"Idempotency-Key": offline_id},
+                timeout=10
+            )
+            if resp.status_code != 200:
+                return False
+            created = json_body(resp)
+            self.journal.promote_session(offline_id, str(created["id"]))
+            self._stats["sessions"] += 1
+            if self.on_session_promoted:
+                self.on_session_promoted(offline_id, {
+                    **created,
+                    "title": created.get("title") or session["title"],
+                    "created_at": created.get("created_at") or session["created_at"],
+                })
+        return True
+
+    def _replay_messages(self) -> bool:
+        for entry in self.journal.entries():
+            session_id = self.journal.resolve(entry.session_id)
+            if session_id.startswith("offline_"):
+                # 세션이 아직 백엔드에 없음 (삭제되었거나 생성 실패) -> 다음 재전송 때 다시 확인
+                continue
+            resp = self.client.post(
+                "/chat/messages",
+                json=self._payload(session_id, entry),
+                headers={"Idempotency-Key": entry.idempotency_key},
+                timeout=15
+            )
+            if _is_transient(resp.status_code):
+                return False
+            if resp.status_code == 200:
+                self.synced.record(entry.idempotency_key, saved_message_ids(resp)[0])
+                self._stats["messages"] += 1
+            else:
+                # 4xx: 다시 보내도 거절되므로 저널에서 제외
+                self._stats["dropped"] += 1
+            self.journal.mark_messages_synced([entry])
+        return True
+
+    @staticmethod
+    def _payload(session_id: str, entry: JournalEntry) -> Dict[str, Any]:
+        return {
+            "session_id": int(session_id),
+            "role": entry.message["role"],
+            "content": entry.message["content"]
+        }
@@ -0,0 +1,149 @@
+"""
+파티션 캐시
+캐시 항목을 파티션(대화 세션 등) 단위로 묶고, 프로세스 전체 메모리 예산을 넘으면
+가장 오래 쓰지 않은 파티션부터 통째로 내보냅니다. 모든 연산은 잠금으로 보호됩니다.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """캐시 값의 대략적인 메모리 크기(바이트) - 문자열은 UTF-8 길이, 컨테이너는 항목 합 + 항목당 오버헤드"""
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 49
+    if isinstance(value, (bytes, bytearray)):
+        return len(value) + 33
+    if isinstance(value, dict):
+        return 64 + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return 56 + 8 * len(value) + sum(estimate_size(item) for item in value)
+    return 32
+
+
+class PartitionedCache:
+    """
+    파티션 -> {키: 값} 캐시 (스레드 안전, 전역 바이트 예산, 파티션 단위 LRU)
+
+    한 파티션에 접근하면 그 파티션 전체가 최근 사용으로 갱신됩니다.
+    예산을 넘으면 방금 쓴 파티션을 제외하고 가장 오래된 파티션부터 내보냅니다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        sizeof: Callable[[Any], int] = estimate_size,
+        on_evict: Optional[Callable[[Hashable], None]] = None
+    ):
+        """
+        Args:
+            max_bytes: 모든 파티션을 합친 메모리 예산(바이트)
+            sizeof: 값 크기 추정 함수
+            on_evict: 예산 초과로 파티션을 내보낸 뒤 호출할 함수 (잠금 밖에서 파티션 이름으로 호출)
+        """
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._on_evict = on_evict
+        self._lock = threading.Lock()
+        # 파티션 -> {키: (값, 크기)}
+        self._partitions: "OrderedDict[Hashable, Dict[Hashable, tuple]]" = OrderedDict()
+        self._partition_bytes: Dict[Hashable, int] = {}
+        self._resident = 0
+        self._counters = {"hits": 0, "misses": 0, "evicted_partitions": 0, "evicted_bytes": 0}
+
+    def get(self, partition: Hashable, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entries = self._partitions.get(partition)
+            if entries is None or key not in entries:
+                self._counters["misses"] += 1
+                return default
+            self._partitions.move_to_end(partition)
+            self._counters["hits"] += 1
+            return entries[key][0]
+
+    def put(self, partition: Hashable, key: Hashable, value: Any) -> None:
+        self._store(partition, key, value, self._sizeof(value))
+
+    def charge(self, partition: Hashable, key: Hashable, size: int) -> None:
+        """
+        캐시 밖에 보관된 파생 데이터(검색 색인 등)의 크기를 파티션에 청구합니다. (값 없이 크기만 기록)
+        파티션을 내보내면 on_evict로 알리므로 호출측이 파생 데이터를 정리합니다. size가 0 이하면 청구를 취소합니다.
+        """
+        if size <= 0:
+            self.discard(partition, key)
+        else:
+            self._store(partition, key, None, size)
+
+    def _store(self, partition: Hashable, key: Hashable, value: Any, size: int) -> None:
+        with self._lock:
+            entries = self._partitions.setdefault(partition, {})
+            self._partitions.move_to_end(partition)
+            old = entries.get(key)
+            if old is not None:
+                self._account(partition, -old[1])
+            entries[key] = (value, size)
+            self._account(partition, size)
+            evicted = self._evict(keep=partition)
+        if self._on_evict is not None:
+            for victim in evicted:
+                self._on_evict(victim)
+
+    def discard(self, partition: Hashable, key: Hashable) -> None:
+        """항목 하나를 지웁니다. 파티션이 비면 파티션도 지웁니다."""
+        with self._lock:
+            entries = self._partitions.get(partition)
+            if entries and key in entries:
+                self._account(partition, -entries.pop(key)[1])
+                if not entries:
+                    self._remove_partition(partition)
+
+    def drop_partition(self, partition: Hashable) -> None:
+        with self._lock:
+            self._remove_partition(partition)
+
+    def partitions(self) -> List[Hashable]:
+        """파티션 목록 (오래된 순)"""
+        with self._lock:
+            return list(self._partitions)
+
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return self._resident
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 상태 (resident_bytes: 현재 추정 메모리 사용량)"""
+        with self._lock:
+            largest: Optional[Hashable] = max(self._partition_bytes, key=self._partition_bytes.get, default=None)
+            return {
+                **self._counters,
+                "partitions": len(self._partitions),
+                "resident_bytes": self._resident,
+                "max_bytes": self.max_bytes,
+                "largest_partition_bytes": self._partition_bytes.get(largest, 0),
+            }
+
+    # ---- 내부 (잠금을 잡은 상태에서 호출) ----
+
+    def _account(self, partition: Hashable, delta: int) -> None:
+        self._partition_bytes[partition] = self._partition_bytes.get(partition, 0) + delta
+        self._resident += delta
+
+    def _remove_partition(self, partition: Hashable) -> int:
+        if self._partitions.pop(partition, None) is None:
+            return 0
+        size = self._partition_bytes.pop(partition, 0)
+        self._resident -= size
+        return size
+
+    def _evict(self, keep: Hashable) -> List[Hashable]:
+        """예산을 넘은 만큼 오래된 파티션을 내보내고, 내보낸 파티션 목록을 반환합니다."""
+        evicted = []
+        while self._resident > self.max_bytes and len(self._partitions) > 1:
+            oldest = next(iter(self._partitions))
+            if oldest == keep:
+                break
+            self._counters["evicted_bytes"] += self._remove_partition(oldest)
+            self._counters["evicted_partitions"] += 1
+            evicted.append(oldest)
+        return evicted
@@ -0,0 +1,48 @@
+"""
+질문 정규화 유틸리티
+사용자 입력 정리와, 거의 같은 질문을 같은 키로 묶기 위한 정규화를 제공합니다.
+"""
+import re
+import unicodedata
+
+# 한글 음절/자모 범위
+_HANGUL = r"ᄀ-ᇿ㄰-㆏가-힣"
+_SPACE_NEXT_TO_HANGUL = re.compile(rf"(?<=[{_HANGUL}]) | (?=[{_HANGUL}])")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def clean_question(text: str) -> str:
+    """
+    사용자 입력을 정리합니다. (handle_user_input과 동일한 규칙)
+    - 앞뒤 공백 제거
+    - 연속된 줄바꿈을 최대 2개로 제한
+    """
+    cleaned = text.strip()
+    return re.sub(r'\n{3,}', '\n\n', cleaned)
+
+
+def normalize_question(text: str) -> str:
+    """
+    캐시 키 등으로 사용할 정규화된 질문을 반환합니다.
+    "기후 변화란?"과 "기후변화란 ?" 처럼 띄어쓰기·문장부호만 다른 질문은 같은 값이 됩니다.
+
+    1. clean_question과 같은 정리
+    2. NFKC 정규화 (전각 문자, 호환 자모 통일) 및 소문자화
+    3. 문장부호/기호를 공백으로 치환 (숫자 사이의 . , 는 보존)
+    4. 모든 공백(줄바꿈, 전각 공백 포함)을 하나로 압축
+    5. 한글 옆의 공백 제거 (띄어쓰기·조사 붙여쓰기 차이 무시)
+    """
+    normalized = unicodedata.normalize("NFKC", clean_question(text)).lower()
+
+    chars = list(normalized)
+    last = len(chars) - 1
+    for i, ch in enumerate(chars):
+        if unicodedata.category(ch)[0] not in ("P", "S"):
+            continue
+        # 숫자 사이의 소수점/천 단위 구분자는 의미가 있으므로 보존 (예: 1.5도, 1,000톤)
+        if ch in ".," and 0 < i < last and chars[i - 1].isdigit() and chars[i + 1].isdigit():
+            continue
+        chars[i] = " "
+
+    normalized = _WHITESPACE.sub(" ", "".join(chars)).strip()
+    return _SPACE_NEXT_TO_HANGUL.sub("", normalized)
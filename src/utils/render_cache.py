@@ -0,0 +1,76 @@
+"""
+메시지 렌더링 캐시
+어시스턴트 메시지에서 출처를 추출해 완성한 HTML을 메시지 내용 해시(+ 저장된 출처)로 보관하여,
+Streamlit이 다시 실행될 때마다 대화 전체를 다시 파싱하지 않도록 합니다.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# 렌더링 캐시 최대 항목 수
+RENDER_CACHE_MAX_ENTRIES = int(os.getenv("RENDER_CACHE_MAX_ENTRIES", "512"))
+
+
+def content_key(content: str, *extra: Hashable) -> Tuple[Hashable, ...]:
+    """메시지 내용 해시 + 부가 정보(표시 시각, 저장된 출처 등)로 만든 캐시 키"""
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+    return (digest,) + extra
+
+
+class RenderCache:
+    """
+    캐시 키 -> 렌더링 결과 (스레드 안전, 항목 수 기준 LRU)
+    결과는 여러 세션이 공유하므로 호출측은 받은 값을 수정하지 않아야 합니다.
+    """
+
+    def __init__(self, max_entries: int = RENDER_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_render(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        """
+        캐시된 결과를 반환하고, 없으면 render()를 호출해 저장합니다.
+        렌더링은 잠금 밖에서 수행합니다. (같은 메시지를 동시에 렌더링하면 한쪽 결과만 남음)
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return self._entries[key]
+            self._counters["misses"] += 1
+
+        value = render()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 적중률"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# 싱글톤 인스턴스
+render_cache = RenderCache()
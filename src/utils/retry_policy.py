@@ -0,0 +1,187 @@
+"""
+재시도 정책 유틸리티
+작업별 전체 시간 예산(deadline) 안에서 지수 백오프 + 지터로 재시도하고,
+429/503 응답의 Retry-After 헤더를 따릅니다.
+"""
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# 기본 재시도 설정
+BACKEND_RETRY_ATTEMPTS = int(os.getenv("BACKEND_RETRY_ATTEMPTS", "3"))
+BACKEND_RETRY_DEADLINE = float(os.getenv("BACKEND_RETRY_DEADLINE", "20"))
+BACKEND_RETRY_BASE_DELAY = float(os.getenv("BACKEND_RETRY_BASE_DELAY", "0.2"))
+BACKEND_RETRY_MAX_DELAY = float(os.getenv("BACKEND_RETRY_MAX_DELAY", "5"))
+
+# 서버가 요청을 처리하지 않았음을 알려 주는 상태 코드 (POST도 재시도 가능)
+REJECTED_STATUSES = frozenset({429, 503})
+# 멱등 요청에서 재시도할 상태 코드
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# 백엔드가 Idempotency-Key 헤더(일괄 저장은 항목별 idempotency_key)로 중복 저장을 막는 경우에만 켬
+# 켜면 멱등 키가 있는 POST도 5xx/읽기 타임아웃에서 재시도하고, 끄면 서버에 닿지 않은 실패만 재시도
+BACKEND_IDEMPOTENCY_KEYS = os.getenv("BACKEND_IDEMPOTENCY_KEYS", "false").lower() in ("1", "true", "yes")
+
+
+def is_idempotent(method: str, headers: Optional[dict] = None) -> bool:
+    """
+    요청을 다시 보내도 안전한지 판단합니다.
+    멱등 메서드이거나, 백엔드가 멱등 키를 지원하도록 설정되어 있고 Idempotency-Key 헤더가 있으면 True
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    return BACKEND_IDEMPOTENCY_KEYS and "Idempotency-Key" in (headers or {})
+
+
+def is_connect_error(error: Exception) -> bool:
+    """요청이 서버에 전달되기 전(연결 단계)에 실패했는지 판단합니다."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    reason = getattr(error.args[0], "reason", None)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    작업 단위 재시도 정책
+    - 멱등 요청(GET, DELETE 등): 연결 오류, 타임아웃, 429/5xx 응답에서 재시도
+    - 비멱등 요청(POST): 서버에 닿지 않은 연결 오류와 429/503 응답에서만 재시도
+    - 모든 시도와 대기는 deadline 안에서만 수행되며, 시도별 타임아웃도 남은 예산으로 줄어듭니다.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = BACKEND_RETRY_ATTEMPTS,
+        deadline: float = BACKEND_RETRY_DEADLINE,
+        base_delay: float = BACKEND_RETRY_BASE_DELAY,
+        max_delay: float = BACKEND_RETRY_MAX_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[float, float], float] = random.uniform
+    ):
+        """
+        Args:
+            max_attempts: 최초 시도를 포함한 최대 시도 횟수
+            deadline: 작업 전체 시간 예산(초)
+            base_delay: 첫 재시도 백오프 기준값(초)
+            max_delay: 백오프 상한(초)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        self._rng = rng
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 실패 후 대기 시간 (full jitter)"""
+        return self._rng(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def should_retry_error(self, error: Exception, idempotent: bool) -> bool:
+        if idempotent:
+            return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+        return is_connect_error(error)
+
+    def should_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        statuses = RETRYABLE_STATUSES if idempotent else REJECTED_STATUSES
+        return status_code in statuses
+
+    def delay_for(self, attempt: int, resp: Optional[requests.Response] = None) -> float:
+        """다음 시도까지 대기 시간. 429/503의 Retry-After가 있으면 우선합니다."""
+        if resp is not None and resp.status_code in REJECTED_STATUSES:
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+        return self.backoff(attempt)
+
+    @staticmethod
+    def clamp_timeout(timeout, remaining: float):
+        """시도별 타임아웃을 남은 예산 이내로 줄입니다. (connect, read) 튜플도 지원합니다."""
+        if remaining == float("inf"):
+            return timeout
+        remaining = max(remaining, 0.001)
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
+
+
+class RetryState:
+    """
+    요청 하나의 재시도 진행 상태 (시도 횟수, 경과 시간, 시도한 복제본)
+    동기/비동기 클라이언트가 같은 판단으로 재시도·장애 조치하도록, 요청 전송과 대기만 호출측에 남깁니다.
+    """
+
+    def __init__(self, policy: RetryPolicy, idempotent: bool, is_available: Callable[[], bool]):
+        """
+        Args:
+            policy: 재시도 정책
+            idempotent: 멱등 요청 여부
+            is_available: 요청을 받을 복제본이 남아 있는지 (라우터 상태)
+        """
+        self.policy = policy
+        self.idempotent = idempotent
+        self.tried: List[Any] = []
+        self.attempt = 0
+        self._is_available = is_available
+        self._started = policy.clock()
+
+    def next_timeout(self, timeout):
+        """시도 하나를 시작하고, 남은 예산으로 줄인 시도별 타임아웃을 반환합니다."""
+        self.attempt += 1
+        remaining = self.policy.deadline - (self.policy.clock() - self._started)
+        return self.policy.clamp_timeout(timeout, remaining)
+
+    def delay_after_error(self, retryable: bool) -> Optional[float]:
+        """요청 예외 후 대기할 시간. 다시 시도하지 않으면 None"""
+        delay = self.policy.backoff(self.attempt - 1)
+        return delay if retryable and self._can_retry(delay) else None
+
+    def delay_after_response(self, resp: Any) -> Optional[float]:
+        """응답(status_code, headers) 후 대기할 시간. 그대로 반환해야 하면 None"""
+        if not self.policy.should_retry_status(resp.status_code, self.idempotent):
+            return None
+        delay = self.policy.delay_for(self.attempt - 1, resp)
+        return delay if self._can_retry(delay) else None
+
+    def _can_retry(self, delay: float) -> bool:
+        """시도 횟수, 남은 예산, 복제본 상태를 보고 재시도 가능 여부를 판단합니다."""
+        if self.attempt >= self.policy.max_attempts:
+            return False
+        if self.policy.clock() - self._started + delay >= self.policy.deadline:
+            return False
+        return self._is_available()
+
+
+# 재시도하지 않는 정책 (단발성 호출용)
+NO_RETRY = RetryPolicy(max_attempts=1, deadline=float("inf"))
+# 답변 요청 재시도 정책 - 스트림 읽기 타임아웃(240초)보다 넉넉한 전체 예산
+ASK_RETRY_POLICY = RetryPolicy(deadline=300)
@@ -0,0 +1,281 @@
+"""
+대화 검색 색인
+세션 제목과 메시지 본문을 문자 bigram 역색인으로 보관하여, 한국어처럼 띄어쓰기가 일정하지 않은 텍스트도
+부분 문자열로 빠르게 찾습니다. 메시지를 저장/조회할 때마다 해당 문서만 갱신합니다.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 제목에서 찾은 경우 점수 가중치
+TITLE_BOOST = 2.0
+# 스니펫에서 일치 부분 앞뒤로 보여줄 글자 수
+SNIPPET_CONTEXT = 30
+
+# 문서 키: (세션 ID, 메시지 위치) - 제목은 위치 -1
+DocKey = Tuple[str, int]
+TITLE = -1
+# 색인 문서 크기 추정 - bigram마다 Counter 항목 + posting 항목
+_GRAM_ENTRY_BYTES = 150
+
+
+def _compact(text: str) -> str:
+    """NFKC + 소문자 + 글자/숫자만 남김 (띄어쓰기·문장부호 차이 무시)"""
+    return "".join(ch for ch in unicodedata.normalize("NFKC", text).lower() if ch.isalnum())
+
+
+def char_ngrams(text: str) -> Counter:
+    """색인/검색용 문자 bigram 빈도 (한 글자 텍스트는 unigram)"""
+    compact = _compact(text)
+    if len(compact) < 2:
+        return Counter([compact]) if compact else Counter()
+    return Counter(compact[i:i + 2] for i in range(len(compact) - 1))
+
+
+def _match_pattern(query: str) -> Optional["re.Pattern"]:
+    """원문에서 검색어 위치를 찾는 패턴 (글자 사이 공백·문장부호 허용)"""
+    compact = _compact(query)
+    if not compact:
+        return None
+    return re.compile(r"\W*".join(re.escape(ch) for ch in compact), re.IGNORECASE)
+
+
+def _doc_bytes(text: str, grams: Counter) -> int:
+    """색인 문서 하나(원문 + bigram 빈도 + posting 항목)의 대략적인 메모리 크기"""
+    return len(text.encode("utf-8")) + 49 + _GRAM_ENTRY_BYTES * len(grams)
+
+
+def _snippet(text: str, start: int, end: int) -> Dict[str, Any]:
+    left = max(0, start - SNIPPET_CONTEXT)
+    right = min(len(text), end + SNIPPET_CONTEXT)
+    prefix = "..." if left > 0 else ""
+    suffix = "..." if right < len(text) else ""
+    snippet = prefix + text[left:right].replace("\n", " ") + suffix
+    return {
+        "snippet": snippet,
+        "offsets": (start, end),
+        "snippet_offsets": (len(prefix) + start - left, len(prefix) + end - left),
+    }
+
+
+class SessionSearchIndex:
+    """
+    세션 제목/메시지 역색인 (스레드 안전)
+    postings: bigram -> {문서 키: 빈도}
+
+    메시지 색인 크기는 세션별로 추정하여 on_resize(세션 ID, 바이트)로 알립니다. (잠금 밖에서 호출)
+    호출측은 이를 대화 내용 캐시 파티션에 청구하고, 파티션이 퇴출되면 remove_messages로 색인을 지웁니다.
+    제목 색인은 세션 목록(SessionCatalog)과 같은 크기이므로 청구하지 않습니다.
+    """
+
+    def __init__(self, on_resize: Optional[Callable[[str, int], None]] = None):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[DocKey, int]] = defaultdict(dict)
+        self._docs: Dict[DocKey, Tuple[str, Counter]] = {}
+        self._message_counts: Dict[str, int] = {}
+        self._message_bytes: Dict[str, int] = {}
+        self._bytes = 0
+        self._on_resize = on_resize
+
+    # ---- 색인 갱신 ----
+
+    def set_title(self, session_id: str, title: str) -> None:
+        """세션 제목을 색인합니다. (바뀌지 않았으면 아무것도 하지 않음)"""
+        key = (str(session_id), TITLE)
+        with self._lock:
+            doc = self._docs.get(key)
+            if doc is None or doc[0] != (title or ""):
+                self._put(key, title or "")
+
+    def set_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> None:
+        """세션의 전체 메시지로 색인을 맞춥니다. (이미 같은 내용인 메시지는 다시 색인하지 않음)"""
+        session_id = str(session_id)
+        with self._lock:
+            for position, message in enumerate(messages):
+                key = (session_id, position)
+                content = str(message.get("content", ""))
+                doc = self._docs.get(key)
+                if doc is None or doc[0] != content:
+                    self._put(key, content)
+            for position in range(len(messages), self._message_counts.get(session_id, 0)):
+                self._drop((session_id, position))
+            self._message_counts[session_id] = len(messages)
+        self._resized(session_id)
+
+    def add_message(self, session_id: str, message: Dict[str, Any]) -> None:
+        """새 메시지 하나를 세션 끝에 추가합니다."""
+        session_id = str(session_id)
+        with self._lock:
+            position = self._message_counts.get(session_id, 0)
+            self._put((session_id, position), str(message.get("content", "")))
+            self._message_counts[session_id] = position + 1
+        self._resized(session_id)
+
+    def remove_session(self, session_id: str) -> None:
+        session_id = str(session_id)
+        with self._lock:
+            self._drop((session_id, TITLE))
+            for position in range(self._message_counts.pop(session_id, 0)):
+                self._drop((session_id, position))
+        self._resized(session_id)
+
+    def remove_messages(self, session_id: str) -> None:
+        """
+        세션의 메시지 색인만 지웁니다. (제목 색인은 유지)
+        대화 내용 캐시에서 내보낸 세션에 사용하며, 세션을 다시 열면 set_messages로 다시 색인됩니다.
+        """
+        session_id = str(session_id)
+        with self._lock:
+            for position in range(self._message_counts.pop(session_id, 0)):
+                self._drop((session_id, position))
+        self._resized(session_id)
+
+    def rename_session(self, old_id: str, new_id: str) -> None:
+        """오프라인 세션이 백엔드 세션이 되었을 때 색인을 옮깁니다."""
+        old_id, new_id = str(old_id), str(new_id)
+        with self._lock:
+            keys = [key for key in self._docs if key[0] == old_id]
+            for key in keys:
+                text = self._docs[key][0]
+                self._drop(key)
+                self._put((new_id, key[1]), text)
+            if old_id in self._message_counts:
+                self._message_counts[new_id] = self._message_counts.pop(old_id)
+        self._resized(old_id, new_id)
+
+    # ---- 검색 ----
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        검색어를 포함하는 세션을 점수순으로 반환합니다.
+
+        Returns:
+            [{"session_id", "score", "field"("title"/"message"), "message_index",
+              "snippet", "offsets"(원문 기준), "snippet_offsets"(스니펫 기준)}, ...]
+        """
+        grams = char_ngrams(query)
+        if not grams:
+            return []
+        pattern = _match_pattern(query)
+
+        with self._lock:
+            postings = self._candidate_postings(grams)
+            if not postings:
+                return []
+            # 가장 짧은 posting부터 교집합 (모든 bigram을 포함하는 문서만)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting.keys()
+                if not candidates:
+                    return []
+
+            total = max(1, len(self._docs))
+            idf = [math.log(1 + total / len(posting)) for posting in postings]
+            # 세션별 합계 점수와 가장 점수가 높은 문서
+            by_session: Dict[str, List[Any]] = {}
+            for key in candidates:
+                score = sum(weight * posting[key] for weight, posting in zip(idf, postings))
+                if key[1] == TITLE:
+                    score *= TITLE_BOOST
+                entry = by_session.get(key[0])
+                if entry is None:
+                    by_session[key[0]] = [score, score, key]
+                else:
+                    entry[0] += score
+                    if score > entry[1]:
+                        entry[1], entry[2] = score, key
+
+            # 상위 세션만 원문에서 일치 위치를 찾아 스니펫 생성 (정규식은 비용이 커서 후보 전체에 돌리지 않음)
+            top = sorted(by_session.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+            results = []
+            for session_id, (score, _, key) in top:
+                text = self._docs[key][0]
+                match = pattern.search(text) if pattern else None
+                if match is None:
+                    score *= 0.5  # bigram은 모두 있지만 이어진 문자열은 아님
+                hit = {
+                    "session_id": session_id,
+                    "score": round(score, 4),
+                    "field": "title" if key[1] == TITLE else "message",
+                    "message_index": None if key[1] == TITLE else key[1],
+                }
+                hit.update(_snippet(text, *match.span()) if match else _snippet(text, 0, 0))
+                results.append(hit)
+
+        results.sort(key=lambda hit: hit["score"], reverse=True)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """모니터링용 색인 크기 (bytes: 추정 메모리 사용량, message_bytes: 그중 세션 파티션에 청구된 메시지 색인)"""
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "grams": len(self._postings),
+                "sessions": len(self._message_counts),
+                "bytes": self._bytes,
+                "message_bytes": sum(self._message_bytes.values()),
+            }
+
+    def _resized(self, *session_ids: str) -> None:
+        """세션별 메시지 색인 크기를 알립니다. (잠금 밖에서 호출)"""
+        if self._on_resize is None:
+            return
+        for session_id in session_ids:
+            with self._lock:
+                size = self._message_bytes.get(session_id, 0)
+            self._on_resize(session_id, size)
+
+    # ---- 내부 (잠금을 잡은 상태에서 호출) ----
+
+    def _candidate_postings(self, grams: Counter) -> List[Dict[DocKey, int]]:
+        if len(grams) == 1:
+            (gram,) = grams
+            if len(gram) == 1:
+                # 한 글자 검색: 그 글자를 포함하는 bigram의 문서를 모두 합침
+                merged: Dict[DocKey, int] = {}
+                for candidate, posting in self._postings.items():
+                    if gram in candidate:
+                        for key, count in posting.items():
+                            merged[key] = merged.get(key, 0) + count
+                return [merged] if merged else []
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        return postings
+
+    def _put(self, key: DocKey, text: str) -> None:
+        self._drop(key)
+        grams = char_ngrams(text)
+        self._docs[key] = (text, grams)
+        for gram, count in grams.items():
+            self._postings[gram][key] = count
+        self._account(key, _doc_bytes(text, grams))
+
+    def _drop(self, key: DocKey) -> None:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        self._account(key, -_doc_bytes(*doc))
+        for gram in doc[1]:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[gram]
+
+    def _account(self, key: DocKey, delta: int) -> None:
+        self._bytes += delta
+        if key[1] == TITLE:
+            return
+        size = self._message_bytes.get(key[0], 0) + delta
+        if size > 0:
+            self._message_bytes[key[0]] = size
+        else:
+            self._message_bytes.pop(key[0], None)
@@ -0,0 +1,124 @@
+"""
+세션 목록 캐시
+백엔드 세션 목록을 TTL 동안 보관하고 ID로 바로 찾을 수 있도록 색인합니다.
+세션 생성/삭제는 캐시에 바로 반영하여(write-through) 목록을 다시 조회하지 않습니다.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 세션 목록 캐시 유지 시간 (초)
+SESSION_LIST_TTL = float(os.getenv("SESSION_LIST_TTL", "30"))
+
+
+def _sort_key(session: Dict[str, Any]) -> str:
+    return session.get("created_at", "")
+
+
+class SessionCatalog:
+    """
+    세션 목록(최신순)과 세션 ID -> 세션 인덱스 (스레드 안전)
+    load 이후 TTL이 지나면 is_fresh()가 False가 되어 호출측이 다시 불러옵니다.
+    """
+
+    def __init__(self, ttl: float = SESSION_LIST_TTL, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: List[Dict[str, Any]] = []
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        with self._lock:
+            return self._loaded_at is not None
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            return self._loaded_at is not None and self._clock() - self._loaded_at < self.ttl
+
+    def load(self, sessions: List[Dict[str, Any]]) -> None:
+        """백엔드에서 받은 세션 목록으로 캐시를 교체합니다."""
+        ordered = sorted(sessions, key=_sort_key, reverse=True)
+        with self._lock:
+            self._sessions = ordered
+            self._index = {str(session["id"]): session for session in ordered}
+            self._loaded_at = self._clock()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """캐시된 세션 목록 (최신순, 호출측이 수정해도 캐시는 바뀌지 않음)"""
+        with self._lock:
+            return list(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._index.get(str(session_id))
+
+    def add(self, session: Dict[str, Any]) -> None:
+        """
+        새로 만든 세션을 반영합니다.
+        아직 목록을 불러온 적이 없으면 다음 조회 때 함께 받아오므로 건너뜁니다.
+        """
+        session_id = str(session["id"])
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if session_id in self._index:
+                self._sessions = [s for s in self._sessions if str(s["id"]) != session_id]
+            self._index[session_id] = session
+            self._sessions.append(session)
+            self._sessions.sort(key=_sort_key, reverse=True)
+
+    def remove(self, session_id: str) -> None:
+        session_id = str(session_id)
+        with self._lock:
+            if self._index.pop(session_id, None) is not None:
+                self._sessions = [s for s in self._sessions if str(s["id"]) != session_id]
+
+    def invalidate(self) -> None:
+        """다음 조회 때 백엔드에서 다시 불러오도록 표시합니다. (기존 목록은 장애 시 대체용으로 유지)"""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._loaded_at = float("-inf")
+
+
+def make_cursor(session: Dict[str, Any]) -> str:
+    """
+    세션 목록 페이지 커서
+    최신순 목록은 'created_at|id', 점수순 검색 결과(search_rank가 있는 세션)는 다음 순위 '#n'
+    """
+    if "search_rank" in session:
+        return f"#{session['search_rank'] + 1}"
+    return f"{session.get('created_at', '')}|{session['id']}"
+
+
+def page_sessions(
+    sessions: List[Dict[str, Any]],
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    최신순 세션 목록에서 커서 다음의 한 페이지를 잘라 냅니다.
+    커서의 세션이 그 사이 삭제되었으면 created_at 기준으로 이어지는 위치부터 반환합니다.
+    점수순 검색 결과의 순위 커서('#n')는 created_at 순서와 무관하므로 n번째부터 자릅니다.
+
+    Returns:
+        (페이지, 다음 페이지 커서 - 마지막 페이지면 None)
+    """
+    start = 0
+    if cursor and cursor.startswith("#"):
+        start = int(cursor[1:]) if cursor[1:].isdigit() else 0
+    elif cursor:
+        created_at, _, session_id = cursor.rpartition("|")
+        for position, session in enumerate(sessions):
+            if str(session["id"]) == session_id:
+                start = position + 1
+                break
+        else:
+            start = next((position for position, session in enumerate(sessions)
+                          if session.get("created_at", "") < created_at), len(sessions))
+    page = sessions[start:start + max(1, limit)]
+    has_more = start + len(page) < len(sessions)
+    return page, (make_cursor(page[-1]) if page and has_more else None)
@@ -0,0 +1,119 @@
+"""
+세션 요약 인덱스
+세션별 메시지 수, 마지막 활동 시각, 첫 메시지 미리보기를 보관하여
+대화 기록 목록을 그릴 때 세션마다 메시지 전체를 다시 조회하지 않도록 합니다.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+# 첫 메시지 미리보기 최대 길이
+PREVIEW_LENGTH = 80
+# 보관할 최대 세션 요약 수 (넘으면 오래 쓰지 않은 세션부터 제거, 필요하면 다시 계산)
+SESSION_SUMMARY_MAX_ENTRIES = int(os.getenv("SESSION_SUMMARY_MAX_ENTRIES", "5000"))
+
+
+def _message_time(message: Dict[str, Any]) -> str:
+    return message.get("created_at") or message.get("timestamp") or ""
+
+
+def _preview(content: str) -> str:
+    text = " ".join(str(content).split())
+    return text[:PREVIEW_LENGTH] + "..." if len(text) > PREVIEW_LENGTH else text
+
+
+def empty_summary() -> Dict[str, Any]:
+    return {"message_count": 0, "last_activity": "", "preview": ""}
+
+
+class SessionSummaryIndex:
+    """
+    세션 ID -> 요약 정보 인덱스 (스레드 안전, 항목 수 기준 LRU)
+    요약: message_count(메시지 수), last_activity(마지막 메시지 시각), preview(첫 메시지 미리보기)
+    """
+
+    def __init__(self, max_entries: int = SESSION_SUMMARY_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._summaries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            summary = self._summaries.get(str(session_id))
+            if summary is None:
+                return None
+            self._summaries.move_to_end(str(session_id))
+            return dict(summary)
+
+    def get_many(self, session_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """인덱스에 있는 세션의 요약만 반환합니다."""
+        with self._lock:
+            found = {}
+            for sid in map(str, session_ids):
+                if sid in self._summaries:
+                    self._summaries.move_to_end(sid)
+                    found[sid] = dict(self._summaries[sid])
+            return found
+
+    def missing(self, session_ids: Iterable[str]) -> List[str]:
+        """인덱스에 요약이 없는 세션 ID 목록"""
+        with self._lock:
+            return [str(sid) for sid in session_ids if str(sid) not in self._summaries]
+
+    def set(self, session_id: str, summary: Dict[str, Any]) -> None:
+        with self._lock:
+            self._summaries[str(session_id)] = {**empty_summary(), **summary}
+            self._summaries.move_to_end(str(session_id))
+            while len(self._summaries) > self.max_entries:
+                self._summaries.popitem(last=False)
+                self.evictions += 1
+
+    def update_from_messages(self, session_id: str, messages: List[Dict[str, Any]]) -> None:
+        """세션의 전체 메시지 목록으로 요약을 다시 계산합니다."""
+        summary = empty_summary()
+        if messages:
+            summary["message_count"] = len(messages)
+            summary["last_activity"] = _message_time(messages[-1])
+            summary["preview"] = _preview(messages[0].get("content", ""))
+        self.set(session_id, summary)
+
+    def note_message(self, session_id: str, message: Dict[str, Any]) -> None:
+        """
+        새 메시지를 요약에 반영합니다.
+        요약이 아직 없는 세션은 메시지 수를 알 수 없으므로 건너뜁니다. (다음 조회 때 채워짐)
+        """
+        with self._lock:
+            summary = self._summaries.get(str(session_id))
+            if summary is None:
+                return
+            if summary["message_count"] == 0:
+                summary["preview"] = _preview(message.get("content", ""))
+            summary["message_count"] += 1
+            summary["last_activity"] = _message_time(message) or summary["last_activity"]
+
+    def load_bulk(self, summaries: Iterable[Dict[str, Any]]) -> None:
+        """
+        백엔드 요약 응답을 인덱스에 반영합니다.
+        항목 형식: {"session_id" 또는 "id", "message_count", "last_activity"/"updated_at", "preview"/"first_message"}
+        """
+        for item in summaries:
+            if not isinstance(item, dict):
+                continue
+            session_id = item.get("session_id", item.get("id"))
+            if session_id is None:
+                continue
+            self.set(session_id, {
+                "message_count": int(item.get("message_count", 0) or 0),
+                "last_activity": item.get("last_activity") or item.get("updated_at") or "",
+                "preview": _preview(item.get("preview") or item.get("first_message") or ""),
+            })
+
+    def remove(self, session_id: str) -> None:
+        with self._lock:
+            self._summaries.pop(str(session_id), None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._summaries)
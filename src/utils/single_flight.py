@@ -0,0 +1,108 @@
+"""
+요청 병합(single-flight) 유틸리티
+같은 키의 요청이 이미 진행 중이면 백엔드를 다시 호출하지 않고 진행 중인 결과를 함께 받습니다.
+Streamlit 세션별 스크립트/워커 스레드 사이에서 안전하게 동작합니다.
+"""
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class _Flight:
+    """진행 중인 요청 하나. 받은 조각을 모아 두고 대기 중인 호출자에게 알립니다."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks: List[str] = []
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    키별 요청 병합기
+    첫 호출자(leader)가 실제 스트림을 실행하고, 이후 호출자(follower)는
+    leader가 받은 조각을 처음부터 순서대로 함께 받습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._counters = {"leaders": 0, "coalesced": 0}
+
+    def stream(self, key: str, stream_fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        같은 키의 요청이 진행 중이면 그 결과를, 아니면 stream_fn의 결과를 조각 단위로 반환합니다.
+        stream_fn 제너레이터의 반환값은 모든 호출자에게 그대로 전달됩니다.
+
+        Args:
+            key: 병합 키 (예: 정규화된 질문)
+            stream_fn: 실제 요청을 수행하는 제너레이터 함수
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._counters["leaders"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if is_leader:
+            return (yield from self._lead(key, flight, stream_fn))
+        return (yield from self._follow(flight))
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 병합 현황을 반환합니다."""
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._flights)}
+
+    def _lead(self, key: str, flight: _Flight, stream_fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        iterator = iter(stream_fn())
+        try:
+            while True:
+                try:
+                    chunk = next(iterator)
+                except StopIteration as stop:
+                    flight.result = stop.value
+                    break
+                with flight.cond:
+                    flight.chunks.append(chunk)
+                    flight.cond.notify_all()
+                yield chunk
+        except BaseException as e:
+            # 소비자가 중간에 멈춘 경우(GeneratorExit)도 follower가 끝없이 기다리지 않도록 종료 처리
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            with flight.cond:
+                flight.done = True
+                flight.cond.notify_all()
+        return flight.result
+
+    def _follow(self, flight: _Flight) -> Iterator[str]:
+        index = 0
+        while True:
+            with flight.cond:
+                while index >= len(flight.chunks) and not flight.done:
+                    flight.cond.wait()
+                pending = flight.chunks[index:]
+                finished = flight.done
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+            if finished and index >= len(flight.chunks):
+                break
+
+        if isinstance(flight.error, GeneratorExit):
+            raise RuntimeError("함께 기다리던 요청이 중단되었습니다.")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+
+# 싱글톤 인스턴스 (프로세스 전체에서 공유)
+answer_flights = SingleFlight()
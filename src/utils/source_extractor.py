@@ -0,0 +1,135 @@
+"""
+답변 출처 추출기
+답변을 줄 단위로 한 번만 훑어 본문과 출처 URL 목록을 함께 만듭니다.
+스트리밍 중에는 조각을 받는 대로 feed()하고, 완성된 답변은 extract_sources()로 한 번에 처리합니다.
+"""
+import re
+from typing import Dict, List, Tuple
+
+# URL 본문 - 태그/따옴표/대괄호에서 끊고, 괄호는 짝이 맞는 경우만 포함 (위키백과식 "..._(동음이의)")
+_URL_CHARS = r"[^\s<>\"'()\[\]]"
+_URL_BODY = rf"https?://{_URL_CHARS}+(?:\({_URL_CHARS}*\){_URL_CHARS}*)*"
+# "1. https://..." 형식의 번호가 있는 출처 줄
+_NUMBERED_URL = re.compile(rf"(\d+)\.\s*({_URL_BODY})")
+# 본문 중의 URL
+_URL = re.compile(_URL_BODY)
+# 도메인 목록 줄 앞의 목록 기호와 "출처:" 표시: "- 출처: www.me.go.kr, kma.go.kr"
+_SOURCE_PREFIX = re.compile(r"(?:[-*•]\s*|\d+[.)]\s*)?(?:(?:출처|참고|Sources?)\s*:?\s*)?", re.IGNORECASE)
+# 도메인 목록에 올 수 있는 글자만으로 된 줄 (한글 문장 등은 첫 글자에서 바로 탈락)
+_DOMAIN_LIST_CHARS = re.compile(r"[A-Za-z0-9.\-\s,/]+")
+# 도메인 목록 구분자
+_DOMAIN_SEPARATOR = re.compile(r"[\s,/]+")
+_LABEL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789-")
+# 도메인처럼 보이지만 파일 이름인 경우
+_FILE_SUFFIXES = frozenset({
+    "pdf", "png", "jpg", "jpeg", "gif", "csv", "xlsx", "xls", "doc", "docx", "hwp", "txt", "zip", "py", "md", "html",
+})
+# URL 끝에 붙은 문장부호
+_TRAILING = ".,;:!?"
+
+
+def _is_domain(token: str) -> bool:
+    """
+    'news.kbs.co.kr' 같은 도메인인지 확인합니다.
+    정규식 역추적 없이 점으로 나눠 검사하므로 긴 입력에도 선형 시간입니다.
+    """
+    labels = token.lower().split(".")
+    tld = labels[-1]
+    if len(labels) < 2 or not (2 <= len(tld) <= 24 and tld.isascii() and tld.isalpha()):
+        return False
+    if tld in _FILE_SUFFIXES:
+        return False
+    return all(label and label[0] != "-" and label[-1] != "-" and set(label) <= _LABEL_CHARS
+               for label in labels[:-1])
+
+
+def _domain_list(line: str) -> List[str]:
+    """줄 전체가 도메인 목록이면 도메인들을, 아니면 빈 목록을 반환합니다."""
+    rest = line[_SOURCE_PREFIX.match(line).end():]
+    if not _DOMAIN_LIST_CHARS.fullmatch(rest):
+        return []
+    tokens = [token.rstrip(_TRAILING) for token in _DOMAIN_SEPARATOR.split(rest) if token.rstrip(_TRAILING)]
+    if tokens and all(_is_domain(token) for token in tokens):
+        return tokens
+    return []
+
+
+class SourceExtractor:
+    """
+    답변 텍스트 -> (본문, 출처 목록) 변환기
+    완성된 줄만 처리하고 마지막 미완성 줄은 다음 조각이 올 때까지 보관합니다.
+    같은 URL은 처음 나온 것만 출처로 남기고, 번호는 출처 목록 순서대로 다시 매깁니다.
+    """
+
+    def __init__(self):
+        self.sources: List[Dict[str, str]] = []
+        self._seen: set = set()
+        self._body_lines: List[str] = []
+        self._partial = ""
+        self.consumed = 0  # 지금까지 받은 글자 수 (누적 텍스트에서 새 부분만 넘길 때 사용)
+
+    def feed(self, chunk: str) -> "SourceExtractor":
+        """답변 조각을 추가합니다."""
+        if not chunk:
+            return self
+        self.consumed += len(chunk)
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._process(line)
+        return self
+
+    def finish(self) -> Tuple[str, List[Dict[str, str]]]:
+        """남은 줄까지 처리하고 (본문, 출처 목록)을 반환합니다."""
+        if self._partial:
+            self._process(self._partial)
+            self._partial = ""
+        return self.body, self.sources
+
+    @property
+    def body(self) -> str:
+        """지금까지의 본문 (스트리밍 중에는 미완성 줄 포함, 출처로 판명될 수 있음)"""
+        lines = self._body_lines + ([self._partial] if self._partial else [])
+        return "\n".join(lines).strip()
+
+    def _add(self, url: str) -> None:
+        url = url.rstrip(_TRAILING)
+        if url in self._seen:
+            return
+        self._seen.add(url)
+        self.sources.append({"num": str(len(self.sources) + 1), "url": url})
+
+    def _process(self, line: str) -> None:
+        # URL도 점도 없는 줄(대부분의 본문)은 정규식 없이 통과
+        if "." not in line and "://" not in line:
+            self._body_lines.append(line)
+            return
+
+        stripped = line.strip()
+        if "://" in line:
+            numbered = _NUMBERED_URL.match(stripped)
+            if numbered:
+                self._add(numbered.group(2))
+                return
+            for url in _URL.findall(line):
+                self._add(url)
+            self._body_lines.append(line)
+            return
+
+        # 줄 전체가 도메인(목록)인 경우만 출처로 취급 - 본문 속 'word.word'는 그대로 둠
+        domains = _domain_list(stripped)
+        if domains:
+            for domain in domains:
+                self._add(f"https://{domain}")
+            return
+        self._body_lines.append(line)
+
+
+def extract_sources(content: str) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    완성된 답변에서 출처를 추출합니다.
+
+    Returns:
+        (출처 줄을 뺀 본문, [{"num", "url"}, ...])
+    """
+    return SourceExtractor().feed(content.strip()).finish()
@@ -0,0 +1,111 @@
+"""
+세션별 대화 내용 캐시
+한 번 불러온 세션의 메시지를 보관하고, 이후에는 마지막으로 받은 메시지 ID 이후의 메시지만 받아 합칩니다.
+세션마다 파티션을 두고, 전체 메모리 예산을 넘으면 가장 오래 보지 않은 세션부터 내보냅니다.
+"""
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.partitioned_cache import PartitionedCache
+
+# 대화 내용 캐시 전체 메모리 예산(바이트)
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+_MESSAGES = "messages"
+
+
+def _message_id(message: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(message["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class TranscriptCache:
+    """
+    세션 ID -> 백엔드 메시지 목록 (스레드 안전, 세션 파티션 단위 LRU, 바이트 예산)
+    증분 조회 응답은 merge()로 합치며, 메시지 ID로 중복을 제거합니다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = TRANSCRIPT_CACHE_MAX_BYTES,
+        on_evict: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            max_bytes: 전체 메모리 예산(바이트)
+            on_evict: 예산 초과로 세션을 내보낸 뒤 세션 ID로 호출 (세션별 파생 데이터 정리용)
+        """
+        self._cache = PartitionedCache(max_bytes, on_evict=on_evict)
+
+    def get(self, session_id: str) -> Optional[List[Dict[str, Any]]]:
+        """캐시된 메시지 목록 복사본 (없으면 None)"""
+        messages = self._cache.get(str(session_id), _MESSAGES)
+        return list(messages) if messages is not None else None
+
+    def last_id(self, session_id: str) -> Optional[int]:
+        """
+        증분 조회 기준이 되는 마지막 메시지 ID
+        캐시가 없거나 ID 없는 메시지가 섞여 있으면 None (전체 조회 필요)
+        """
+        messages = self._cache.get(str(session_id), _MESSAGES)
+        if not messages:
+            return None
+        ids = [_message_id(message) for message in messages]
+        if any(message_id is None for message_id in ids):
+            return None
+        return max(ids)
+
+    def set(self, session_id: str, messages: List[Dict[str, Any]]) -> None:
+        """전체 조회 결과로 세션의 메시지를 교체합니다."""
+        self._cache.put(str(session_id), _MESSAGES, list(messages))
+
+    def merge(self, session_id: str, newer: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        증분 조회 결과를 합칩니다.
+        백엔드가 기준 ID를 무시하고 전체 목록을 보낸 경우(이미 가진 ID 이하가 포함됨)에는 응답으로 교체합니다.
+
+        Returns:
+            합쳐진 메시지 목록 복사본
+        """
+        session_id = str(session_id)
+        messages = self._cache.get(session_id, _MESSAGES)
+        if messages is None:
+            self.set(session_id, newer)
+            return list(newer)
+
+        known_ids = {_message_id(message) for message in messages}
+        last = max((message_id for message_id in known_ids if message_id is not None), default=None)
+        newer_ids = [_message_id(message) for message in newer]
+        if last is not None and any(message_id is not None and message_id <= last for message_id in newer_ids):
+            merged = list(newer)
+        else:
+            merged = messages + [message for message, message_id in zip(newer, newer_ids)
+                                 if message_id is None or message_id not in known_ids]
+        self.set(session_id, merged)
+        return list(merged)
+
+    def charge(self, session_id: str, name: str, size: int) -> None:
+        """
+        세션에 딸린 파생 데이터(검색 색인 등)의 크기를 세션 파티션에 청구합니다.
+        대화 내용과 같은 예산으로 퇴출되며, 퇴출되면 on_evict로 알립니다. (size가 0이면 청구 취소)
+        """
+        self._cache.charge(str(session_id), name, size)
+
+    def remove(self, session_id: str) -> None:
+        self._cache.drop_partition(str(session_id))
+
+    def remove_message(self, message_id: int) -> None:
+        """삭제된 메시지를 캐시된 모든 세션에서 제거합니다."""
+        for session_id in self._cache.partitions():
+            messages = self._cache.get(session_id, _MESSAGES)
+            if messages and any(_message_id(m) == int(message_id) for m in messages):
+                self._cache.put(session_id, _MESSAGES, [m for m in messages if _message_id(m) != int(message_id)])
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 메모리 사용량/적중률"""
+        return self._cache.stats()
+
+    def __len__(self) -> int:
+        return len(self._cache.partitions())
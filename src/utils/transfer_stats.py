@@ -0,0 +1,59 @@
+"""
+전송량 통계 유틸리티
+API 엔드포인트별로 실제 네트워크로 받은 바이트(압축 상태)와 디코딩된 본문 바이트를 집계합니다.
+"""
+import re
+import threading
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """'GET /chat/sessions/{id}' 형태의 집계 키를 만듭니다. (숫자 ID는 {id}로 통일)"""
+    path = _ID_SEGMENT.sub("/{id}", urlparse(url).path) or "/"
+    return f"{method.upper()} {path}"
+
+
+class TransferStats:
+    """엔드포인트별 요청 수, 전송 바이트, 본문 바이트 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, method: str, url: str, wire_bytes: int, body_bytes: int) -> None:
+        """
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL
+            wire_bytes: 네트워크로 받은 바이트 (압축된 크기)
+            body_bytes: 압축을 푼 본문 바이트
+        """
+        key = endpoint_key(method, url)
+        with self._lock:
+            entry = self._stats.setdefault(key, {"requests": 0, "wire_bytes": 0, "body_bytes": 0})
+            entry["requests"] += 1
+            entry["wire_bytes"] += wire_bytes
+            entry["body_bytes"] += body_bytes
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """모니터링용 엔드포인트별 전송량 (압축률 포함)"""
+        with self._lock:
+            return {
+                key: {
+                    **entry,
+                    "compression_ratio": round(entry["wire_bytes"] / entry["body_bytes"], 3)
+                    if entry["body_bytes"] else 1.0,
+                }
+                for key, entry in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+# 싱글톤 인스턴스 (동기/비동기 클라이언트가 공유)
+transfer_stats = TransferStats()
@@ -0,0 +1,201 @@
+"""
+메시지 저장 지연 쓰기(write-behind) 대기열
+메시지를 로컬 대기열에 넣는 즉시 저장 완료로 처리하고, 백그라운드 워커가 묶어서 백엔드로 보냅니다.
+워커는 하나이며 대기열 앞쪽부터 순서대로 보내므로 세션 내 메시지 순서가 유지됩니다.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 보낼 최대 메시지 수
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "20"))
+# 대기열에 쌓아 둘 수 있는 최대 메시지 수 (넘으면 호출측이 직접 저장)
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "1000"))
+# 전송 실패 후 다시 시도하기까지 기다리는 시간(초), 연속 실패 시 최대 8배까지 늘어남
+WRITE_BEHIND_RETRY_INTERVAL = float(os.getenv("WRITE_BEHIND_RETRY_INTERVAL", "2"))
+
+
+class PendingWrite:
+    """전송 대기 중인 메시지 하나 (멱등 키는 대기열에 넣을 때 한 번 만들어 모든 재시도에 사용)"""
+
+    __slots__ = ("session_id", "message", "enqueued_at", "idempotency_key")
+
+    def __init__(self, session_id: str, message: Dict[str, Any]):
+        self.session_id = session_id
+        self.message = message
+        self.enqueued_at = time.monotonic()
+        self.idempotency_key = uuid.uuid4().hex
+
+
+class WriteBehindQueue:
+    """
+    크기가 제한된 FIFO 대기열 + 전송 워커 스레드 하나
+
+    flush_fn(batch)는 앞에서부터 처리한 메시지 수를 반환합니다.
+    일부만 처리했거나 예외가 나면 남은 메시지를 대기열 앞에 둔 채 잠시 뒤 다시 시도합니다.
+    재시도 대기 중에는 새 메시지가 들어와도 기다리며, flush()가 요청한 경우에만 바로 한 번 다시 시도합니다.
+    백엔드가 거절한(처리된 것으로 간주한) 메시지는 flush_fn이 reject()로 알려 집계·기록합니다.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[PendingWrite]], int],
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        max_pending: int = WRITE_BEHIND_MAX_PENDING,
+        retry_interval: float = WRITE_BEHIND_RETRY_INTERVAL
+    ):
+        self._flush_fn = flush_fn
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max(1, max_pending)
+        self.retry_interval = retry_interval
+        self._queue: Deque[PendingWrite] = deque()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._in_flight: List[PendingWrite] = []
+        self._per_session: Counter = Counter()
+        self._failures = 0
+        self._wake = False
+        # overflowed: 대기열이 가득 차 호출측이 직접 저장, rejected: 백엔드가 거절하여 버린 메시지
+        self._stats = {"submitted": 0, "flushed": 0, "batches": 0, "failed_flushes": 0, "overflowed": 0, "rejected": 0}
+
+    def submit(self, session_id: str, message: Dict[str, Any]) -> bool:
+        """
+        메시지를 대기열에 넣습니다.
+
+        Returns:
+            대기열이 가득 찼으면 False (호출측이 직접 저장해야 함)
+        """
+        with self._cond:
+            if len(self._queue) + len(self._in_flight) >= self.max_pending:
+                self._stats["overflowed"] += 1
+                return False
+            self._queue.append(PendingWrite(str(session_id), message))
+            self._per_session[str(session_id)] += 1
+            self._stats["submitted"] += 1
+            self._ensure_worker()
+            self._cond.notify_all()
+        return True
+
+    def pending(self, session_id: str) -> List[PendingWrite]:
+        """아직 백엔드 저장이 끝나지 않은 세션의 메시지 (순서대로, 멱등 키 포함)"""
+        with self._cond:
+            if not self._per_session.get(str(session_id)):
+                return []
+            return [item for item in (*self._in_flight, *self._queue) if item.session_id == str(session_id)]
+
+    def drain(self, session_id: str, timeout: float = 5.0) -> List[PendingWrite]:
+        """
+        세션의 대기 중인 메시지를 대기열에서 꺼내 순서대로 반환합니다. (오프라인 전환 시 저널로 옮길 때 사용)
+        같은 세션의 메시지가 전송 중이면 결과(성공 또는 대기열 복귀)가 나올 때까지 최대 timeout초 기다립니다.
+        """
+        session_id = str(session_id)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while any(item.session_id == session_id for item in self._in_flight):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            drained = [item for item in self._queue if item.session_id == session_id]
+            if drained:
+                self._queue = deque(item for item in self._queue if item.session_id != session_id)
+                self._per_session[session_id] -= len(drained)
+                self._per_session += Counter()  # 0 이하 항목 정리
+                self._cond.notify_all()
+            return drained
+
+    def reject(self, item: PendingWrite, status_code: int) -> None:
+        """백엔드가 거절하여 다시 보내지 않는 메시지를 집계하고 기록합니다. (flush_fn에서 호출)"""
+        with self._cond:
+            self._stats["rejected"] += 1
+        logger.warning("백엔드가 메시지 저장을 거절했습니다 (HTTP %s, 세션 %s, 멱등 키 %s) - 다시 보내지 않습니다.",
+                       status_code, item.session_id, item.idempotency_key)
+
+    @property
+    def depth(self) -> int:
+        """대기 중 + 전송 중인 메시지 수"""
+        with self._cond:
+            return len(self._queue) + len(self._in_flight)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """대기열이 빌 때까지 기다립니다. 시간 안에 비우면 True"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # 재시도 대기 중인 워커가 바로 한 번 다시 시도하도록 함
+            self._wake = True
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.notify_all()
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 대기열 상태"""
+        with self._cond:
+            oldest = time.monotonic() - self._queue[0].enqueued_at if self._queue else 0.0
+            return {
+                **self._stats,
+                "depth": len(self._queue) + len(self._in_flight),
+                "oldest_pending_seconds": round(oldest, 3),
+                "consecutive_failures": self._failures,
+            }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_flight = batch
+
+            try:
+                done = max(0, min(len(batch), int(self._flush_fn(batch))))
+            except Exception:
+                done = 0
+
+            with self._cond:
+                # 보내지 못한 메시지는 순서를 유지한 채 대기열 앞으로 되돌림
+                self._queue.extendleft(reversed(batch[done:]))
+                self._in_flight = []
+                self._per_session.subtract(item.session_id for item in batch[:done])
+                self._per_session += Counter()  # 0 이하 항목 정리
+                self._stats["batches"] += 1
+                self._stats["flushed"] += done
+                if done < len(batch):
+                    self._stats["failed_flushes"] += 1
+                    self._failures += 1
+                    delay = self.retry_interval * min(8, 2 ** (self._failures - 1))
+                else:
+                    self._failures = 0
+                    delay = 0
+                self._cond.notify_all()
+                # 재시도 시각까지 대기 - submit()의 알림으로는 깨지 않고, flush()가 요청하면 바로 재시도
+                next_try = time.monotonic() + delay
+                while delay and not self._wake:
+                    remaining = next_try - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._wake = False
+
+    def _flush_at_exit(self) -> None:
+        self.flush(timeout=5.0)
+
+    def register_atexit(self) -> "WriteBehindQueue":
+        """프로세스 종료 시 남은 메시지를 잠시 기다려 보냅니다."""
+        atexit.register(self._flush_at_exit)
+        return self
@@ -0,0 +1,57 @@
+"""
+답변 캐시 디스크 계층 테스트
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.utils.answer_cache import AnswerCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class AnswerCacheDiskTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _rows(self):
+        with sqlite3.connect(self.path) as db:
+            return [row[0] for row in db.execute("SELECT key FROM answers ORDER BY expires_at")]
+
+    def test_put_removes_expired_rows(self):
+        cache = AnswerCache(ttl=10, path=self.path, clock=self.clock)
+        cache.put("해수면 상승 원인", "답변 1")
+        self.clock.now += 11
+        cache.put("폭염 일수 추세", "답변 2")
+        self.assertEqual(len(self._rows()), 1)
+
+    def test_row_cap_drops_oldest(self):
+        cache = AnswerCache(ttl=100, path=self.path, clock=self.clock, max_rows=2)
+        for i in range(4):
+            cache.put(f"질문 {i}", f"답변 {i}")
+            self.clock.now += 1
+        self.assertEqual(self._rows(), [cache.make_key("질문 2"), cache.make_key("질문 3")])
+        self.assertEqual(cache.stats()["disk_evictions"], 2)
+
+    def test_disk_hit_after_restart(self):
+        AnswerCache(path=self.path, clock=self.clock).put("미세먼지 기준", "답변")
+        cache = AnswerCache(path=self.path, clock=self.clock)
+        self.assertEqual(cache.get("미세먼지 기준"), "답변")
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
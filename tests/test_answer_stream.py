@@ -0,0 +1,40 @@
+"""
+답변 스트리밍 파싱 테스트
+"""
+import io
+import json
+import unittest
+
+import requests
+
+from src.utils.answer_stream import iter_answer_chunks
+
+
+def _response(body: bytes, content_type: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["Content-Type"] = content_type
+    resp.raw = io.BytesIO(body)
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
+class AnswerStreamTest(unittest.TestCase):
+
+    def test_sse_without_charset_is_utf8(self):
+        body = "".join(f"data: {json.dumps({'delta': text}, ensure_ascii=False)}\n\n"
+                       for text in ("기후", "변화")) + "data: [DONE]\n\n"
+        chunks = iter_answer_chunks(_response(body.encode("utf-8"), "text/event-stream"))
+        self.assertEqual("".join(chunks), "기후변화")
+
+    def test_plain_text_without_charset_is_utf8(self):
+        chunks = iter_answer_chunks(_response("탄소중립 2050".encode("utf-8"), "text/plain"))
+        self.assertEqual("".join(chunks), "탄소중립 2050")
+
+    def test_declared_charset_is_respected(self):
+        chunks = iter_answer_chunks(_response("기온".encode("euc-kr"), "text/plain; charset=euc-kr"))
+        self.assertEqual("".join(chunks), "기온")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+저장한 메시지의 검색 색인이 대화 내용 메모리 예산을 따르는지 테스트
+"""
+import unittest
+
+from src.utils.chat_storage import ChatStorage
+from src.utils.offline_journal import OfflineJournal
+from src.utils.session_index import SessionSummaryIndex
+
+
+class FakeResponse:
+    status_code = 200
+    content = b'{"id": 1}'
+
+
+class FakeClient:
+    """항상 연결되어 있고 모든 저장 요청에 200을 반환하는 백엔드"""
+    base_url = "http://backend.test"
+
+    def is_available(self) -> bool:
+        return True
+
+    def post(self, path, **kwargs):
+        return FakeResponse()
+
+
+class SearchIndexBudgetTest(unittest.TestCase):
+
+    def test_saved_messages_are_evicted_under_small_budget(self):
+        storage = ChatStorage(client=FakeClient(), journal=OfflineJournal(""), transcript_max_bytes=20000)
+        for session_id in range(1, 201):
+            for i in range(10):
+                storage.save_message(str(session_id), {"role": "user", "content": f"해수면 상승 질문 {session_id}-{i}"})
+        self.assertTrue(storage._write_queue.flush(timeout=5))
+
+        stats = storage.memory_stats()
+        self.assertLessEqual(stats["transcripts"]["resident_bytes"], 20000)
+        self.assertGreater(stats["transcripts"]["evicted_partitions"], 0)
+        self.assertLess(stats["search_index"]["documents"], 2000)
+        self.assertEqual(stats["search_index"]["message_bytes"], stats["transcripts"]["resident_bytes"])
+        # 가장 최근 세션은 검색됨
+        self.assertEqual(storage._search_index.search("200-9")[0]["session_id"], "200")
+
+
+class SummaryIndexCapTest(unittest.TestCase):
+
+    def test_least_recently_used_summary_is_dropped(self):
+        index = SessionSummaryIndex(max_entries=2)
+        index.set("1", {"message_count": 1})
+        index.set("2", {"message_count": 2})
+        index.get("1")
+        index.set("3", {"message_count": 3})
+        self.assertEqual(index.missing(["1", "2", "3"]), ["2"])
+        self.assertEqual(index.evictions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
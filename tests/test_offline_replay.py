@@ -0,0 +1,36 @@
+"""
+로컬 메시지 중복 제거 테스트
+"""
+import unittest
+
+from src.utils.offline_replay import SyncedMessageIds, dedup_local_messages
+
+
+class DedupLocalMessagesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.question = {"role": "user", "content": "해수면 상승 원인은?"}
+        self.answer = {"role": "assistant", "content": "캐시된 같은 답변"}
+        self.backend = [{"id": 1, **self.question}, {"id": 2, **self.answer}]
+
+    def test_repeated_question_and_answer_are_kept(self):
+        local = [("k3", dict(self.question)), ("k4", dict(self.answer))]
+        self.assertEqual(dedup_local_messages(self.backend, local, SyncedMessageIds()),
+                         [self.question, self.answer])
+
+    def test_message_already_saved_under_its_key_is_dropped(self):
+        synced = SyncedMessageIds()
+        synced.record("k3", 3)
+        backend = self.backend + [{"id": 3, **self.question}]
+        local = [("k3", dict(self.question)), ("k4", dict(self.answer))]
+        self.assertEqual(dedup_local_messages(backend, local, synced), [self.answer])
+
+    def test_saved_but_not_yet_fetched_is_kept(self):
+        synced = SyncedMessageIds()
+        synced.record("k3", 3)
+        local = [("k3", dict(self.question))]
+        self.assertEqual(dedup_local_messages(self.backend, local, synced), [self.question])
+
+
+if __name__ == "__main__":
+    unittest.main()
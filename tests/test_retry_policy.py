@@ -0,0 +1,35 @@
+"""
+재시도 안전성 판단 테스트
+"""
+import unittest
+from unittest import mock
+
+from src.utils import retry_policy
+from src.utils.retry_policy import RetryPolicy, RetryState, is_idempotent
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {}
+
+
+class IdempotencyTest(unittest.TestCase):
+
+    def test_keyed_post_is_not_retried_on_5xx_by_default(self):
+        self.assertFalse(is_idempotent("POST", {"Idempotency-Key": "k"}))
+        state = RetryState(RetryPolicy(rng=lambda a, b: 0), is_idempotent("POST", {"Idempotency-Key": "k"}),
+                           lambda: True)
+        state.next_timeout(10)
+        self.assertIsNone(state.delay_after_response(FakeResponse(502)))
+        self.assertIsNotNone(state.delay_after_response(FakeResponse(503)))
+
+    def test_keyed_post_is_idempotent_when_backend_dedups(self):
+        with mock.patch.object(retry_policy, "BACKEND_IDEMPOTENCY_KEYS", True):
+            self.assertTrue(is_idempotent("POST", {"Idempotency-Key": "k"}))
+            self.assertFalse(is_idempotent("POST", {}))
+        self.assertTrue(is_idempotent("get"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+세션 목록 페이지 나누기 테스트
+"""
+import unittest
+
+from src.utils.session_catalog import make_cursor, page_sessions
+
+
+def _collect(sessions, limit):
+    pages, cursor = [], None
+    while True:
+        page, cursor = page_sessions(sessions, cursor, limit)
+        pages.extend(session["id"] for session in page)
+        if cursor is None:
+            return pages
+
+
+class PageSessionsTest(unittest.TestCase):
+
+    def test_recent_list_pages_by_created_at(self):
+        sessions = [{"id": i, "created_at": f"2026-10-{30 - i:02d}"} for i in range(7)]
+        self.assertEqual(_collect(sessions, 3), list(range(7)))
+
+    def test_search_hits_page_by_rank(self):
+        # 점수순이라 created_at 순서가 뒤섞여 있음
+        created = ["2026-10-01", "2026-10-20", "2026-10-05", "2026-10-25", "2026-10-02"]
+        hits = [{"id": i, "created_at": c, "search_rank": i} for i, c in enumerate(created)]
+        self.assertEqual(_collect(hits, 2), [0, 1, 2, 3, 4])
+        self.assertEqual(make_cursor(hits[1]), "#2")
+        self.assertEqual(page_sessions(hits, "#3", 10)[0], hits[3:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+출처 추출기 테스트
+"""
+import time
+import unittest
+
+from src.utils.source_extractor import SourceExtractor, extract_sources
+
+# 역추적 정규식이면 수 초 이상 걸리던 입력
+_ADVERSARIAL_LINES = [
+    "ab.cd" * 20,
+    "ab.cd" * 15 + " x",
+    "config.settings.database.connection.pool.size.limit.value.here.and.more.stuff!",
+    "a." * 5000 + "!",
+    "- 출처: " + "a-" * 3000 + ".com!",
+    "https://" + "(" * 2000 + "x",
+]
+
+
+class SourceExtractorTest(unittest.TestCase):
+
+    def test_numbered_and_inline_urls(self):
+        body, sources = extract_sources(
+            "본문입니다.\n자세한 내용은 https://www.kma.go.kr/ 참고.\n\n출처:\n1. https://www.ipcc.ch/report/ar6/\n"
+        )
+        self.assertEqual([s["url"] for s in sources], ["https://www.kma.go.kr/", "https://www.ipcc.ch/report/ar6/"])
+        self.assertEqual([s["num"] for s in sources], ["1", "2"])
+        self.assertNotIn("ipcc", body)
+        self.assertIn("kma.go.kr", body)
+
+    def test_duplicate_urls_are_dropped(self):
+        _, sources = extract_sources("https://a.com/x 와 https://a.com/x.\n1. https://a.com/x")
+        self.assertEqual([s["url"] for s in sources], ["https://a.com/x"])
+
+    def test_domain_only_lines(self):
+        body, sources = extract_sources("본문 example.com 참고\n자료: report.pdf\n- 출처: www.me.go.kr, kma.go.kr\n3.1.2 절")
+        self.assertEqual([s["url"] for s in sources], ["https://www.me.go.kr", "https://kma.go.kr"])
+        self.assertEqual(body, "본문 example.com 참고\n자료: report.pdf\n3.1.2 절")
+
+    def test_parenthesised_urls(self):
+        _, sources = extract_sources(
+            "1. https://en.wikipedia.org/wiki/Climate_(disambiguation)\n(참고: https://www.me.go.kr/home)"
+        )
+        self.assertEqual([s["url"] for s in sources], [
+            "https://en.wikipedia.org/wiki/Climate_(disambiguation)",
+            "https://www.me.go.kr/home",
+        ])
+
+    def test_streaming_matches_whole_answer(self):
+        content = "본문\n출처:\n1. https://www.ipcc.ch/\nnews.kbs.co.kr\n끝"
+        extractor = SourceExtractor()
+        for start in range(0, len(content), 3):
+            extractor.feed(content[start:start + 3])
+        self.assertEqual(extractor.finish(), extract_sources(content))
+
+    def test_adversarial_input_is_linear(self):
+        for line in _ADVERSARIAL_LINES:
+            started = time.perf_counter()
+            extract_sources(line)
+            self.assertLess(time.perf_counter() - started, 0.2, line[:40])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+대화 내용 캐시 퇴출과 검색 색인 연동 테스트
+"""
+import unittest
+
+from src.utils.search_index import SessionSearchIndex
+from src.utils.transcript_cache import TranscriptCache
+
+
+def _messages(session_id: int, text: str):
+    return [{"id": session_id * 100 + i, "role": "user", "content": f"{text} {i}"} for i in range(20)]
+
+
+class TranscriptEvictionTest(unittest.TestCase):
+
+    def test_evicted_session_drops_message_index_but_keeps_title(self):
+        index = SessionSearchIndex()
+        cache = TranscriptCache(max_bytes=6000, on_evict=index.remove_messages)
+
+        for session_id, text in ((1, "해수면 상승"), (2, "미세먼지 농도"), (3, "폭염 일수")):
+            index.set_title(str(session_id), f"세션 {text}")
+            messages = _messages(session_id, text)
+            cache.set(str(session_id), messages)
+            index.set_messages(str(session_id), messages)
+
+        self.assertIsNone(cache.get("1"))
+        self.assertIsNotNone(cache.get("3"))
+        self.assertEqual([hit["field"] for hit in index.search("해수면")], ["title"])
+        self.assertEqual(index.search("폭염")[0]["session_id"], "3")
+        self.assertLess(index.stats()["documents"], 3 + 3 * 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
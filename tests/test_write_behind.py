@@ -0,0 +1,79 @@
+"""
+지연 쓰기 대기열 테스트
+"""
+import threading
+import time
+import unittest
+
+from src.utils.write_behind import WriteBehindQueue
+
+
+class WriteBehindQueueTest(unittest.TestCase):
+
+    def test_retries_reuse_idempotency_key(self):
+        attempts = []
+        sent = threading.Event()
+
+        def flush(batch):
+            attempts.append([item.idempotency_key for item in batch])
+            if len(attempts) < 3:
+                return 0
+            sent.set()
+            return len(batch)
+
+        queue = WriteBehindQueue(flush, retry_interval=0.01)
+        queue.submit("1", {"role": "user", "content": "a"})
+        self.assertTrue(sent.wait(2))
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(len({tuple(keys) for keys in attempts}), 1)
+
+    def test_drain_returns_session_items_in_order(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def flush(batch):
+            started.set()
+            release.wait(2)
+            return 0  # 전송 실패 -> 대기열 앞으로 복귀
+
+        queue = WriteBehindQueue(flush, batch_size=1, retry_interval=10)
+        queue.submit("1", {"content": "a"})
+        self.assertTrue(started.wait(2))
+        queue.submit("2", {"content": "x"})
+        queue.submit("1", {"content": "b"})
+
+        threading.Timer(0.05, release.set).start()
+        drained = queue.drain("1", timeout=2)
+        self.assertEqual([item.message["content"] for item in drained], ["a", "b"])
+        self.assertEqual(queue.pending("1"), [])
+        self.assertEqual([item.message for item in queue.pending("2")], [{"content": "x"}])
+
+    def test_submit_does_not_cut_backoff_short(self):
+        attempts = []
+        queue = WriteBehindQueue(lambda batch: attempts.append(len(batch)) or 0, retry_interval=0.5)
+        queue.submit("1", {"content": "a"})
+        time.sleep(0.05)
+        for i in range(5):
+            queue.submit("1", {"content": str(i)})
+            time.sleep(0.02)
+        self.assertEqual(len(attempts), 1)
+
+        # flush()는 대기 중인 워커를 바로 한 번 다시 시도하게 함
+        self.assertFalse(queue.flush(timeout=0.2))
+        self.assertEqual(len(attempts), 2)
+
+    def test_rejected_messages_are_counted_and_logged(self):
+        def flush(batch):
+            for item in batch:
+                queue.reject(item, 400)
+            return len(batch)
+
+        queue = WriteBehindQueue(flush)
+        with self.assertLogs("src.utils.write_behind", level="WARNING"):
+            queue.submit("1", {"content": "a"})
+            self.assertTrue(queue.flush(timeout=2))
+        self.assertEqual(queue.stats()["rejected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+출처 추출 벤치마크
+src/utils/source_extractor의 단일 패스 추출기와 기존 render_assistant_message의 줄별 정규식 추출을
+여러 KB 크기의 답변에서 비교합니다.
+
+    python tools/bench_source_extraction.py --sizes 2000,8000,32000 --repeat 200
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.source_extractor import SourceExtractor, extract_sources  # noqa: E402
+
+_PARAGRAPH = (
+    "기후변화는 전 지구적인 온도 상승과 함께 강수 패턴과 해수면에 영향을 줍니다. "
+    "IPCC 제6차 평가보고서(AR6)에 따르면 산업화 이전 대비 약 1.1도 상승이 관측되었습니다.\n"
+    "<key-fact>한국의 연평균 기온은 지난 100년간 약 1.6도 올랐습니다.</key-fact>\n"
+    "자세한 통계는 기상청 기후정보포털(https://www.climate.go.kr/home/)에서 볼 수 있습니다.\n\n"
+)
+_SOURCES = (
+    "\n출처:\n"
+    "1. https://www.ipcc.ch/report/ar6/syr/\n"
+    "2. https://www.me.go.kr/home/web/main.do\n"
+    "3. https://www.kma.go.kr/neng/index.do\n"
+    "news.kbs.co.kr\n"
+)
+
+
+def legacy_extract(content: str) -> Tuple[str, List[Dict[str, str]]]:
+    """기존 render_assistant_message의 추출 로직 (비교 기준)"""
+    sources = []
+    numbered_url_pattern = r"^(\d+)\.\s*(https?://\S+)"
+    general_url_pattern = r"(https?://[^\s]+)"
+    domain_pattern = r"(?:^|\s)([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(?:\s|$)"
+    body_lines = []
+    for line in content.strip().split("\n"):
+        line_processed = False
+        m = re.match(numbered_url_pattern, line.strip())
+        if m:
+            num, url = m.groups()
+            sources.append({"num": num, "url": url})
+            line_processed = True
+        elif not line_processed:
+            for url in re.findall(general_url_pattern, line):
+                sources.append({"num": str(len(sources) + 1), "url": url})
+        if not line_processed and not re.search(general_url_pattern, line):
+            for domain in re.findall(domain_pattern, line):
+                if "." in domain and not domain.startswith("http") and len(domain.split(".")) >= 2:
+                    sources.append({"num": str(len(sources) + 1), "url": f"https://{domain}"})
+                    line_processed = True
+        if not line_processed:
+            body_lines.append(line)
+    return "\n".join(body_lines).strip(), sources
+
+
+def make_answer(size: int) -> str:
+    """약 size 바이트(UTF-8)의 답변"""
+    unit = len(_PARAGRAPH.encode("utf-8"))
+    return _PARAGRAPH * max(1, size // unit) + _SOURCES
+
+
+def streamed(content: str, chunk_chars: int) -> Tuple[str, List[Dict[str, str]]]:
+    extractor = SourceExtractor()
+    for start in range(0, len(content), chunk_chars):
+        extractor.feed(content[start:start + chunk_chars])
+    return extractor.finish()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="출처 추출 벤치마크")
+    parser.add_argument("--sizes", default="2000,8000,32000", help="답변 크기 목록 (바이트, 쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=200, help="크기별 반복 횟수")
+    parser.add_argument("--chunk-chars", type=int, default=40, help="스트리밍 시뮬레이션 조각 크기")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'legacy(us)':>12} {'single(us)':>12} {'stream(us)':>12} {'speedup':>8} {'sources':>10}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        content = make_answer(size)
+        legacy = min(timeit.repeat(lambda: legacy_extract(content), number=args.repeat, repeat=3)) / args.repeat
+        single = min(timeit.repeat(lambda: extract_sources(content), number=args.repeat, repeat=3)) / args.repeat
+        stream = min(timeit.repeat(lambda: streamed(content, args.chunk_chars),
+                                   number=args.repeat, repeat=3)) / args.repeat
+        legacy_sources = len(legacy_extract(content)[1])
+        sources = len(extract_sources(content)[1])
+        print(f"{len(content.encode('utf-8')):>8} {legacy * 1e6:>12.1f} {single * 1e6:>12.1f} {stream * 1e6:>12.1f} "
+              f"{legacy / single:>7.1f}x {legacy_sources:>4}->{sources:<4}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+대화 내용 렌더링 벤치마크
+메시지마다 st.markdown을 호출하는 방식(message)과 HTML 한 덩어리로 보내는 방식(batch)의
+요소 수와 다시 실행(rerun) 시간을 Streamlit AppTest로 비교합니다.
+
+    python tools/bench_transcript_render.py --messages 30,150,300 --reruns 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+
+def transcript_app():
+    """벤치마크용 최소 앱 - 세션 상태의 bench_messages를 bench_mode 방식으로 그림"""
+    import streamlit as st
+
+    from src.components.chat_message import render_chat_message, render_transcript
+
+    messages = st.session_state.bench_messages
+    if st.session_state.bench_mode == "batch":
+        render_transcript(messages)
+    else:
+        for message in messages:
+            render_chat_message(message)
+
+
+def make_messages(count: int):
+    question = "기후변화가 한국의 농업과 해수면에 미치는 영향은 무엇인가요?"
+    answer = (
+        "기후변화는 전 지구적인 온도 상승과 함께 강수 패턴과 해수면에 영향을 줍니다.\n"
+        "<key-fact>한국의 연평균 기온은 지난 100년간 약 1.6도 올랐습니다.</key-fact>\n" * 6
+        + "\n출처:\n1. https://www.ipcc.ch/report/ar6/syr/\n2. https://www.kma.go.kr/neng/index.do\n"
+    )
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant",
+         "content": f"{question} ({i})" if i % 2 == 0 else f"{answer}({i})",
+         "time": "10:00", "sources": []}
+        for i in range(count)
+    ]
+
+
+def measure(mode: str, count: int, reruns: int, timeout: float):
+    at = AppTest.from_function(transcript_app, default_timeout=timeout)
+    at.session_state.bench_messages = make_messages(count)
+    at.session_state.bench_mode = mode
+    os.chdir(ROOT)
+    at.run()  # 첫 실행은 렌더링 캐시를 채우므로 제외
+    timings = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - started)
+    elements = len(at.markdown)
+    payload = sum(len(element.value.encode("utf-8")) for element in at.markdown)
+    return elements, payload, statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대화 내용 렌더링 벤치마크")
+    parser.add_argument("--messages", default="30,150,300", help="메시지 수 목록 (쉼표 구분)")
+    parser.add_argument("--reruns", type=int, default=20, help="방식별 다시 실행 횟수")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(f"{'messages':>8} {'mode':>8} {'elements':>9} {'html(KB)':>9} {'rerun(ms)':>10}")
+    for count in (int(c) for c in args.messages.split(",")):
+        results = {}
+        for mode in ("message", "batch"):
+            elements, payload, median = measure(mode, count, args.reruns, args.timeout)
+            results[mode] = median
+            print(f"{count:>8} {mode:>8} {elements:>9} {payload / 1024:>9.1f} {median * 1000:>10.1f}")
+        print(f"{'':>8} {'speedup':>8} {results['message'] / results['batch']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+로컬 스텁 백엔드
+실제 백엔드 없이 프론트엔드를 벤치마크할 수 있도록, 프론트엔드가 사용하는 엔드포인트를 흉내 내는 서버입니다.
+지연 시간 분포, 오류율, 타임아웃(응답 지연), 답변 크기, 스트리밍 형식을 설정할 수 있습니다.
+
+    python tools/stub_backend.py --port 8000 --latency lognormal:40,0.5 --ask-latency uniform:500,2000 \\
+        --error-rate 0.01 --answer-bytes 4000 --stream chunked
+
+    BACKEND_URL=http://127.0.0.1:8000 streamlit run app.py
+
+지연 시간 분포 (밀리초):
+    fixed:50              항상 50ms
+    uniform:20,80         20~80ms 균등 분포
+    lognormal:40,0.5      중앙값 40ms, sigma 0.5인 로그정규 분포 (긴 꼬리)
+    exp:30                평균 30ms 지수 분포
+
+구현된 엔드포인트:
+    GET  /health
+    POST /im-fact/ask                  stream=true이면 --stream 형식(chunked/sse)으로 응답
+    GET  /chat/sessions                POST /chat/sessions      DELETE /chat/sessions/{id}
+    GET  /chat/sessions/summary        (--no-summary로 끄면 404)
+    GET  /chat/messages?session_id=&after_id=
+    POST /chat/messages                DELETE /chat/messages/{id}
+    POST /chat/messages/batch          (--no-batch로 끄면 404, 항목별 idempotency_key 중복 제거)
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+_SESSION_PATH = re.compile(r"^/chat/sessions/(\d+)$")
+_MESSAGE_PATH = re.compile(r"^/chat/messages/(\d+)$")
+
+_ANSWER_WORDS = (
+    "기후변화는 전 지구적인 온도 상승과 함께 강수 패턴, 해수면, 생태계에 영향을 줍니다. "
+    "IPCC 제6차 평가보고서에 따르면 산업화 이전 대비 1.1도 상승이 관측되었습니다. "
+    "한국은 2050 탄소중립을 목표로 재생에너지 비중을 늘리고 있습니다. "
+)
+_ANSWER_SOURCES = (
+    "\n\n출처:\n"
+    "1. https://www.ipcc.ch/report/ar6/syr/\n"
+    "2. https://www.me.go.kr/home/web/main.do\n"
+    "3. https://www.kma.go.kr/\n"
+)
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """'분포:인자' 문자열을 지연 시간(초) 샘플 함수로 변환합니다."""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] if args else []
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        low, high = values
+        return lambda: rng.uniform(low, high) / 1000
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda: rng.lognormvariate(math.log(median), sigma) / 1000
+    if kind == "exp":
+        (mean,) = values
+        return lambda: rng.expovariate(1 / mean) / 1000 if mean > 0 else 0.0
+    raise ValueError(f"알 수 없는 지연 시간 분포: {spec}")
+
+
+def make_answer(question: str, size: int) -> str:
+    """질문을 담은 약 size 바이트(UTF-8) 분량의 답변"""
+    head = f"'{question[:50]}'에 대한 답변입니다.\n\n"
+    body = []
+    length = len(head.encode("utf-8")) + len(_ANSWER_SOURCES.encode("utf-8"))
+    unit = len(_ANSWER_WORDS.encode("utf-8"))
+    while length < size:
+        body.append(_ANSWER_WORDS)
+        length += unit
+    return head + "".join(body) + _ANSWER_SOURCES
+
+
+class StubState:
+    """세션/메시지 저장소와 장애 주입 설정 (스레드 안전)"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.latency = parse_latency(args.latency, self.rng)
+        self.ask_latency = parse_latency(args.ask_latency or args.latency, self.rng)
+        self.lock = threading.Lock()
+        self.sessions: Dict[int, Dict[str, Any]] = {}
+        self.messages: Dict[int, Dict[str, Any]] = {}
+        self.next_session_id = 1
+        self.next_message_id = 1
+        self.idempotency: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+
+    def sample(self, fn: Callable[[], float]) -> float:
+        with self.rng_lock:
+            return fn()
+
+    def roll(self, rate: float) -> bool:
+        with self.rng_lock:
+            return self.rng.random() < rate
+
+    def create_session(self, title: str) -> Dict[str, Any]:
+        with self.lock:
+            session = {
+                "id": self.next_session_id,
+                "title": title,
+                "created_at": datetime.now().isoformat(timespec="microseconds"),
+            }
+            self.sessions[session["id"]] = session
+            self.next_session_id += 1
+            return session
+
+    def add_message(self, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            if int(body.get("session_id", -1)) not in self.sessions:
+                return None
+            message = {
+                "id": self.next_message_id,
+                "session_id": int(body["session_id"]),
+                "role": body.get("role", "user"),
+                "content": body.get("content", ""),
+                "created_at": datetime.now().isoformat(timespec="microseconds"),
+            }
+            self.messages[message["id"]] = message
+            self.next_message_id += 1
+            return message
+
+    def add_message_once(self, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """일괄 저장 항목의 idempotency_key가 이미 처리한 것이면 저장하지 않고 그때 결과를 반환"""
+        key = body.get("idempotency_key")
+        with self.lock:
+            if key and key in self.idempotency:
+                return self.idempotency[key]
+        message = self.add_message(body)
+        if key and message is not None:
+            with self.lock:
+                self.idempotency[key] = message
+        return message
+
+    def session_messages(self, session_id: int, after_id: int = 0) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [m for m in self.messages.values() if m["session_id"] == session_id and m["id"] > after_id]
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            result = {sid: {"session_id": sid, "message_count": 0, "last_activity": s["created_at"], "preview": ""}
+                      for sid, s in self.sessions.items()}
+            for message in self.messages.values():
+                summary = result.get(message["session_id"])
+                if summary is None:
+                    continue
+                if summary["message_count"] == 0:
+                    summary["preview"] = message["content"][:80]
+                summary["message_count"] += 1
+                summary["last_activity"] = message["created_at"]
+            return list(result.values())
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StubState = None  # serve()에서 설정
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.state.args.verbose:
+            super().log_message(format, *args)
+
+    # ---- 응답 헬퍼 ----
+
+    def _send_json(self, obj: Any, status: int = 200) -> None:
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", "") and len(body) > 512:
+            body = gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw else {}
+
+    def _inject_faults(self, is_ask: bool = False) -> bool:
+        """지연/타임아웃/오류를 주입합니다. 응답을 이미 보냈으면 True"""
+        args = self.state.args
+        with self.state.lock:
+            self.state.requests += 1
+        time.sleep(self.state.sample(self.state.ask_latency if is_ask else self.state.latency))
+        if self.state.roll(args.timeout_rate):
+            time.sleep(args.timeout_seconds)
+        if self.state.roll(args.error_rate):
+            self._send_json({"detail": "injected error"}, status=args.error_status)
+            return True
+        return False
+
+    # ---- 라우팅 ----
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/health":
+            return self._send_json({"status": "ok"})
+        if self._inject_faults():
+            return
+        if url.path == "/chat/sessions":
+            with self.state.lock:
+                sessions = sorted(self.state.sessions.values(), key=lambda s: s["created_at"], reverse=True)
+            return self._send_json(sessions)
+        if url.path == "/chat/sessions/summary" and not self.state.args.no_summary:
+            return self._send_json(self.state.summaries())
+        if url.path == "/chat/messages" and "session_id" in query:
+            after_id = int(query.get("after_id", ["0"])[0])
+            return self._send_json(self.state.session_messages(int(query["session_id"][0]), after_id))
+        self._send_json({"detail": "Not Found"}, status=404)
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        body = self._read_json()
+        if self._inject_faults(is_ask=url.path == "/im-fact/ask"):
+            return
+
+        key = self.headers.get("Idempotency-Key")
+        with self.state.lock:
+            replayed = self.state.idempotency.get(key) if key else None
+        if replayed is not None:
+            return self._send_json(replayed)
+
+        if url.path == "/im-fact/ask":
+            return self._ask(body)
+        if url.path == "/chat/sessions":
+            result = self.state.create_session(body.get("title", "새 대화"))
+        elif url.path == "/chat/messages":
+            result = self.state.add_message(body)
+            if result is None:
+                return self._send_json({"detail": "session not found"}, status=404)
+        elif url.path == "/chat/messages/batch" and not self.state.args.no_batch:
+            result = [self.state.add_message_once(item) for item in body.get("messages", [])]
+        else:
+            return self._send_json({"detail": "Not Found"}, status=404)
+
+        if key:
+            with self.state.lock:
+                self.state.idempotency[key] = result
+        self._send_json(result)
+
+    def do_DELETE(self) -> None:
+        url = urlparse(self.path)
+        if self._inject_faults():
+            return
+        match = _SESSION_PATH.match(url.path)
+        if match:
+            session_id = int(match.group(1))
+            with self.state.lock:
+                found = self.state.sessions.pop(session_id, None) is not None
+                for message_id in [m["id"] for m in self.state.messages.values() if m["session_id"] == session_id]:
+                    del self.state.messages[message_id]
+            return self._send_json({"ok": True} if found else {"detail": "Not Found"}, status=200 if found else 404)
+        match = _MESSAGE_PATH.match(url.path)
+        if match:
+            with self.state.lock:
+                found = self.state.messages.pop(int(match.group(1)), None) is not None
+            return self._send_json({"ok": True} if found else {"detail": "Not Found"}, status=200 if found else 404)
+        self._send_json({"detail": "Not Found"}, status=404)
+
+    # ---- 답변 ----
+
+    def _ask(self, body: Dict[str, Any]) -> None:
+        args = self.state.args
+        question = str(body.get("content", ""))
+        if not question.strip():
+            return self._send_json({"detail": "empty question"}, status=400)
+        answer = make_answer(question, args.answer_bytes)
+
+        if not body.get("stream") or args.stream == "none":
+            return self._send_json({"content": answer})
+
+        pieces = [answer[i:i + args.chunk_chars] for i in range(0, len(answer), args.chunk_chars)]
+        self.send_response(200)
+        charset = "" if args.no_charset else "; charset=utf-8"
+        if args.stream == "sse":
+            self.send_header("Content-Type", "text/event-stream" + charset)
+            pieces = [f"data: {json.dumps({'delta': p}, ensure_ascii=False)}\n\n" for p in pieces]
+            pieces.append("data: [DONE]\n\n")
+        else:
+            self.send_header("Content-Type", "text/plain" + charset)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for piece in pieces:
+            data = piece.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+            if args.chunk_delay_ms:
+                time.sleep(args.chunk_delay_ms / 1000)
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="IM.FACT 프론트엔드용 로컬 스텁 백엔드")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", default="fixed:0", help="/chat/* 지연 시간 분포 (ms)")
+    parser.add_argument("--ask-latency", default=None, help="/im-fact/ask 첫 응답까지의 지연 시간 분포 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503, help="주입할 오류 상태 코드")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="응답을 --timeout-seconds만큼 지연시킬 비율")
+    parser.add_argument("--timeout-seconds", type=float, default=30.0)
+    parser.add_argument("--answer-bytes", type=int, default=2000, help="답변 크기 (UTF-8 바이트)")
+    parser.add_argument("--stream", choices=("chunked", "sse", "none"), default="chunked",
+                        help="stream=true 요청에 대한 응답 형식 (none이면 항상 단일 JSON)")
+    parser.add_argument("--chunk-chars", type=int, default=40, help="스트리밍 조각 크기 (글자 수)")
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0, help="스트리밍 조각 사이 지연 (ms)")
+    parser.add_argument("--no-charset", action="store_true",
+                        help="스트리밍 응답의 Content-Type에서 charset 생략 (UTF-8 기본값 처리 확인용)")
+    parser.add_argument("--no-batch", action="store_true", help="/chat/messages/batch 비활성화")
+    parser.add_argument("--no-summary", action="store_true", help="/chat/sessions/summary 비활성화")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드 (재현 가능한 벤치마크)")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    return parser
+
+
+def serve(args: argparse.Namespace) -> ThreadingHTTPServer:
+    """스텁 서버를 만들어 반환합니다. (serve_forever는 호출측에서)"""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"state": StubState(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    server = serve(args)
+    print(f"스텁 백엔드 실행 중: http://{args.host}:{server.server_address[1]} (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()